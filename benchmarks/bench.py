@@ -0,0 +1,243 @@
+"""
+Benchmark Suite for Symptom Checker Bot
+Times loading, matching, ranking and ML prediction on synthetic datasets
+
+Usage:
+    python -m benchmarks.bench run --scales current small --output benchmarks/results/latest.json
+    python -m benchmarks.bench compare benchmarks/baseline.json benchmarks/results/latest.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import SCALES, make_queries, make_symptoms, write_dataset
+from symptom_engine import (
+    SymptomIndex,
+    find_symptom_matches,
+    find_symptom_matches_batch,
+    get_combined_conditions,
+    load_symptoms_data,
+    suggest_symptoms
+)
+from symptom_engine.preprocessing import normalize_symptom
+
+DEFAULT_DATA_DIR = os.path.join('benchmarks', 'data')
+DEFAULT_OUTPUT = os.path.join('benchmarks', 'results', 'latest.json')
+
+def measure(func: Callable, items: Sequence, repeat: int) -> Dict:
+    """Time func over every item, repeat times; report seconds per item"""
+    per_item = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in items:
+            func(item)
+        per_item.append((time.perf_counter() - start) / max(len(items), 1))
+    return {
+        "ops": len(items),
+        "repeat": repeat,
+        "min_s": min(per_item),
+        "median_s": statistics.median(per_item),
+        "mean_s": statistics.fmean(per_item)
+    }
+
+def train_benchmark_model(df: pd.DataFrame, model_dir: str, featurizer: str = 'tfidf'):
+    """Fit the app's vectorizer and a MultinomialNB on the raw rows and save them"""
+    from sklearn.naive_bayes import MultinomialNB
+    from train_simple_model import build_vectorizer, save_model
+
+    vectorizer = build_vectorizer(featurizer)
+    X = vectorizer.fit_transform(df['symptom'])
+    model = MultinomialNB(alpha=0.1).fit(X, df['condition'])
+    with contextlib.redirect_stdout(io.StringIO()):
+        save_model(model, vectorizer, 'MultinomialNB', model_dir)
+    return model, vectorizer
+
+def run_scale(scale: str, data_dir: str, n_queries: int, repeat: int, include_ml: bool) -> List[Dict]:
+    """Run every benchmark case for one dataset scale"""
+    path = write_dataset(data_dir, scale)
+    results = []
+
+    def record(case: str, stats: Dict):
+        stats.update({"case": case, "scale": scale, **SCALES[scale]})
+        results.append(stats)
+        print(f"   {case:<20} {stats['median_s'] * 1e6:>12.1f} µs/op  (min {stats['min_s'] * 1e6:.1f})")
+
+    print(f"\n📏 Scale '{scale}': {SCALES[scale]['rows']:,} rows, {SCALES[scale]['conditions']:,} conditions")
+    build_repeat = 1 if SCALES[scale]['rows'] >= 100_000 else repeat
+
+    record("load", measure(lambda _: load_symptoms_data(path), [None], build_repeat))
+    df = load_symptoms_data(path)
+    record("index_build", measure(lambda _: SymptomIndex.from_dataframe(df), [None], build_repeat))
+    index = SymptomIndex.from_dataframe(df)
+
+    queries = make_queries(df, n_queries)
+    record("match", measure(lambda query: find_symptom_matches(query, df, index), queries, repeat))
+    matches = [find_symptom_matches(query, df, index) for query in queries]
+    record("rank", measure(lambda match: get_combined_conditions(match, index), matches, repeat))
+    batch_stats = measure(lambda batch: find_symptom_matches_batch(batch, df, index), [queries], repeat)
+    # Report the batch per patient so it compares directly with match + rank
+    for key in ("min_s", "median_s", "mean_s"):
+        batch_stats[key] /= len(queries)
+    batch_stats["ops"] = len(queries)
+    record("match_batch", batch_stats)
+    record("suggest_top_k", measure(lambda query: suggest_symptoms(query, df, 5, index), queries, repeat))
+
+    if include_ml:
+        from symptom_engine.ml_predictor import SymptomMLPredictor
+
+        with tempfile.TemporaryDirectory() as model_dir:
+            start = time.perf_counter()
+            train_benchmark_model(df, model_dir)
+            print(f"   (trained benchmark model in {time.perf_counter() - start:.1f}s)")
+
+            record("ml_load", measure(lambda _: SymptomMLPredictor(model_dir).load_models(), [None], build_repeat))
+            # Caching disabled so repeats measure the model, not cache hits
+            predictor = SymptomMLPredictor(model_dir, cache_size=0)
+            predictor.load_models()
+
+            record("ml_predict_single", measure(predictor.predict_multiple_symptoms, queries, repeat))
+            cached_predictor = SymptomMLPredictor(model_dir)
+            cached_predictor.load_models()
+            for query in queries:
+                cached_predictor.predict_multiple_symptoms(query)
+            record("ml_predict_cached", measure(cached_predictor.predict_multiple_symptoms, queries, repeat))
+            flat = [[symptom for query in queries for symptom in query]]
+            batch_stats = measure(predictor.predict_multiple_symptoms, flat, repeat)
+            for key in ("min_s", "median_s", "mean_s"):
+                batch_stats[key] /= len(flat[0])
+            batch_stats["ops"] = len(flat[0])
+            record("ml_predict_batch", batch_stats)
+            texts = [" ".join(query) for query in queries]
+            record("ml_top_k", measure(lambda text: predictor.get_top_predictions(text, 5), texts, repeat))
+            batch_stats = measure(lambda batch: predictor.get_top_predictions_batch(batch, 5), [texts], repeat)
+            for key in ("min_s", "median_s", "mean_s"):
+                batch_stats[key] /= len(texts)
+            batch_stats["ops"] = len(texts)
+            record("ml_top_k_batch", batch_stats)
+
+    return results
+
+def run_suggestions(vocabulary_size: int, n_queries: int, repeat: int) -> List[Dict]:
+    """Time single typo-tolerant suggestions against a large symptom vocabulary"""
+    scale = f"vocabulary_{vocabulary_size}"
+    print(f"\n📏 Scale '{scale}': {vocabulary_size:,} distinct symptoms")
+    vocabulary = make_symptoms(vocabulary_size)
+    df = pd.DataFrame({
+        'symptom': vocabulary,
+        'condition': [f"Condition {i % 1000}" for i in range(vocabulary_size)],
+        'severity': 'Moderate'
+    })
+    start = time.perf_counter()
+    index = SymptomIndex(df['symptom'].tolist(), df['condition'].tolist(), df['severity'].tolist())
+    print(f"   (built symptom index in {time.perf_counter() - start:.1f}s)")
+
+    # One symptom per lookup: whole phrases, single words and transpositions
+    symptoms = make_queries(df, n_queries, symptoms_per_query=1)
+    lookups = [normalize_symptom(query[0]) for query in symptoms]
+    results = []
+    for case, func, items in (
+        ("suggest_lookup", lambda symptom: index.fuzzy.search(symptom, 5), lookups),
+        ("suggest_symptoms", lambda query: suggest_symptoms(query, df, 5, index), symptoms)
+    ):
+        stats = measure(func, items, repeat)
+        stats.update({"case": case, "scale": scale, "vocabulary": vocabulary_size})
+        print(f"   {case:<20} {stats['median_s'] * 1e6:>12.1f} µs/op  (min {stats['min_s'] * 1e6:.1f})")
+        results.append(stats)
+    return results
+
+def run(args) -> int:
+    print("🩺 Symptom Checker Benchmarks")
+    print("=" * 50)
+
+    results = []
+    for scale in args.scales:
+        results.extend(run_scale(scale, args.data_dir, args.queries, args.repeat, not args.skip_ml))
+    if args.suggest_vocabulary:
+        results.extend(run_suggestions(args.suggest_vocabulary, args.queries, args.repeat))
+
+    report = {
+        "meta": {
+            "created_at": pd.Timestamp.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__
+        },
+        "results": results
+    }
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 Results written to {args.output}")
+    return 0
+
+def compare(args) -> int:
+    """Flag cases whose median got slower than the baseline by more than the threshold"""
+    for path in (args.baseline, args.current):
+        if not os.path.exists(path):
+            print(f"❌ Results file not found: {path}")
+            print("   Save a baseline first, e.g. `python -m benchmarks.bench run --output benchmarks/baseline.json`")
+            return 2
+    with open(args.baseline) as f:
+        baseline = {(r['scale'], r['case']): r for r in json.load(f)['results']}
+    with open(args.current) as f:
+        current = {(r['scale'], r['case']): r for r in json.load(f)['results']}
+
+    regressions = 0
+    print(f"{'scale':<10} {'case':<20} {'baseline µs':>12} {'current µs':>12} {'ratio':>7}")
+    for key in sorted(current):
+        if key not in baseline:
+            print(f"{key[0]:<10} {key[1]:<20} {'-':>12} {current[key]['median_s'] * 1e6:>12.1f}    new")
+            continue
+        ratio = current[key]['median_s'] / baseline[key]['median_s'] if baseline[key]['median_s'] else float('inf')
+        flag = ""
+        if ratio > 1 + args.threshold:
+            flag = "  ❌ REGRESSION"
+            regressions += 1
+        elif ratio < 1 - args.threshold:
+            flag = "  ✅ faster"
+        print(f"{key[0]:<10} {key[1]:<20} {baseline[key]['median_s'] * 1e6:>12.1f} "
+              f"{current[key]['median_s'] * 1e6:>12.1f} {ratio:>7.2f}{flag}")
+
+    print(f"\n{regressions} regression(s) beyond {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Symptom Checker benchmark suite")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help="Run benchmarks and write JSON results")
+    run_parser.add_argument('--scales', nargs='+', choices=list(SCALES), default=['current', 'small'])
+    run_parser.add_argument('--queries', type=int, default=200, help="Patient queries per scale")
+    run_parser.add_argument('--repeat', type=int, default=5)
+    run_parser.add_argument('--skip-ml', action='store_true', help="Skip model training and ML cases")
+    run_parser.add_argument('--suggest-vocabulary', type=int, default=100_000,
+                            help="Distinct symptoms for the single-symptom suggestion cases (0 skips them)")
+    run_parser.add_argument('--data-dir', default=DEFAULT_DATA_DIR)
+    run_parser.add_argument('--output', default=DEFAULT_OUTPUT)
+    run_parser.set_defaults(func=run)
+
+    compare_parser = subparsers.add_parser('compare', help="Compare results against a stored baseline")
+    compare_parser.add_argument('baseline', help="Results JSON to compare against (e.g. a saved run)")
+    compare_parser.add_argument('current', nargs='?', default=DEFAULT_OUTPUT)
+    compare_parser.add_argument('--threshold', type=float, default=0.2,
+                                help="Allowed slowdown before flagging, as a fraction (default 0.2)")
+    compare_parser.set_defaults(func=compare)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
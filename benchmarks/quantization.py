@@ -0,0 +1,112 @@
+"""
+Quantization Report for Symptom Checker Benchmarks
+Compares float16 and int8 scorer weights against float64
+
+For each scale, one model is trained and its NumPy scorer is exported once per
+weight dtype. Each dtype is scored on the same queries and reported with:
+    top1_agreement   fraction of queries whose best condition matches float64
+    top5_agreement   mean overlap of the top-5 condition sets with float64
+    max_abs_prob     largest probability difference from float64
+    weights_mb       on-disk (and resident, once paged in) weight size
+    single_us/batch_us  scoring latency per query
+
+Usage:
+    python -m benchmarks.quantization --scales current small --output benchmarks/results/quantization.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.bench import DEFAULT_DATA_DIR, measure, train_benchmark_model
+from benchmarks.synthetic import SCALES, make_queries, write_dataset
+from symptom_engine import load_symptoms_data
+from symptom_engine.numpy_scorer import SCORER_DIRNAME, WEIGHT_DTYPES, export_numpy_scorer, load_numpy_scorer
+
+DEFAULT_OUTPUT = os.path.join('benchmarks', 'results', 'quantization.json')
+
+def top_k(probabilities: np.ndarray, k: int) -> np.ndarray:
+    """Column indices of the k largest values per row"""
+    k = min(k, probabilities.shape[1])
+    return np.argpartition(-probabilities, k - 1, axis=1)[:, :k]
+
+def weights_size(model_dir: str) -> int:
+    """Bytes of the weight matrix plus any dequantization arrays"""
+    scorer_dir = os.path.join(model_dir, SCORER_DIRNAME)
+    names = ('weights.npy', 'weight_scale.npy', 'weight_offset.npy')
+    return sum(os.path.getsize(os.path.join(scorer_dir, name)) for name in names
+               if os.path.exists(os.path.join(scorer_dir, name)))
+
+def run_scale(scale: str, data_dir: str, n_queries: int, repeat: int, featurizer: str) -> List[Dict]:
+    """Report every weight dtype for one dataset scale"""
+    df = load_symptoms_data(write_dataset(data_dir, scale))
+    texts = [" ".join(query) for query in make_queries(df, n_queries)]
+    print(f"\n📏 Scale '{scale}': {SCALES[scale]['rows']:,} rows, {SCALES[scale]['conditions']:,} conditions")
+
+    results = []
+    reference = None
+    with tempfile.TemporaryDirectory() as work_dir:
+        model, vectorizer = train_benchmark_model(df, os.path.join(work_dir, 'trained'), featurizer)
+
+        for dtype in WEIGHT_DTYPES:
+            model_dir = os.path.join(work_dir, dtype)
+            export_numpy_scorer(model_dir, model, vectorizer, {'model_type': 'MultinomialNB'}, dtype)
+            scorer = load_numpy_scorer(model_dir)
+            score = lambda batch: scorer['model'].predict_proba(scorer['vectorizer'].transform(batch))
+
+            probabilities = score(texts)
+            if reference is None:
+                reference = probabilities
+            top5 = top_k(probabilities, 5)
+            reference_top5 = top_k(reference, 5)
+            overlap = [len(set(row) & set(ref_row)) / len(ref_row) for row, ref_row in zip(top5, reference_top5)]
+
+            single = measure(lambda text: score([text]), texts, repeat)
+            batch = measure(score, [texts], repeat)
+            result = {
+                "scale": scale,
+                "featurizer": featurizer,
+                "dtype": dtype,
+                "top1_agreement": float(np.mean(probabilities.argmax(axis=1) == reference.argmax(axis=1))),
+                "top5_agreement": float(np.mean(overlap)),
+                "max_abs_prob": float(np.abs(probabilities - reference).max()),
+                "weights_mb": weights_size(model_dir) / 2 ** 20,
+                "single_us": single['median_s'] * 1e6,
+                "batch_us": batch['median_s'] / len(texts) * 1e6
+            }
+            results.append(result)
+            print(f"   {dtype:<8} top1 {result['top1_agreement']:>7.2%}  top5 {result['top5_agreement']:>7.2%}  "
+                  f"max Δp {result['max_abs_prob']:.1e}  {result['weights_mb']:>8.2f} MB  "
+                  f"{result['single_us']:>8.1f} µs single  {result['batch_us']:>7.1f} µs/query batched")
+    return results
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare quantized scorer weights against float64")
+    parser.add_argument('--scales', nargs='+', choices=list(SCALES), default=['current', 'small'])
+    parser.add_argument('--featurizer', choices=['tfidf', 'hashing'], default='tfidf')
+    parser.add_argument('--queries', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--data-dir', default=DEFAULT_DATA_DIR)
+    parser.add_argument('--output', default=DEFAULT_OUTPUT)
+    args = parser.parse_args(argv)
+
+    print("🩺 Scorer Weight Quantization Report")
+    print("=" * 50)
+    results = []
+    for scale in args.scales:
+        results.extend(run_scale(scale, args.data_dir, args.queries, args.repeat, args.featurizer))
+
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump({"meta": {"created_at": pd.Timestamp.now().isoformat()}, "results": results}, f, indent=2)
+    print(f"\n💾 Results written to {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""
+Synthetic Datasets for Symptom Checker Benchmarks
+Generates symptoms.csv-style data at configurable scales
+"""
+
+import os
+import numpy as np
+import pandas as pd
+from typing import Dict, List
+
+# Named scales: dataset rows and distinct conditions
+SCALES: Dict[str, Dict[str, int]] = {
+    'current': {'rows': 123, 'conditions': 100},
+    'small': {'rows': 10_000, 'conditions': 1_000},
+    'medium': {'rows': 100_000, 'conditions': 5_000},
+    'large': {'rows': 1_000_000, 'conditions': 10_000},
+}
+
+_SYLLABLES = ['ach', 'pain', 'itch', 'fev', 'cough', 'sore', 'swell', 'numb', 'burn', 'ras',
+              'head', 'chest', 'throat', 'back', 'joint', 'skin', 'eye', 'ear', 'stomach', 'leg',
+              'dry', 'sharp', 'dull', 'mild', 'severe', 'red', 'blur', 'loss', 'cramp', 'tight']
+
+def make_vocabulary(n_words: int, seed: int = 0) -> List[str]:
+    """Distinct pseudo-medical words built from common syllables"""
+    rng = np.random.default_rng(seed)
+    words = set()
+    while len(words) < n_words:
+        parts = rng.choice(_SYLLABLES, size=rng.integers(1, 4))
+        words.add(''.join(parts) + rng.choice(['', 'ing', 'ness', 'ia', 'itis']))
+    return sorted(words)
+
+def make_symptoms(n_symptoms: int, seed: int = 0, rng: np.random.Generator = None) -> List[str]:
+    """n_symptoms distinct 1-3 word symptom phrases, sorted"""
+    rng = rng if rng is not None else np.random.default_rng(seed)
+    words = make_vocabulary(max(20, int(n_symptoms ** 0.5) * 4), seed)
+
+    symptoms = set()
+    while len(symptoms) < n_symptoms:
+        # Draw in blocks of 1-3 word phrases until enough are distinct
+        block = n_symptoms - len(symptoms)
+        word_ids = rng.integers(0, len(words), size=(block, 3))
+        lengths = rng.integers(1, 4, size=block)
+        symptoms.update(' '.join(words[i] for i in ids[:n]) for ids, n in zip(word_ids, lengths))
+    return sorted(symptoms)[:n_symptoms]
+
+def make_dataset(rows: int, conditions: int, seed: int = 0) -> pd.DataFrame:
+    """symptom/condition pairs with a Zipf-like spread of symptom popularity"""
+    rng = np.random.default_rng(seed)
+    n_symptoms = max(10, rows // 4)
+    symptoms = make_symptoms(n_symptoms, seed, rng)
+
+    popularity = 1.0 / np.arange(1, n_symptoms + 1)
+    popularity /= popularity.sum()
+    symptom_ids = rng.choice(n_symptoms, size=rows, p=popularity)
+    condition_ids = rng.integers(0, conditions, size=rows)
+
+    return pd.DataFrame({
+        'symptom': np.asarray(symptoms, dtype=object)[symptom_ids],
+        'condition': [f"Condition {i:05d}" for i in condition_ids]
+    })
+
+def write_dataset(directory: str, scale: str, seed: int = 0) -> str:
+    """Write (or reuse) the CSV for a named scale and return its path"""
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"symptoms_{scale}.csv")
+    if not os.path.exists(path):
+        make_dataset(**SCALES[scale], seed=seed).to_csv(path, index=False)
+    return path
+
+def make_queries(df: pd.DataFrame, n_queries: int, symptoms_per_query: int = 3, seed: int = 1) -> List[List[str]]:
+    """Patient symptom lists mixing exact symptoms, single words and typos"""
+    rng = np.random.default_rng(seed)
+    vocabulary = df['symptom'].unique()
+    queries = []
+    for _ in range(n_queries):
+        query = []
+        for symptom in rng.choice(vocabulary, size=symptoms_per_query):
+            kind = rng.integers(0, 3)
+            if kind == 1:
+                symptom = rng.choice(symptom.split())
+            elif kind == 2 and len(symptom) > 3:
+                i = rng.integers(0, len(symptom) - 2)
+                symptom = symptom[:i] + symptom[i + 1] + symptom[i] + symptom[i + 2:]
+            query.append(str(symptom))
+        queries.append(query)
+    return queries
@@ -0,0 +1,111 @@
+"""
+Worker Throughput Benchmark for Symptom Checker Bot
+Measures ML scoring throughput as the number of worker processes grows
+
+Client threads call get_top_predictions_batch back to back for a fixed time,
+first on the calling thread (0 workers) and then through InferencePools of
+increasing size. The prediction cache is disabled so every call is scored.
+
+Usage:
+    python -m benchmarks.workers --scale small --workers 0 1 2 4 --clients 8
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List
+
+import pandas as pd
+
+from benchmarks.bench import DEFAULT_DATA_DIR, train_benchmark_model
+from benchmarks.synthetic import SCALES, make_queries, write_dataset
+from symptom_engine import load_symptoms_data
+from symptom_engine.ml_predictor import SymptomMLPredictor
+
+DEFAULT_OUTPUT = os.path.join('benchmarks', 'results', 'workers.json')
+
+def run_workers(model_dir: str, workers: int, texts: List[str], clients: int, batch_size: int,
+                duration: float) -> Dict:
+    """Texts scored per second with this many workers and concurrent clients"""
+    predictor = SymptomMLPredictor(model_dir, cache_size=0, workers=workers)
+    predictor.load_models()
+    batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+    # Warm up so worker start-up is not timed
+    for batch in batches[:max(1, workers)]:
+        predictor.get_top_predictions_batch(batch, 5)
+
+    scored = [0] * clients
+    deadline = time.perf_counter() + duration
+
+    def client(slot: int):
+        i = slot
+        while time.perf_counter() < deadline:
+            batch = batches[i % len(batches)]
+            predictor.get_top_predictions_batch(batch, 5)
+            scored[slot] += len(batch)
+            i += clients
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=client, args=(slot,)) for slot in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    restarts = predictor.pool.stats()['restarts'] if predictor.pool else 0
+    predictor.close()
+
+    return {
+        "workers": workers,
+        "clients": clients,
+        "batch_size": batch_size,
+        "texts": sum(scored),
+        "seconds": elapsed,
+        "texts_per_s": sum(scored) / elapsed,
+        "restarts": restarts
+    }
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="ML scoring throughput by worker count")
+    parser.add_argument('--scale', choices=list(SCALES), default='small')
+    parser.add_argument('--featurizer', choices=['tfidf', 'hashing'], default='tfidf')
+    parser.add_argument('--workers', nargs='+', type=int, default=[0, 1, 2, 4])
+    parser.add_argument('--clients', type=int, default=8, help="Concurrent client threads")
+    parser.add_argument('--batch-size', type=int, default=32, help="Texts per request")
+    parser.add_argument('--duration', type=float, default=5.0, help="Seconds per worker count")
+    parser.add_argument('--queries', type=int, default=2000)
+    parser.add_argument('--data-dir', default=DEFAULT_DATA_DIR)
+    parser.add_argument('--output', default=DEFAULT_OUTPUT)
+    args = parser.parse_args(argv)
+
+    print("🩺 ML Worker Throughput")
+    print("=" * 50)
+    df = load_symptoms_data(write_dataset(args.data_dir, args.scale))
+    texts = [" ".join(query) for query in make_queries(df, args.queries)]
+    print(f"📏 Scale '{args.scale}': {SCALES[args.scale]['rows']:,} rows, {SCALES[args.scale]['conditions']:,} conditions; "
+          f"{args.clients} clients x {args.batch_size} texts per request; {os.cpu_count()} CPUs")
+
+    results = []
+    with tempfile.TemporaryDirectory() as model_dir:
+        train_benchmark_model(df, model_dir, args.featurizer)
+        baseline = None
+        for workers in args.workers:
+            result = run_workers(model_dir, workers, texts, args.clients, args.batch_size, args.duration)
+            baseline = baseline or result['texts_per_s']
+            results.append(result)
+            print(f"   {workers:>2} workers  {result['texts_per_s']:>10.0f} texts/s  "
+                  f"x{result['texts_per_s'] / baseline:.2f}  ({result['restarts']} restarts)")
+
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump({"meta": {"created_at": pd.Timestamp.now().isoformat(), "cpus": os.cpu_count(),
+                            "scale": args.scale}, "results": results}, f, indent=2)
+    print(f"\n💾 Results written to {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,25 @@
 import streamlit as st
 import pandas as pd
-import re
 from collections import Counter
 from typing import List, Dict, Tuple
 from datetime import datetime
 import base64
 import json
 
+from symptom_engine import (
+    SymptomIndex,
+    find_symptom_matches,
+    get_combined_conditions,
+    suggest_symptoms,
+    normalize_symptom,
+    get_normalization_stats,
+    trace_span,
+    traced,
+    get_stage_stats,
+    dump_stage_stats
+)
+from symptom_engine.data import load_symptoms_data as read_symptoms_data
+
 # Optional imports
 try:
     from deep_translator import GoogleTranslator
@@ -22,7 +35,7 @@ except ImportError:
 
 # ML prediction imports
 try:
-    from ml_predictor import (
+    from symptom_engine.ml_predictor import (
         predict_symptoms_ml, 
         get_top_predictions_ml, 
         is_ml_available, 
@@ -776,30 +789,7 @@ def get_css_styles(dark_mode=False):
 def load_symptoms_data() -> pd.DataFrame:
     """Load the symptoms dataset with caching for better performance."""
     try:
-        df = pd.read_csv('symptoms.csv')
-        # Clean and normalize the data
-        df['symptom'] = df['symptom'].str.lower().str.strip()
-        df['condition'] = df['condition'].str.strip()
-        
-        # Add severity levels if not present
-        if 'severity' not in df.columns:
-            # Add mock severity data for demonstration
-            severity_map = {
-                'Heart Attack': 'Critical',
-                'Pneumonia': 'High',
-                'COVID-19': 'High',
-                'Appendicitis': 'High',
-                'Malaria': 'High',
-                'Migraine': 'Medium',
-                'Flu': 'Medium',
-                'Asthma': 'Medium',
-                'Common Cold': 'Low',
-                'Allergies': 'Low',
-                'Tension Headache': 'Low'
-            }
-            df['severity'] = df['condition'].map(severity_map).fillna('Medium')
-        
-        return df
+        return read_symptoms_data()
     except FileNotFoundError:
         st.error("❌ symptoms.csv file not found! Please ensure the file exists in the same directory.")
         st.stop()
@@ -807,64 +797,12 @@ def load_symptoms_data() -> pd.DataFrame:
         st.error(f"❌ Error loading data: {str(e)}")
         st.stop()
 
-def normalize_symptom(symptom: str) -> str:
-    """Normalize symptom text for better matching."""
-    symptom = symptom.lower().strip()
-    symptom = re.sub(r'[^\w\s-]', '', symptom)
-    symptom = re.sub(r'\s+', ' ', symptom)
-    return symptom
-
-def find_symptom_matches(user_symptoms: List[str], df: pd.DataFrame) -> Dict[str, List[Tuple[str, str]]]:
-    """Find matching conditions for given symptoms with severity."""
-    matches = {}
-    
-    for user_symptom in user_symptoms:
-        user_symptom_normalized = normalize_symptom(user_symptom)
-        matched_conditions = []
-        
-        # Exact match
-        exact_matches = df[df['symptom'] == user_symptom_normalized][['condition', 'severity']].values.tolist()
-        matched_conditions.extend([(condition, severity) for condition, severity in exact_matches])
-        
-        # Partial match
-        for _, row in df.iterrows():
-            db_symptom = row['symptom']
-            condition = row['condition']
-            severity = row['severity']
-            
-            if any(condition == existing_condition for existing_condition, _ in matched_conditions):
-                continue
-                
-            if (user_symptom_normalized in db_symptom or 
-                db_symptom in user_symptom_normalized or
-                any(word in db_symptom.split() for word in user_symptom_normalized.split() if len(word) > 2)):
-                matched_conditions.append((condition, severity))
-        
-        matches[user_symptom] = matched_conditions
-    
-    return matches
-
-def get_combined_conditions(matches: Dict[str, List[Tuple[str, str]]]) -> List[Tuple[str, int, str]]:
-    """Get conditions ranked by frequency and severity."""
-    condition_data = {}
-    
-    for conditions in matches.values():
-        for condition, severity in conditions:
-            if condition not in condition_data:
-                condition_data[condition] = {'count': 0, 'severity': severity}
-            condition_data[condition]['count'] += 1
-    
-    # Sort by severity weight and frequency
-    severity_weights = {'Critical': 4, 'High': 3, 'Medium': 2, 'Low': 1}
-    
-    sorted_conditions = sorted(
-        condition_data.items(),
-        key=lambda x: (severity_weights.get(x[1]['severity'], 2), x[1]['count']),
-        reverse=True
-    )
-    
-    return [(condition, data['count'], data['severity']) for condition, data in sorted_conditions]
+@st.cache_resource
+def load_symptom_index(_df: pd.DataFrame) -> SymptomIndex:
+    """Build the symptom lookup index once per process."""
+    return SymptomIndex.from_dataframe(_df)
 
+@traced()
 def translate_text(text: str, target_language: str = 'hi') -> str:
     """Translate text to target language if translator is available."""
     if not TRANSLATOR_AVAILABLE:
@@ -979,7 +917,8 @@ def main():
     """, unsafe_allow_html=True)
     
     # Load data
-    df = load_symptoms_data()
+    with trace_span("load_symptoms_data"):
+        df = load_symptoms_data()
     
     # Sidebar with enhanced features
     with st.sidebar:
@@ -1044,10 +983,12 @@ def main():
                 
                 # Show ML model info
                 with st.expander("🔍 AI Model Information"):
-                    st.write(f"**Model Type:** {ml_info.get('model_type', 'Unknown')}")
+                    st.write(f"**Model Type:** {ml_info.get('model_type', 'Unknown')} (version {ml_info.get('version', 'Unknown')})")
                     st.write(f"**Features:** {ml_info.get('features_count', 'Unknown')}")
                     st.write(f"**Conditions:** {ml_info.get('classes_count', 'Unknown')}")
                     st.write(f"**Created:** {ml_info.get('created_at', 'Unknown')[:19] if ml_info.get('created_at') != 'Unknown' else 'Unknown'}")
+                    st.write(f"**Prediction Cache:** {ml_info.get('cache_hit_rate', 0.0):.0%} hit rate ({ml_info.get('cache_size', 0)} entries)")
+                    st.write(f"**Model Reloads:** {ml_info.get('reload_count', 0)} (last took {ml_info.get('last_reload_seconds', 0.0):.2f}s)")
             else:
                 st.warning("🤖 AI Model not available")
                 prediction_method = "rule_based"
@@ -1138,45 +1079,44 @@ def main():
         # Auto-scroll to results
         st.markdown('<a name="results"></a>', unsafe_allow_html=True)
         
-        with st.spinner("🔍 Analyzing your symptoms..."):
-            # Simulate processing time for better UX
-            import time
-            time.sleep(1)
-            
+        with st.spinner("🔍 Analyzing your symptoms..."), trace_span("analysis") as analysis_span:
             st.header("🔍 Analysis Results")
             
             # Show entered symptoms with body part mapping
-            st.markdown("### 📝 Your Reported Symptoms")
-            
-            # Create responsive columns
-            num_symptoms = len(user_symptoms)
-            if num_symptoms <= 2:
-                cols = st.columns(num_symptoms)
-            elif num_symptoms <= 4:
-                cols = st.columns(2)
-            else:
-                cols = st.columns(3)
+            with trace_span("render_symptoms"):
+                st.markdown("### 📝 Your Reported Symptoms")
+            
+                # Create responsive columns
+                num_symptoms = len(user_symptoms)
+                if num_symptoms <= 2:
+                    cols = st.columns(num_symptoms)
+                elif num_symptoms <= 4:
+                    cols = st.columns(2)
+                else:
+                    cols = st.columns(3)
             
-            for i, symptom in enumerate(user_symptoms):
-                body_part = get_body_part_mapping(symptom)
-                with cols[i % len(cols)]:
-                    st.markdown(f"""
-                    <div class="symptom-card">
-                        <div style="text-align: center;">
-                            <div style="font-size: 1.5rem; margin-bottom: 0.5rem;">🩺</div>
-                            <strong style="color: {'#f1f5f9' if st.session_state.dark_mode else '#1f2937'};">{symptom.title()}</strong>
-                            <div style="font-size: 0.8rem; margin-top: 0.5rem; opacity: 0.8;">{body_part}</div>
+                for i, symptom in enumerate(user_symptoms):
+                    body_part = get_body_part_mapping(symptom)
+                    with cols[i % len(cols)]:
+                        st.markdown(f"""
+                        <div class="symptom-card">
+                            <div style="text-align: center;">
+                                <div style="font-size: 1.5rem; margin-bottom: 0.5rem;">🩺</div>
+                                <strong style="color: {'#f1f5f9' if st.session_state.dark_mode else '#1f2937'};">{symptom.title()}</strong>
+                                <div style="font-size: 0.8rem; margin-top: 0.5rem; opacity: 0.8;">{body_part}</div>
+                            </div>
                         </div>
-                    </div>
-                    """, unsafe_allow_html=True)
+                        """, unsafe_allow_html=True)
             
             st.markdown("---")
             
             # Find matches based on selected method
             if prediction_method in ["rule_based", "both"]:
                 # Rule-based matching
-                matches = find_symptom_matches(user_symptoms, df)
-                combined_conditions = get_combined_conditions(matches)
+                with trace_span("load_symptom_index"):
+                    symptom_index = load_symptom_index(df)
+                matches = find_symptom_matches(user_symptoms, df, symptom_index)
+                combined_conditions = get_combined_conditions(matches, symptom_index)
             else:
                 matches = {}
                 combined_conditions = []
@@ -1185,239 +1125,255 @@ def main():
             ml_predictions = []
             if prediction_method in ["ml_based", "both"] and ML_AVAILABLE:
                 try:
-                    ml_predictions = predict_symptoms_ml(user_symptoms)
+                    with trace_span("predict_symptoms_ml"):
+                        ml_predictions = predict_symptoms_ml(user_symptoms)
                 except Exception as e:
                     st.error(f"ML prediction error: {str(e)}")
             
             # Show results based on method
-            if prediction_method == "rule_based" and combined_conditions:
-                st.markdown("### 🏥 Possible Medical Conditions")
-                st.markdown("*Sorted by severity and symptom match frequency:*")
-                
-                # Show top conditions with severity
-                for i, (condition, frequency, severity) in enumerate(combined_conditions):
-                    # Determine confidence level
-                    if frequency >= 3:
-                        confidence = "High"
-                        confidence_class = "confidence-high"
-                        confidence_icon = "🔴"
-                    elif frequency >= 2:
-                        confidence = "Medium"
-                        confidence_class = "confidence-medium"
-                        confidence_icon = "🟡"
-                    else:
-                        confidence = "Low"
-                        confidence_class = "confidence-low"
-                        confidence_icon = "🔵"
-                    
-                    # Severity styling
-                    severity_class = f"severity-{severity.lower()}"
-                    severity_icons = {
-                        'Critical': '🚨',
-                        'High': '⚠️',
-                        'Medium': '⚡',
-                        'Low': 'ℹ️'
-                    }
-                    
-                    # Get matched symptoms
-                    matched_symptoms_list = []
-                    for symptom, conditions in matches.items():
-                        if any(condition == cond for cond, _ in conditions):
-                            matched_symptoms_list.append(symptom.title())
-                    
-                    matched_symptoms_text = ", ".join(matched_symptoms_list) if matched_symptoms_list else "General symptoms"
-                    
-                    # Translation if enabled
-                    translated_condition = translate_text(condition, 'hi') if translate_results else condition
-                    
-                    # Create enhanced condition card
-                    st.markdown(f"""
-                    <div class="condition-card">
-                        <div class="condition-title">
-                            ✅ {condition}
-                            <span class="severity-badge {severity_class}">
-                                {severity_icons.get(severity, 'ℹ️')} {severity}
-                            </span>
-                        </div>
-                        <div class="confidence-badge {confidence_class}">
-                            {confidence_icon} {confidence} Confidence
-                        </div>
-                        <div style="color: {'#94a3b8' if st.session_state.dark_mode else '#6b7280'}; margin: 0.5rem 0;">
-                            🧪 <strong>Match Score:</strong> {frequency} symptom{'s' if frequency != 1 else ''} matched
-                        </div>
-                        <div class="info-section">
-                            🧾 <strong>Matched Symptoms:</strong> {matched_symptoms_text}
-                        </div>
-                        {f'<div class="translation-section">🌐 <strong>Hindi Translation:</strong> {translated_condition}</div>' if translate_results and translated_condition != condition else ''}
-                    </div>
-                    """, unsafe_allow_html=True)
-                
-                # Export to PDF option
-                if PDF_AVAILABLE:
-                    st.markdown("---")
-                    col1, col2, col3 = st.columns([1, 1, 1])
-                    with col2:
-                        if st.button("📄 Download Report as PDF", type="primary"):
-                            pdf_data = generate_pdf_report(user_symptoms, combined_conditions, matches)
-                            if pdf_data:
-                                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                                st.download_button(
-                                    label="⬇️ Download PDF Report",
-                                    data=base64.b64decode(pdf_data),
-                                    file_name=f"symptom_report_{timestamp}.pdf",
-                                    mime="application/pdf"
-                                )
-                            else:
-                                st.error("Failed to generate PDF report")
-                else:
-                    st.info("💡 Install 'pdfkit' for PDF export functionality")
-                
-                # Detailed breakdown
-                with st.expander("📊 Detailed Symptom Analysis"):
-                    for symptom, conditions in matches.items():
-                        if conditions:
-                            st.write(f"**{symptom.title()}** → {len(conditions)} possible condition(s)")
-                            for condition, severity in conditions[:5]:
-                                st.write(f"  • {condition} ({severity} severity)")
-                            if len(conditions) > 5:
-                                st.write(f"  ... and {len(conditions) - 5} more")
-                        else:
-                            st.write(f"**{symptom.title()}** → No direct matches found")
-            
-            # ML Predictions Section
-            elif prediction_method == "ml_based" and ml_predictions:
-                st.markdown("### 🤖 AI-Powered Medical Predictions")
-                st.markdown("*Generated using trained machine learning model:*")
+            with trace_span("render_results"):
+                if prediction_method == "rule_based" and combined_conditions:
+                    st.markdown("### 🏥 Possible Medical Conditions")
+                    st.markdown("*Sorted by severity and symptom match frequency:*")
                 
-                # Display ML predictions
-                for i, pred in enumerate(ml_predictions):
-                    if pred['condition'] != "Model not loaded" and pred['condition'] != "Prediction error":
-                        # Determine confidence styling
-                        confidence = pred['confidence']
-                        if confidence >= 0.7:
+                    # Show top conditions with severity
+                    for i, (condition, frequency, severity) in enumerate(combined_conditions):
+                        # Determine confidence level
+                        if frequency >= 3:
+                            confidence = "High"
                             confidence_class = "confidence-high"
                             confidence_icon = "🔴"
-                            confidence_text = "High"
-                        elif confidence >= 0.4:
+                        elif frequency >= 2:
+                            confidence = "Medium"
                             confidence_class = "confidence-medium"
                             confidence_icon = "🟡"
-                            confidence_text = "Medium"
                         else:
+                            confidence = "Low"
                             confidence_class = "confidence-low"
                             confidence_icon = "🔵"
-                            confidence_text = "Low"
-                        
-                        translated_condition = translate_text(pred['condition'], 'hi') if translate_results else pred['condition']
-                        
-                        # Create enhanced condition card (following the same pattern as working HTML)
+                    
+                        # Severity styling
+                        severity_class = f"severity-{severity.lower()}"
+                        severity_icons = {
+                            'Critical': '🚨',
+                            'High': '⚠️',
+                            'Medium': '⚡',
+                            'Low': 'ℹ️'
+                        }
+                    
+                        # Get matched symptoms
+                        matched_symptoms_list = []
+                        for symptom, conditions in matches.items():
+                            if any(condition == cond for cond, _ in conditions):
+                                matched_symptoms_list.append(symptom.title())
+                    
+                        matched_symptoms_text = ", ".join(matched_symptoms_list) if matched_symptoms_list else "General symptoms"
+                    
+                        # Translation if enabled
+                        translated_condition = translate_text(condition, 'hi') if translate_results else condition
+                    
+                        # Create enhanced condition card
                         st.markdown(f"""
                         <div class="condition-card">
                             <div class="condition-title">
-                                🤖 {pred['condition']}
+                                ✅ {condition}
+                                <span class="severity-badge {severity_class}">
+                                    {severity_icons.get(severity, 'ℹ️')} {severity}
+                                </span>
                             </div>
                             <div class="confidence-badge {confidence_class}">
-                                {confidence_icon} {confidence_text} AI Confidence
+                                {confidence_icon} {confidence} Confidence
                             </div>
                             <div style="color: {'#94a3b8' if st.session_state.dark_mode else '#6b7280'}; margin: 0.5rem 0;">
-                                🎯 <strong>ML Score:</strong> {confidence:.2%} confidence
+                                🧪 <strong>Match Score:</strong> {frequency} symptom{'s' if frequency != 1 else ''} matched
                             </div>
                             <div class="info-section">
-                                🧾 <strong>Input:</strong> {pred['symptom']}
+                                🧾 <strong>Matched Symptoms:</strong> {matched_symptoms_text}
                             </div>
-                            {f'<div class="translation-section">🌐 <strong>Hindi Translation:</strong> {translated_condition}</div>' if translate_results and translated_condition != pred['condition'] else ''}
+                            {f'<div class="translation-section">🌐 <strong>Hindi Translation:</strong> {translated_condition}</div>' if translate_results and translated_condition != condition else ''}
                         </div>
                         """, unsafe_allow_html=True)
-                        
-                        if i < len(ml_predictions) - 1:
-                            st.markdown('<hr class="custom-divider">', unsafe_allow_html=True)
                 
-                # ML Model insights
-                with st.expander("🔍 AI Model Insights"):
-                    st.write("**Model Predictions:**")
-                    for pred in ml_predictions:
-                        st.write(f"• **{pred['symptom']}** → {pred['condition']} ({pred['confidence']:.2%})")
-            
-            # Comparison Mode
-            elif prediction_method == "both" and (combined_conditions or ml_predictions):
-                st.markdown("### 🔄 Prediction Method Comparison")
+                    # Export to PDF option
+                    if PDF_AVAILABLE:
+                        st.markdown("---")
+                        col1, col2, col3 = st.columns([1, 1, 1])
+                        with col2:
+                            if st.button("📄 Download Report as PDF", type="primary"):
+                                pdf_data = generate_pdf_report(user_symptoms, combined_conditions, matches)
+                                if pdf_data:
+                                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                                    st.download_button(
+                                        label="⬇️ Download PDF Report",
+                                        data=base64.b64decode(pdf_data),
+                                        file_name=f"symptom_report_{timestamp}.pdf",
+                                        mime="application/pdf"
+                                    )
+                                else:
+                                    st.error("Failed to generate PDF report")
+                    else:
+                        st.info("💡 Install 'pdfkit' for PDF export functionality")
                 
-                col1, col2 = st.columns(2)
+                    # Detailed breakdown
+                    with st.expander("📊 Detailed Symptom Analysis"):
+                        for symptom, conditions in matches.items():
+                            if conditions:
+                                st.write(f"**{symptom.title()}** → {len(conditions)} possible condition(s)")
+                                for condition, severity in conditions[:5]:
+                                    st.write(f"  • {condition} ({severity} severity)")
+                                if len(conditions) > 5:
+                                    st.write(f"  ... and {len(conditions) - 5} more")
+                            else:
+                                st.write(f"**{symptom.title()}** → No direct matches found")
+            
+                # ML Predictions Section
+                elif prediction_method == "ml_based" and ml_predictions:
+                    st.markdown("### 🤖 AI-Powered Medical Predictions")
+                    st.markdown("*Generated using trained machine learning model:*")
                 
-                with col1:
-                    st.markdown("#### 📋 Rule-Based Results")
-                    if combined_conditions:
-                        for condition, frequency, severity in combined_conditions[:3]:
+                    # Display ML predictions
+                    for i, pred in enumerate(ml_predictions):
+                        if pred['condition'] != "Model not loaded" and pred['condition'] != "Prediction error":
+                            # Determine confidence styling
+                            confidence = pred['confidence']
+                            if confidence >= 0.7:
+                                confidence_class = "confidence-high"
+                                confidence_icon = "🔴"
+                                confidence_text = "High"
+                            elif confidence >= 0.4:
+                                confidence_class = "confidence-medium"
+                                confidence_icon = "🟡"
+                                confidence_text = "Medium"
+                            else:
+                                confidence_class = "confidence-low"
+                                confidence_icon = "🔵"
+                                confidence_text = "Low"
+                        
+                            translated_condition = translate_text(pred['condition'], 'hi') if translate_results else pred['condition']
+                        
+                            # Create enhanced condition card (following the same pattern as working HTML)
                             st.markdown(f"""
-                            <div style="background: #f0f9ff; padding: 1rem; border-radius: 8px; margin: 0.5rem 0; border-left: 4px solid #0ea5e9;">
-                                <strong>{condition}</strong><br>
-                                <small>Matches: {frequency} symptoms | Severity: {severity}</small>
+                            <div class="condition-card">
+                                <div class="condition-title">
+                                    🤖 {pred['condition']}
+                                </div>
+                                <div class="confidence-badge {confidence_class}">
+                                    {confidence_icon} {confidence_text} AI Confidence
+                                </div>
+                                <div style="color: {'#94a3b8' if st.session_state.dark_mode else '#6b7280'}; margin: 0.5rem 0;">
+                                    🎯 <strong>ML Score:</strong> {confidence:.2%} confidence
+                                </div>
+                                <div class="info-section">
+                                    🧾 <strong>Input:</strong> {pred['symptom']}
+                                </div>
+                                {f'<div class="translation-section">🌐 <strong>Hindi Translation:</strong> {translated_condition}</div>' if translate_results and translated_condition != pred['condition'] else ''}
                             </div>
                             """, unsafe_allow_html=True)
-                    else:
-                        st.info("No rule-based matches found")
+                        
+                            if i < len(ml_predictions) - 1:
+                                st.markdown('<hr class="custom-divider">', unsafe_allow_html=True)
+                
+                    # ML Model insights
+                    with st.expander("🔍 AI Model Insights"):
+                        st.write("**Model Predictions:**")
+                        for pred in ml_predictions:
+                            st.write(f"• **{pred['symptom']}** → {pred['condition']} ({pred['confidence']:.2%})")
+            
+                # Comparison Mode
+                elif prediction_method == "both" and (combined_conditions or ml_predictions):
+                    st.markdown("### 🔄 Prediction Method Comparison")
+                
+                    col1, col2 = st.columns(2)
                 
-                with col2:
-                    st.markdown("#### 🤖 AI-Based Results")
-                    if ml_predictions:
-                        for pred in ml_predictions[:3]:
-                            if pred['condition'] not in ["Model not loaded", "Prediction error"]:
+                    with col1:
+                        st.markdown("#### 📋 Rule-Based Results")
+                        if combined_conditions:
+                            for condition, frequency, severity in combined_conditions[:3]:
                                 st.markdown(f"""
-                                <div style="background: #f0fdf4; padding: 1rem; border-radius: 8px; margin: 0.5rem 0; border-left: 4px solid #22c55e;">
-                                    <strong>{pred['condition']}</strong><br>
-                                    <small>Input: {pred['symptom']} | Confidence: {pred['confidence']:.2%}</small>
+                                <div style="background: #f0f9ff; padding: 1rem; border-radius: 8px; margin: 0.5rem 0; border-left: 4px solid #0ea5e9;">
+                                    <strong>{condition}</strong><br>
+                                    <small>Matches: {frequency} symptoms | Severity: {severity}</small>
                                 </div>
                                 """, unsafe_allow_html=True)
-                    else:
-                        st.info("No AI predictions available")
-                
-                # Comparison insights
-                st.markdown("#### 🔬 Method Comparison")
-                st.markdown("""
-                - **Rule-Based**: Uses exact symptom matching from medical database
-                - **AI-Based**: Uses machine learning to predict conditions from symptom patterns
-                - **Best Practice**: Compare both results and consult healthcare professionals
-                """)
-            
-            else:
-                # Enhanced no results section
-                st.markdown("""
-                <div class="no-results">
-                    <div class="no-results-icon">🤔</div>
-                    <div class="no-results-title">No Direct Matches Found</div>
-                    <p>Don't worry! Try rephrasing your symptoms or check for typos. 
-                    Our database might have similar conditions under different terms.</p>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                # Enhanced suggestions
-                st.markdown("### 💡 Did You Mean Any of These?")
-                all_symptoms = df['symptom'].unique()
-                suggestions = []
+                        else:
+                            st.info("No rule-based matches found")
                 
-                for user_symptom in user_symptoms:
-                    normalized_input = normalize_symptom(user_symptom)
-                    for db_symptom in all_symptoms:
-                        if any(word in db_symptom for word in normalized_input.split() if len(word) > 2):
-                            suggestions.append(db_symptom)
+                    with col2:
+                        st.markdown("#### 🤖 AI-Based Results")
+                        if ml_predictions:
+                            for pred in ml_predictions[:3]:
+                                if pred['condition'] not in ["Model not loaded", "Prediction error"]:
+                                    st.markdown(f"""
+                                    <div style="background: #f0fdf4; padding: 1rem; border-radius: 8px; margin: 0.5rem 0; border-left: 4px solid #22c55e;">
+                                        <strong>{pred['condition']}</strong><br>
+                                        <small>Input: {pred['symptom']} | Confidence: {pred['confidence']:.2%}</small>
+                                    </div>
+                                    """, unsafe_allow_html=True)
+                        else:
+                            st.info("No AI predictions available")
                 
-                if suggestions:
-                    unique_suggestions = list(set(suggestions))[:6]
-                    cols = st.columns(2)
-                    for i, suggestion in enumerate(unique_suggestions):
-                        body_part = get_body_part_mapping(suggestion)
-                        with cols[i % 2]:
-                            st.markdown(f"""
-                            <div class="suggestion-card">
-                                <strong>💡 {suggestion.title()}</strong>
-                                <div style="font-size: 0.8rem; margin-top: 0.25rem; opacity: 0.8;">{body_part}</div>
-                            </div>
-                            """, unsafe_allow_html=True)
+                    # Comparison insights
+                    st.markdown("#### 🔬 Method Comparison")
+                    st.markdown("""
+                    - **Rule-Based**: Uses exact symptom matching from medical database
+                    - **AI-Based**: Uses machine learning to predict conditions from symptom patterns
+                    - **Best Practice**: Compare both results and consult healthcare professionals
+                    """)
+            
                 else:
+                    # Enhanced no results section
                     st.markdown("""
-                    <div class="alert alert-info">
-                        Try using more common medical terms or check our available symptoms in the sidebar.
+                    <div class="no-results">
+                        <div class="no-results-icon">🤔</div>
+                        <div class="no-results-title">No Direct Matches Found</div>
+                        <p>Don't worry! Try rephrasing your symptoms or check for typos. 
+                        Our database might have similar conditions under different terms.</p>
                     </div>
                     """, unsafe_allow_html=True)
+                
+                    # Enhanced suggestions
+                    st.markdown("### 💡 Did You Mean Any of These?")
+                    suggestions = suggest_symptoms(user_symptoms, df, top_k=6, index=load_symptom_index(df))
+                
+                    if suggestions:
+                        cols = st.columns(2)
+                        for i, suggestion in enumerate(suggestions):
+                            body_part = get_body_part_mapping(suggestion)
+                            with cols[i % 2]:
+                                st.markdown(f"""
+                                <div class="suggestion-card">
+                                    <strong>💡 {suggestion.title()}</strong>
+                                    <div style="font-size: 0.8rem; margin-top: 0.25rem; opacity: 0.8;">{body_part}</div>
+                                </div>
+                                """, unsafe_allow_html=True)
+                    else:
+                        st.markdown("""
+                        <div class="alert alert-info">
+                            Try using more common medical terms or check our available symptoms in the sidebar.
+                        </div>
+                        """, unsafe_allow_html=True)
+        
+        # Measured time of this analysis and rolling per-stage latencies
+        with st.expander("⏱️ Performance Diagnostics"):
+            st.write(f"**This analysis:** {analysis_span.duration_ms:.1f} ms")
+            for stage in analysis_span.flatten():
+                indent = "&nbsp;" * 4 * stage['depth']
+                st.markdown(f"{indent}• {stage['name']}: {stage['duration_ms']:.2f} ms", unsafe_allow_html=True)
+            
+            stage_stats = get_stage_stats()
+            if stage_stats:
+                st.write("**Rolling latency per stage (ms):**")
+                st.dataframe(pd.DataFrame(stage_stats).T, use_container_width=True)
+            
+            cache_stats = get_normalization_stats()
+            st.write(f"**Normalization cache:** {cache_stats['hits']} hits / {cache_stats['misses']} misses")
+            
+            st.download_button(
+                label="⬇️ Download Stage Stats (JSON)",
+                data=dump_stage_stats(),
+                file_name="stage_stats.json",
+                mime="application/json"
+            )
         
         # Show back to top button
         st.session_state.show_back_to_top = True
@@ -0,0 +1,53 @@
+"""
+Symptom Checker Engine
+Streamlit-free dataset loading, indexing, matching, ranking and ML prediction
+
+Submodules are imported on first attribute access, so ``import symptom_engine``
+stays cheap and pandas, NumPy or scikit-learn are only loaded by the code
+paths that need them.
+"""
+
+import importlib
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    'DEFAULT_DATA_PATH': 'data',
+    'load_symptoms_data': 'data',
+    'SEVERITY_WEIGHTS': 'index',
+    'ConditionRanker': 'index',
+    'SymptomIndex': 'index',
+    'get_symptom_index': 'matcher',
+    'find_symptom_matches': 'matcher',
+    'find_symptom_matches_batch': 'matcher',
+    'get_combined_conditions': 'matcher',
+    'suggest_symptoms': 'matcher',
+    'normalize_symptom': 'preprocessing',
+    'get_normalization_stats': 'preprocessing',
+    'trace_span': 'tracing',
+    'traced': 'tracing',
+    'get_stage_stats': 'tracing',
+    'dump_stage_stats': 'tracing',
+    'profile_stage': 'tracing',
+    'get_profiler': 'tracing',
+    'SymptomMLPredictor': 'ml_predictor',
+    'get_ml_predictor': 'ml_predictor',
+    'predict_symptoms_ml': 'ml_predictor',
+    'get_top_predictions_ml': 'ml_predictor',
+    'get_top_predictions_batch_ml': 'ml_predictor',
+    'TopKPredictions': 'ml_predictor',
+    'is_ml_available': 'ml_predictor',
+    'get_ml_model_info': 'ml_predictor',
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        module = importlib.import_module(f'.{_EXPORTS[name]}', __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
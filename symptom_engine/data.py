@@ -0,0 +1,39 @@
+"""
+Dataset Module for Symptom Checker Bot
+Loads and cleans the symptom-condition CSV
+"""
+
+import pandas as pd
+
+DEFAULT_DATA_PATH = 'symptoms.csv'
+
+# Mock severity levels used when the dataset has no severity column
+DEFAULT_SEVERITY_MAP = {
+    'Heart Attack': 'Critical',
+    'Pneumonia': 'High',
+    'COVID-19': 'High',
+    'Appendicitis': 'High',
+    'Malaria': 'High',
+    'Migraine': 'Medium',
+    'Flu': 'Medium',
+    'Asthma': 'Medium',
+    'Common Cold': 'Low',
+    'Allergies': 'Low',
+    'Tension Headache': 'Low'
+}
+
+def load_symptoms_data(path: str = DEFAULT_DATA_PATH) -> pd.DataFrame:
+    """Load the symptoms dataset.
+    
+    Raises FileNotFoundError if the CSV does not exist.
+    """
+    df = pd.read_csv(path)
+    # Clean and normalize the data
+    df['symptom'] = df['symptom'].str.lower().str.strip()
+    df['condition'] = df['condition'].str.strip()
+    
+    # Add severity levels if not present
+    if 'severity' not in df.columns:
+        df['severity'] = df['condition'].map(DEFAULT_SEVERITY_MAP).fillna('Medium')
+    
+    return df
@@ -0,0 +1,85 @@
+"""
+Feature Cache Module for Symptom Checker Bot
+Fitted vectorizer, feature matrix and labels reused across training runs
+
+Each entry is a directory under the cache root named by its key:
+    vectorizer.joblib  the fitted vectorizer
+    features.npz       sparse feature matrix (scipy.sparse.save_npz)
+    labels.npy         condition per row, as a fixed-width string array
+
+The key hashes the dataset's SHA-256, the vectorizer class and settings,
+the pair-expansion options and the scikit-learn version. Tuning model
+hyperparameters therefore reuses the features, and any change to the data
+or featurization misses. Only the newest FEATURE_CACHE_KEEP entries are
+kept.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import joblib
+import numpy as np
+import scipy.sparse as sp
+import sklearn
+from typing import Dict, Optional, Tuple
+
+FEATURE_CACHE_DIR = '.feature_cache'
+FEATURE_CACHE_FORMAT_VERSION = 1
+FEATURE_CACHE_KEEP = 5
+
+def feature_cache_key(dataset_sha256: str, vectorizer, options: Optional[Dict] = None) -> str:
+    """Cache key for features of this dataset built by this (unfitted) vectorizer"""
+    config = {
+        'format_version': FEATURE_CACHE_FORMAT_VERSION,
+        'sklearn': sklearn.__version__,
+        'dataset_sha256': dataset_sha256,
+        'vectorizer': type(vectorizer).__name__,
+        'params': vectorizer.get_params(),
+        'options': options or {}
+    }
+    encoded = json.dumps(config, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+def load_features(key: str, cache_dir: str = FEATURE_CACHE_DIR) -> Optional[Tuple]:
+    """(vectorizer, X, y) for key, or None on a miss or unreadable entry"""
+    entry = os.path.join(cache_dir, key)
+    if not os.path.isdir(entry):
+        return None
+    
+    try:
+        vectorizer = joblib.load(os.path.join(entry, 'vectorizer.joblib'))
+        X = sp.load_npz(os.path.join(entry, 'features.npz')).tocsr()
+        y = np.load(os.path.join(entry, 'labels.npy')).astype(object)
+    except Exception as e:
+        print(f"   ⚠️ Ignoring unreadable feature cache entry {key[:12]}: {str(e)}")
+        return None
+    
+    # Mark as recently used so pruning keeps it
+    os.utime(entry)
+    return vectorizer, X, y
+
+def save_features(key: str, vectorizer, X, y, cache_dir: str = FEATURE_CACHE_DIR) -> str:
+    """Store an entry and prune old ones; returns the entry directory"""
+    entry = os.path.join(cache_dir, key)
+    staging = f"{entry}.tmp-{os.getpid()}"
+    os.makedirs(staging, exist_ok=True)
+    
+    joblib.dump(vectorizer, os.path.join(staging, 'vectorizer.joblib'))
+    sp.save_npz(os.path.join(staging, 'features.npz'), sp.csr_matrix(X), compressed=False)
+    np.save(os.path.join(staging, 'labels.npy'), np.asarray(y, dtype=str))
+    
+    # Readers only ever see complete entries
+    shutil.rmtree(entry, ignore_errors=True)
+    os.replace(staging, entry)
+    prune_features(cache_dir)
+    return entry
+
+def prune_features(cache_dir: str = FEATURE_CACHE_DIR, keep: int = FEATURE_CACHE_KEEP) -> int:
+    """Delete all but the keep most recently used entries; returns how many were removed"""
+    entries = [os.path.join(cache_dir, name) for name in os.listdir(cache_dir) if '.tmp-' not in name]
+    entries = [path for path in entries if os.path.isdir(path)]
+    entries.sort(key=os.path.getmtime, reverse=True)
+    for path in entries[keep:]:
+        shutil.rmtree(path, ignore_errors=True)
+    return max(0, len(entries) - keep)
@@ -0,0 +1,94 @@
+"""
+Hashing Featurization Module for Symptom Checker Bot
+TF-IDF over a fixed hash space, with idf accumulated in a streaming pass
+
+Terms are hashed into n_features columns instead of being kept in a
+vocabulary, so vectorizer memory is set by the hash space no matter how many
+distinct n-grams the training text contains. Document frequencies are
+counted chunk by chunk with partial_fit, and idf is derived from them the
+same way TfidfTransformer does with smooth_idf=True.
+"""
+
+import numpy as np
+from itertools import islice
+from typing import Iterable, List
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+
+# 65536 columns; weight matrices scale with n_features x classes
+HASHING_N_FEATURES = 2 ** 16
+FIT_CHUNK_SIZE = 10000
+
+class HashingTfidfVectorizer:
+    """Drop-in for TfidfVectorizer's fit/transform backed by feature hashing"""
+    
+    def __init__(self, n_features: int = HASHING_N_FEATURES, ngram_range=(1, 2), stop_words='english',
+                 lowercase: bool = True, norm: str = 'l2', smooth_idf: bool = True, sublinear_tf: bool = False):
+        self.n_features = n_features
+        self.norm = norm
+        self.smooth_idf = smooth_idf
+        self.sublinear_tf = sublinear_tf
+        self.use_idf = True
+        
+        # Raw term counts per hashed column; idf and normalization are applied here
+        self.hasher = HashingVectorizer(
+            n_features=n_features,
+            ngram_range=ngram_range,
+            stop_words=stop_words,
+            lowercase=lowercase,
+            alternate_sign=False,
+            norm=None
+        )
+        self.reset()
+    
+    def get_params(self, deep: bool = False) -> dict:
+        """Constructor settings, as scikit-learn estimators report them"""
+        return {
+            'n_features': self.n_features,
+            'ngram_range': self.hasher.ngram_range,
+            'stop_words': self.hasher.stop_words,
+            'lowercase': self.hasher.lowercase,
+            'norm': self.norm,
+            'smooth_idf': self.smooth_idf,
+            'sublinear_tf': self.sublinear_tf
+        }
+    
+    def reset(self) -> None:
+        """Forget all document frequencies"""
+        self.document_frequency_ = np.zeros(self.n_features, dtype=np.int64)
+        self.n_documents_ = 0
+        self.idf_ = np.ones(self.n_features)
+    
+    def partial_fit(self, texts: List[str], y=None) -> "HashingTfidfVectorizer":
+        """Add one chunk of documents to the document frequencies"""
+        counts = self.hasher.transform(texts)
+        # Hashed rows have no duplicate columns, so this counts documents per column
+        self.document_frequency_ += np.bincount(counts.indices, minlength=self.n_features)
+        self.n_documents_ += counts.shape[0]
+        
+        smooth = int(self.smooth_idf)
+        self.idf_ = np.log((self.n_documents_ + smooth) / (self.document_frequency_ + smooth)) + 1
+        return self
+    
+    def fit(self, texts: Iterable[str], y=None, chunk_size: int = FIT_CHUNK_SIZE) -> "HashingTfidfVectorizer":
+        """Compute idf from any iterable of texts, chunk_size texts at a time"""
+        self.reset()
+        texts = iter(texts)
+        for chunk in iter(lambda: list(islice(texts, chunk_size)), []):
+            self.partial_fit(chunk)
+        return self
+    
+    def transform(self, texts: List[str]):
+        """TF-IDF rows as a CSR matrix"""
+        X = self.hasher.transform(texts)
+        if self.sublinear_tf:
+            np.log(X.data, X.data)
+            X.data += 1
+        X.data *= self.idf_[X.indices]
+        if self.norm:
+            X = normalize(X, norm=self.norm, copy=False)
+        return X
+    
+    def fit_transform(self, texts: Iterable[str], y=None):
+        texts = list(texts)
+        return self.fit(texts).transform(texts)
@@ -0,0 +1,651 @@
+"""
+Symptom Index Module for Symptom Checker Bot
+Precomputed lookup and ranking structures for rule-based symptom matching
+"""
+
+import bisect
+from collections import deque
+import numpy as np
+from typing import TYPE_CHECKING, List, Dict, Tuple, Iterable
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Ranking weight per severity level; unknown levels rank as Medium
+SEVERITY_WEIGHTS = {'Critical': 4, 'High': 3, 'Medium': 2, 'Low': 1}
+
+# Below this many matched pairs a dict loop ranks faster than NumPy
+SMALL_RANKING = 160
+
+# Below this many strings a set loop finds trigram overlaps faster than NumPy
+SMALL_SEARCH = 200
+
+class AhoCorasick:
+    """Multi-pattern automaton reporting every pattern contained in a text"""
+
+    def __init__(self, patterns: List[str]):
+        # State 0 is the root; each state has goto edges, a failure link and
+        # the ids of patterns ending there (including via failure links)
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.output: List[List[int]] = [[]]
+
+        for pattern_id, pattern in enumerate(patterns):
+            state = 0
+            for char in pattern:
+                next_state = self.goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self.goto)
+                    self.goto[state][char] = next_state
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                state = next_state
+            self.output[state].append(pattern_id)
+
+        # Breadth-first pass to wire failure links and merge outputs
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(char, 0)
+                self.fail[next_state] = target if target != next_state else 0
+                self.output[next_state] = self.output[next_state] + self.output[self.fail[next_state]]
+
+    def search(self, text: str) -> set:
+        """Ids of all patterns occurring in text, in one pass over it"""
+        found = set(self.output[0])
+        goto = self.goto
+        fail = self.fail
+        output = self.output
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found.update(output[state])
+        return found
+
+class SuffixArray:
+    """Sorted suffixes of a string collection for substring lookups"""
+
+    def __init__(self, strings: List[str]):
+        self.strings = strings
+        # (string id, offset) pairs ordered by the suffix they start
+        self.suffixes: List[Tuple[int, int]] = sorted(
+            ((string_id, offset) for string_id, text in enumerate(strings) for offset in range(len(text))),
+            key=lambda suffix: strings[suffix[0]][suffix[1]:]
+        )
+
+    def containing(self, text: str) -> set:
+        """Ids of all strings that contain text"""
+        if not text:
+            return set(range(len(self.strings)))
+
+        strings = self.strings
+        length = len(text)
+
+        def prefix(suffix: Tuple[int, int]) -> str:
+            string_id, offset = suffix
+            return strings[string_id][offset:offset + length]
+
+        start = bisect.bisect_left(self.suffixes, text, key=prefix)
+        end = bisect.bisect_right(self.suffixes, text, lo=start, key=prefix)
+        return {string_id for string_id, _ in self.suffixes[start:end]}
+
+def trigrams(text: str) -> set:
+    """Character trigrams of text, padded so word edges count"""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def edit_distance(a: str, b: str, max_distance: int = None) -> int:
+    """Edit distance counting insertions, deletions, substitutions and
+    adjacent transpositions (optimal string alignment).
+
+    Uses Hyyrö's bit-parallel algorithm: each column of the dynamic
+    programming matrix is a pair of bit vectors over the characters of a,
+    so the cost is one set of integer operations per character of b. With
+    max_distance set, returns max_distance + 1 as soon as the distance is
+    known to exceed it.
+    """
+    limit = max_distance + 1 if max_distance is not None else None
+    if limit is not None and abs(len(a) - len(b)) >= limit:
+        return limit
+    # A common prefix or suffix never changes the distance
+    prefix = 0
+    while prefix < len(a) and prefix < len(b) and a[prefix] == b[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < len(a) - prefix and suffix < len(b) - prefix and a[-1 - suffix] == b[-1 - suffix]:
+        suffix += 1
+    a, b = a[prefix:len(a) - suffix], b[prefix:len(b) - suffix]
+    if not a or not b:
+        return len(a) + len(b)
+    # The distance is symmetric: loop over the shorter string
+    if len(b) > len(a):
+        a, b = b, a
+
+    # Bit i of masks[c] is set where a[i] == c
+    masks: Dict[str, int] = {}
+    for i, char in enumerate(a):
+        masks[char] = masks.get(char, 0) | (1 << i)
+    full = (1 << len(a)) - 1
+    last = 1 << (len(a) - 1)
+
+    # Vertical +1/-1 deltas of the current column, and the last row's value
+    positive, negative, diagonal, previous_mask = full, 0, 0, 0
+    distance = len(a)
+    remaining = len(b)
+    for char in b:
+        mask = masks.get(char, 0)
+        transposed = ((~diagonal & mask) << 1) & previous_mask
+        diagonal = ((((mask & positive) + positive) ^ positive) | mask | negative | transposed) & full
+        horizontal_positive = negative | (full ^ (diagonal | positive))
+        horizontal_negative = diagonal & positive
+        if horizontal_positive & last:
+            distance += 1
+        elif horizontal_negative & last:
+            distance -= 1
+        horizontal_positive = ((horizontal_positive << 1) | 1) & full
+        horizontal_negative = (horizontal_negative << 1) & full
+        positive = horizontal_negative | (full ^ (diagonal | horizontal_positive))
+        negative = horizontal_positive & diagonal
+        previous_mask = mask
+
+        # Each remaining character can lower the last row by at most one
+        remaining -= 1
+        if limit is not None and distance - remaining >= limit:
+            return limit
+    return distance if limit is None else min(distance, limit)
+
+def _required_shared(similarity: float, n_grams: int) -> int:
+    """Fewest trigrams a string must share with a query of n_grams trigrams to
+    reach a Dice coefficient of similarity, since it has at least that many"""
+    return max(1, int(np.ceil(similarity * n_grams / (2 - similarity) - 1e-9)))
+
+def _weakest(best: Dict[int, Tuple[float, float]], top_k: int) -> float:
+    """The top_k-th best score in best, or None while there are fewer"""
+    if len(best) < top_k:
+        return None
+    return sorted((score for score, _ in best.values()), reverse=True)[top_k - 1]
+
+class TrigramIndex:
+    """Character trigram index for typo-tolerant nearest-string lookups.
+
+    Strings are stored shortest first, and by trigram count within a length,
+    so the strings within a length range are one contiguous range of
+    positions; ids maps positions back to the string ids searches return.
+    """
+
+    def __init__(self, strings: List[str]):
+        self.strings = strings
+        lengths = np.array([len(text) for text in strings], dtype=np.int64)
+        counts = np.array([len(trigrams(text)) for text in strings], dtype=np.int64)
+        self.ids = np.lexsort((counts, lengths))
+        self.lengths = lengths[self.ids]
+        self.trigram_counts = counts[self.ids]
+        # Position range of each run of strings with equal length and
+        # trigram count, and that count
+        changes = np.diff(self.lengths, prepend=-1) | np.diff(self.trigram_counts, prepend=-1)
+        self.run_starts = np.flatnonzero(changes)
+        self.run_stops = np.append(self.run_starts[1:], len(strings))
+        self.run_counts = self.trigram_counts[self.run_starts]
+        self.gram_sets = ([trigrams(strings[string_id]) for string_id in self.ids.tolist()]
+                          if len(strings) < SMALL_SEARCH else None)
+
+        postings: Dict[str, List[int]] = {}
+        for position, string_id in enumerate(self.ids.tolist()):
+            for gram in trigrams(strings[string_id]):
+                postings.setdefault(gram, []).append(position)
+        # A trigram found in at least one string in thirty-two is stored as a
+        # 0/1 row over all strings: at most four times the size of its
+        # position list, and far cheaper to add than scattered increments
+        self.postings: Dict[str, np.ndarray] = {}
+        self.dense_rows: Dict[str, np.ndarray] = {}
+        for gram, positions in postings.items():
+            if len(positions) * 32 >= len(strings):
+                row = np.zeros(len(strings), dtype=np.uint8)
+                row[positions] = 1
+                self.dense_rows[gram] = row
+            else:
+                self.postings[gram] = np.array(positions, dtype=np.int64)
+
+    def _shared_counts(self, grams: set, start: int, stop: int) -> np.ndarray:
+        """Trigrams each string at positions start to stop shares with grams,
+        or None if no string in the index has any of them"""
+        shared = np.zeros(stop - start, dtype=np.min_scalar_type(len(grams)))
+        whole = start == 0 and stop == len(self.strings)
+        found = False
+        for gram in grams:
+            row = self.dense_rows.get(gram)
+            if row is not None:
+                shared += row if whole else row[start:stop]
+                found = True
+            elif gram in self.postings:
+                positions = self.postings[gram]
+                if not whole:
+                    positions = positions[np.searchsorted(positions, start):np.searchsorted(positions, stop)] - start
+                shared[positions] += 1
+                found = True
+        return shared if found else None
+
+    def _overlaps(self, grams: set, shared: np.ndarray, start: int, limit: int,
+                  min_similarity: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """The limit positions from start sharing the most trigrams, by Dice
+        coefficient, as (positions, Dice, shared counts), best first with ties
+        going to the earlier string id"""
+        # Only the best few by overlap are worth an exact edit distance. The
+        # strings of a run share one trigram count, so the run's most shared
+        # trigrams give its best Dice exactly; the limit-th best run is a bar
+        # the limit best strings all reach, and only runs reaching it are read
+        stop = start + len(shared)
+        first = int(np.searchsorted(self.run_starts, start, side='right')) - 1
+        last = int(np.searchsorted(self.run_starts, stop))
+        starts = np.maximum(self.run_starts[first:last] - start, 0)
+        sizes = np.minimum(self.run_stops[first:last] - start, len(shared)) - starts
+        run_counts = self.run_counts[first:last]
+        most = np.maximum.reduceat(shared, starts)
+        bounds = 2 * most / (len(grams) + run_counts)
+        runs = np.flatnonzero((most > 0) & (bounds >= min_similarity))
+        bar = min_similarity
+        if len(runs) >= limit:
+            bar = np.partition(bounds[runs], len(runs) - limit)[len(runs) - limit]
+            runs = runs[bounds[runs] >= bar]
+        needed = np.maximum(np.ceil(bar * (len(grams) + run_counts[runs]) / 2 - 1e-9), 1)
+
+        # Positions of the chosen runs, each kept if it shares enough trigrams
+        sizes = sizes[runs]
+        candidates = np.repeat(starts[runs] - np.cumsum(sizes) + sizes, sizes) + np.arange(sizes.sum())
+        candidates = candidates[shared[candidates] >= np.repeat(needed, sizes)]
+        dice = 2 * shared[candidates] / (len(grams) + self.trigram_counts[start + candidates])
+        threshold = None
+        if len(candidates) >= limit:
+            threshold = np.partition(dice, len(dice) - limit)[len(dice) - limit]
+        keep = dice >= (min_similarity if threshold is None else threshold)
+        candidates, dice = candidates[keep], dice[keep]
+
+        counts = shared[candidates].astype(np.int64)
+        candidates = candidates + start
+        string_ids = self.ids[candidates]
+        if threshold is not None and len(candidates) > limit:
+            # The limit best by overlap, ties going to the earlier string
+            keep = dice > threshold
+            ties = np.flatnonzero(dice == threshold)
+            ties = ties[np.argsort(string_ids[ties], kind='stable')]
+            keep[ties[:limit - np.count_nonzero(keep)]] = True
+            candidates, dice, counts, string_ids = candidates[keep], dice[keep], counts[keep], string_ids[keep]
+        order = np.lexsort((string_ids, -dice))
+        return candidates[order], dice[order], counts[order]
+
+    def _small_overlaps(self, text: str, grams: set, start: int, stop: int, limit: int,
+                        min_similarity: float) -> List[Tuple[float, str, int, int, int]]:
+        """_overlaps for small indexes, one string at a time, as search_many's
+        (-Dice, text, trigrams of text, position, shared count) candidates"""
+        found = []
+        for position in range(start, stop):
+            string_grams = self.gram_sets[position]
+            count = len(grams & string_grams)
+            if count:
+                dice = 2 * count / (len(grams) + len(string_grams))
+                if dice >= min_similarity:
+                    found.append((-dice, int(self.ids[position]), position, count))
+        found.sort()
+        return [(negative_dice, text, len(grams), position, count)
+                for negative_dice, _, position, count in found[:limit]]
+
+    def search(self, text: str, top_k: int = 5, min_similarity: float = 0.3) -> List[Tuple[int, float]]:
+        """Nearest strings to text as (string id, score) pairs, best first.
+
+        Candidates are pruned by trigram overlap (Dice coefficient) and then
+        ranked by edit distance, scored as 1 - distance / longer length.
+        Once top_k are scored, a candidate whose distance lower bound cannot
+        beat the weakest of them skips the edit distance entirely.
+        """
+        return self.search_many([text], top_k, min_similarity)
+
+    def search_many(self, texts: List[str], top_k: int = 5, min_similarity: float = 0.3) -> List[Tuple[int, float]]:
+        """Nearest strings to any of texts, each scored against its closest.
+
+        The first text is searched on its own; the others then share one
+        candidate pass. A string scores at most shorter / longer length
+        against a text, so once the first text has filled the top_k the
+        others only count trigrams of strings whose length could still beat
+        the weakest of them. With one text this is search().
+        """
+        limit = top_k * 2
+        best: Dict[int, Tuple[float, float]] = {}
+        for group in (texts[:1], texts[1:]):
+            weakest = _weakest(best, top_k)
+            candidates = []
+            for text in group:
+                start, stop = 0, len(self.strings)
+                if weakest is not None and weakest > 0:
+                    # Integer bounds: a float key would convert all lengths
+                    start = int(np.searchsorted(self.lengths, int(np.ceil(weakest * len(text) - 1e-9))))
+                    stop = int(np.searchsorted(self.lengths, int(len(text) / weakest + 1e-9), side='right'))
+                grams = trigrams(text)
+                if self.gram_sets is not None:
+                    candidates.extend(self._small_overlaps(text, grams, start, stop, limit, min_similarity))
+                    continue
+                shared = self._shared_counts(grams, start, stop) if stop > start else None
+                if shared is not None:
+                    positions, dice, counts = self._overlaps(grams, shared, start, limit, min_similarity)
+                    candidates.extend(zip((-dice).tolist(), [text] * len(positions), [len(grams)] * len(positions),
+                                          positions.tolist(), counts.tolist()))
+            self._score(candidates, top_k, best)
+
+        ranked = sorted(best.items(), key=lambda item: (-item[1][0], -item[1][1], item[0]))[:top_k]
+        return [(string_id, score) for string_id, (score, _) in ranked]
+
+    def _score(self, candidates: List[Tuple[float, str, int, int, int]], top_k: int,
+               best: Dict[int, Tuple[float, float]]):
+        """Score (-Dice, text, trigrams of text, position, shared count)
+        candidates by edit distance, keeping each string's best (score, Dice)
+        in best. Once top_k are found, a candidate must beat the weakest of
+        them, and a string scored before must beat its own score."""
+        # Distance lower bounds: the length difference, and the trigrams one
+        # string has that the other lacks, since an edit (a transposition at
+        # most) changes at most four of the padded trigrams
+        bounded = []
+        for negative_overlap, text, n_grams, position, count in candidates:
+            length = int(self.lengths[position])
+            longest = max(length, len(text), 1)
+            unshared = max(int(self.trigram_counts[position]), n_grams) - count
+            lower = max(abs(length - len(text)), (unshared + 3) // 4)
+            bounded.append((lower / longest, negative_overlap, text, position, longest, lower))
+        # Best possible score first, so strong scores fill the top_k early;
+        # once a bound cannot reach the weakest of them, neither can the rest
+        bounded.sort(key=lambda candidate: candidate[:2])
+
+        weakest = _weakest(best, top_k)
+        for lower_share, negative_overlap, text, position, longest, lower in bounded:
+            if weakest is not None and 1 - lower_share < weakest - 1e-9:
+                break
+            string_id = int(self.ids[position])
+            max_distance = None
+            if weakest is not None:
+                bar = max(weakest, best[string_id][0]) if string_id in best else weakest
+                max_distance = int((1 - bar) * longest + 1e-9)
+                if lower > max_distance:
+                    continue
+            distance = edit_distance(text, self.strings[string_id], max_distance)
+            if max_distance is not None and distance > max_distance:
+                continue
+            score = 1 - distance / longest
+            if string_id not in best or score > best[string_id][0]:
+                best[string_id] = (score, -negative_overlap)
+                weakest = _weakest(best, top_k)
+
+class RowMatches(list):
+    """(condition, severity) pairs that also carry the row ids they came from,
+    so the ranker that produced them can rank by row id"""
+
+    __slots__ = ('rows', 'ranker')
+
+    def __init__(self, pairs: List[Tuple[str, str]], rows: List[int], ranker: "ConditionRanker"):
+        super().__init__(pairs)
+        self.rows = rows
+        self.ranker = ranker
+
+class ConditionRanker:
+    """Condition ids and the row x condition incidence matrix used to rank
+    matched conditions.
+
+    Rows are addressed by position in the source data. A condition's
+    severity is not fixed per condition: each patient's ranking uses the
+    severity of the first row that matched it, as the original loop did.
+    """
+
+    def __init__(self, conditions: List[str], severities: List[str]):
+        self.conditions = conditions
+        self.severities = severities
+        self.row_severities = np.array(severities, dtype=object)
+        self.row_weights = np.array([SEVERITY_WEIGHTS.get(severity, 2) for severity in severities], dtype=np.int64)
+
+        # Dense condition ids in order of first appearance
+        self.condition_names: List[str] = []
+        self.condition_ids: Dict[str, int] = {}
+        for condition in conditions:
+            if condition not in self.condition_ids:
+                self.condition_ids[condition] = len(self.condition_names)
+                self.condition_names.append(condition)
+
+        # Symptom row x condition incidence matrix in CSR form: row r links to
+        # the conditions in incidence_indices[incidence_indptr[r]:incidence_indptr[r + 1]]
+        self.incidence_indptr = np.arange(len(conditions) + 1, dtype=np.int64)
+        self.incidence_indices = np.array([self.condition_ids[c] for c in conditions], dtype=np.int64)
+        self.incidence_lengths = np.diff(self.incidence_indptr)
+
+    def __len__(self) -> int:
+        return len(self.conditions)
+
+    def pairs(self, rows: List[int]) -> List[Tuple[str, str]]:
+        """(condition, severity) pairs for the given row ids"""
+        return [(self.conditions[row_id], self.severities[row_id]) for row_id in rows]
+
+    def conditions_for_rows(self, rows: np.ndarray) -> np.ndarray:
+        """Condition ids linked to the given rows, gathered from the CSR incidence"""
+        starts = self.incidence_indptr[rows]
+        lengths = self.incidence_indptr[rows + 1] - starts
+        offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        return self.incidence_indices[np.repeat(starts, lengths) + offsets]
+
+    def rank_conditions(self, condition_ids: np.ndarray, severities: np.ndarray, patient_ids: np.ndarray,
+                        n_patients: int) -> List[List[Tuple[str, int, str]]]:
+        """Rank matched conditions per patient.
+
+        condition_ids holds one entry per (reported symptom, matched condition)
+        in appearance order, with the matched severity and patient_ids
+        alongside. Summing entries per (patient, condition) is the product of
+        each patient's matched-symptom vector with the incidence matrix; each
+        group takes the severity of its first entry and the result is ordered
+        by severity weight, match count and first appearance, which is the
+        order produced by get_combined_conditions.
+        """
+        n_conditions = max(len(self.condition_names), 1)
+        keys = patient_ids * n_conditions + condition_ids
+        unique_keys, first, counts = np.unique(keys, return_index=True, return_counts=True)
+        group_patients = unique_keys // n_conditions
+        group_conditions = unique_keys % n_conditions
+        group_severities = severities[first].tolist()
+        group_weights = np.array([SEVERITY_WEIGHTS.get(severity, 2) for severity in group_severities], dtype=np.int64)
+
+        order = np.lexsort((first, -counts, -group_weights, group_patients))
+        bounds = np.searchsorted(group_patients[order], np.arange(n_patients + 1))
+
+        rankings = []
+        for patient_id in range(n_patients):
+            selected = order[bounds[patient_id]:bounds[patient_id + 1]]
+            rankings.append([
+                (self.condition_names[group_conditions[group]], int(counts[group]), group_severities[group])
+                for group in selected.tolist()
+            ])
+        return rankings
+
+    def rank_rows(self, rows: np.ndarray) -> List[Tuple[str, int, str]]:
+        """Rank the conditions of a single patient's matched row ids.
+
+        Match counts are one bincount over the incidence entries of the rows;
+        each condition takes the severity weight of its first matched row.
+        """
+        lengths = self.incidence_lengths[rows]
+        condition_ids = self.conditions_for_rows(rows)
+        entry_rows = np.repeat(rows, lengths)
+        counts = np.bincount(condition_ids)
+        matched, first = np.unique(condition_ids, return_index=True)
+        counts = counts[matched]
+        first_rows = entry_rows[first]
+        order = np.lexsort((first, -counts, -self.row_weights[first_rows]))
+        return [
+            (self.condition_names[condition_id], count, self.severities[row_id])
+            for condition_id, count, row_id in zip(matched[order].tolist(), counts[order].tolist(),
+                                                  first_rows[order].tolist())
+        ]
+
+    def rank_matches(self, matches: Dict[str, List[Tuple[str, str]]]) -> List[Tuple[str, int, str]]:
+        """Rank the (condition, severity) matches of a single patient.
+
+        Matches this ranker produced itself are ranked by row id; small or
+        foreign matches go through the plain dict loop, which is faster there.
+        """
+        values = list(matches.values())
+        if sum(map(len, values)) > SMALL_RANKING and all(
+            isinstance(pairs, RowMatches) and pairs.ranker is self and len(pairs) == len(pairs.rows)
+            for pairs in values
+        ):
+            return self.rank_rows(np.fromiter(
+                (row_id for pairs in values for row_id in pairs.rows), dtype=np.int64,
+                count=sum(len(pairs.rows) for pairs in values)
+            ))
+
+        counts: Dict[str, int] = {}
+        severities: Dict[str, str] = {}
+        for pairs in values:
+            for condition, severity in pairs:
+                if condition in counts:
+                    counts[condition] += 1
+                else:
+                    counts[condition] = 1
+                    severities[condition] = severity
+        # Stable under reverse=True, so ties keep first-appearance order
+        ranked = sorted(counts, key=lambda condition: (SEVERITY_WEIGHTS.get(severities[condition], 2),
+                                                       counts[condition]), reverse=True)
+        return [(condition, counts[condition], severities[condition]) for condition in ranked]
+
+    def rank_batch(self, patient_rows: List[List[List[int]]]) -> List[List[Tuple[str, int, str]]]:
+        """Rank conditions for many patients at once.
+
+        Each patient is a list of matched row lists, one per reported symptom.
+        """
+        # Flatten every (patient, matched row) pair in appearance order
+        patient_ids = []
+        rows = []
+        for patient_id, symptom_rows in enumerate(patient_rows):
+            for matched_rows in symptom_rows:
+                patient_ids.extend([patient_id] * len(matched_rows))
+                rows.extend(matched_rows)
+        patient_ids = np.asarray(patient_ids, dtype=np.int64)
+        rows = np.asarray(rows, dtype=np.int64)
+
+        lengths = self.incidence_lengths[rows]
+        return self.rank_conditions(
+            self.conditions_for_rows(rows), np.repeat(self.row_severities[rows], lengths),
+            np.repeat(patient_ids, lengths), len(patient_rows)
+        )
+
+class SymptomIndex(ConditionRanker):
+    """Lookup tables built once per dataset load.
+
+    Symptom text is deduplicated into a vocabulary so that lookups touch
+    each distinct symptom once and then expand to the rows that carry it.
+    """
+
+    def __init__(self, symptoms: List[str], conditions: List[str], severities: List[str]):
+        super().__init__(conditions, severities)
+
+        # Distinct symptom strings and the rows (in dataset order) that use them
+        self.vocabulary: List[str] = []
+        self.vocabulary_rows: List[List[int]] = []
+        self.exact: Dict[str, int] = {}
+
+        # Whitespace token -> vocabulary ids containing that token
+        self.tokens: Dict[str, List[int]] = {}
+
+        for row_id, symptom in enumerate(symptoms):
+            symptom_id = self.exact.get(symptom)
+            if symptom_id is None:
+                symptom_id = len(self.vocabulary)
+                self.exact[symptom] = symptom_id
+                self.vocabulary.append(symptom)
+                self.vocabulary_rows.append([])
+                for token in set(symptom.split()):
+                    self.tokens.setdefault(token, []).append(symptom_id)
+            self.vocabulary_rows[symptom_id].append(row_id)
+
+        # Substring containment in both directions
+        self.automaton = AhoCorasick(self.vocabulary)
+        self.suffix_array = SuffixArray(self.vocabulary)
+
+        # Typo-tolerant lookups for suggestions
+        self.fuzzy = TrigramIndex(self.vocabulary)
+
+    @classmethod
+    def from_dataframe(cls, df: "pd.DataFrame") -> "SymptomIndex":
+        """Build the index from a loaded symptoms DataFrame"""
+        return cls(
+            df['symptom'].tolist(),
+            df['condition'].tolist(),
+            df['severity'].tolist()
+        )
+
+    def exact_rows(self, symptom: str) -> List[int]:
+        """Rows whose symptom equals the given normalized text"""
+        symptom_id = self.exact.get(symptom)
+        return self.vocabulary_rows[symptom_id] if symptom_id is not None else []
+
+    def substring_ids(self, symptom: str) -> Iterable[int]:
+        """Vocabulary ids where one string contains the other"""
+        # Dataset symptoms inside the user phrase, then the user phrase
+        # inside dataset symptoms
+        found = self.automaton.search(symptom)
+        found.update(self.suffix_array.containing(symptom))
+        return found
+
+    def word_ids(self, symptom: str) -> Iterable[int]:
+        """Vocabulary ids sharing a whole word (longer than two characters)"""
+        found = set()
+        for word in symptom.split():
+            if len(word) > 2:
+                found.update(self.tokens.get(word, ()))
+        return found
+
+    def suggest(self, symptom: str, top_k: int = 5, min_similarity: float = 0.3) -> List[Tuple[str, float]]:
+        """Dataset symptoms closest to a normalized symptom, best first.
+
+        Multi-word phrases are also looked up word by word so that a typo
+        inside a longer description still finds its symptom; the phrase and
+        its words share one candidate pass.
+        """
+        queries = [symptom]
+        if len(symptom.split()) > 1:
+            queries.extend(word for word in symptom.split() if len(word) > 2)
+
+        return [(self.vocabulary[symptom_id], score)
+                for symptom_id, score in self.fuzzy.search_many(queries, top_k, min_similarity)]
+
+    def match_rows(self, symptom: str) -> List[int]:
+        """Matched row ids for one normalized symptom.
+
+        Exact matches come first in dataset order, followed by partial
+        matches in dataset order, keeping only the first row per condition.
+        """
+        matched_rows = []
+        seen = set()
+        for row_id in self.exact_rows(symptom):
+            matched_rows.append(row_id)
+            seen.add(self.conditions[row_id])
+
+        symptom_ids = set(self.substring_ids(symptom))
+        symptom_ids.update(self.word_ids(symptom))
+
+        candidate_rows = sorted(
+            row_id for symptom_id in symptom_ids for row_id in self.vocabulary_rows[symptom_id]
+        )
+        for row_id in candidate_rows:
+            condition = self.conditions[row_id]
+            if condition in seen:
+                continue
+            matched_rows.append(row_id)
+            seen.add(condition)
+
+        return matched_rows
+
+    def match(self, symptom: str) -> List[Tuple[str, str]]:
+        """Matched (condition, severity) pairs for one normalized symptom"""
+        rows = self.match_rows(symptom)
+        return RowMatches(self.pairs(rows), rows, self)
@@ -0,0 +1,113 @@
+"""
+Matcher Module for Symptom Checker Bot
+Rule-based symptom matching, condition ranking and suggestions
+"""
+
+import threading
+import weakref
+from typing import TYPE_CHECKING, List, Dict, Tuple
+
+from .index import ConditionRanker, SymptomIndex
+from .preprocessing import normalize_symptom
+from .tracing import trace_span, traced
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Indexes built for DataFrames passed without one, keyed by id(df)
+_index_cache: Dict[int, Tuple[weakref.ref, SymptomIndex]] = {}
+_index_lock = threading.Lock()
+
+def get_symptom_index(df: "pd.DataFrame") -> SymptomIndex:
+    """Get the index for a DataFrame, building it on first use.
+    
+    The index lives as long as the DataFrame it was built from.
+    """
+    key = id(df)
+    with _index_lock:
+        entry = _index_cache.get(key)
+        if entry is not None and entry[0]() is df:
+            return entry[1]
+    
+    index = SymptomIndex.from_dataframe(df)
+    with _index_lock:
+        _index_cache[key] = (weakref.ref(df, lambda _, key=key: _index_cache.pop(key, None)), index)
+    return index
+
+@traced()
+def find_symptom_matches(user_symptoms: List[str], df: "pd.DataFrame", index: SymptomIndex = None) -> Dict[str, List[Tuple[str, str]]]:
+    """Find matching conditions for given symptoms with severity."""
+    if index is None:
+        index = get_symptom_index(df)
+    
+    with trace_span("normalize"):
+        normalized = [normalize_symptom(user_symptom) for user_symptom in user_symptoms]
+    
+    matches = {}
+    
+    with trace_span("match"):
+        for user_symptom, user_symptom_normalized in zip(user_symptoms, normalized):
+            matches[user_symptom] = index.match(user_symptom_normalized)
+    
+    return matches
+
+def suggest_symptoms(user_symptoms: List[str], df: "pd.DataFrame", top_k: int = 6, index: SymptomIndex = None) -> List[str]:
+    """Suggest dataset symptoms close to the user's input, tolerating typos."""
+    if index is None:
+        index = get_symptom_index(df)
+    
+    best_scores = {}
+    for user_symptom in user_symptoms:
+        for suggestion, score in index.suggest(normalize_symptom(user_symptom), top_k):
+            if score > best_scores.get(suggestion, -1.0):
+                best_scores[suggestion] = score
+    
+    ranked = sorted(best_scores.items(), key=lambda item: -item[1])
+    return [suggestion for suggestion, _ in ranked[:top_k]]
+
+def find_symptom_matches_batch(batch: List[List[str]], df: "pd.DataFrame", index: SymptomIndex = None) -> List[Tuple[Dict[str, List[Tuple[str, str]]], List[Tuple[str, int, str]]]]:
+    """Match and rank many patients' symptom lists in one pass.
+    
+    Returns one (matches, combined_conditions) pair per patient, equal to
+    calling find_symptom_matches and get_combined_conditions for each list.
+    Normalization and index lookups are shared across the whole batch.
+    """
+    if index is None:
+        index = get_symptom_index(df)
+    
+    normalized = {}
+    phrase_rows = {}
+    patient_symptoms = []
+    
+    for user_symptoms in batch:
+        # Repeated entries collapse into one key, as in find_symptom_matches
+        symptoms = list(dict.fromkeys(user_symptoms))
+        for user_symptom in symptoms:
+            if user_symptom not in normalized:
+                normalized[user_symptom] = normalize_symptom(user_symptom)
+                if normalized[user_symptom] not in phrase_rows:
+                    phrase_rows[normalized[user_symptom]] = index.match_rows(normalized[user_symptom])
+        patient_symptoms.append(symptoms)
+    
+    rankings = index.rank_batch([
+        [phrase_rows[normalized[user_symptom]] for user_symptom in symptoms]
+        for symptoms in patient_symptoms
+    ])
+    
+    phrase_matches = {phrase: index.pairs(rows) for phrase, rows in phrase_rows.items()}
+    results = []
+    for symptoms, ranking in zip(patient_symptoms, rankings):
+        matches = {user_symptom: list(phrase_matches[normalized[user_symptom]]) for user_symptom in symptoms}
+        results.append((matches, ranking))
+    
+    return results
+
+@traced()
+def get_combined_conditions(matches: Dict[str, List[Tuple[str, str]]], index: ConditionRanker = None) -> List[Tuple[str, int, str]]:
+    """Get conditions ranked by frequency and severity."""
+    if index is None:
+        # Rank against the matched pairs alone
+        pairs = [pair for conditions in matches.values() for pair in conditions]
+        index = ConditionRanker([condition for condition, _ in pairs], [severity for _, severity in pairs])
+    
+    return index.rank_matches(matches)
@@ -0,0 +1,715 @@
+"""
+ML Prediction Module for Symptom Checker Bot
+Handles loading and inference of trained ML models
+"""
+
+import joblib
+import multiprocessing
+import numpy as np
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Hashable, List, Tuple, Dict, Optional
+
+from .model_bundle import read_model_bundle
+from .model_store import CURRENT_FILENAME, current_model_dir, current_version_name, file_sha256
+from .numpy_scorer import load_numpy_scorer
+from .preprocessing import normalize_symptom
+from .tracing import get_tracer
+
+class PredictionCache:
+    """Bounded, thread-safe LRU cache whose entries expire after a TTL"""
+    
+    def __init__(self, max_size: int = 10000, ttl_seconds: float = 3600.0):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Cached value for key, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] <= self.ttl_seconds:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+    
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store value, evicting the least recently used entry when full"""
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Drop every entry; counters are kept"""
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self) -> Dict:
+        """Hit/miss counters and current size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "size": len(self._entries),
+                "max_size": self.max_size
+            }
+
+class TopKPredictions:
+    """Top-k predictions for a batch of texts as compact arrays.
+    
+    indices and scores have shape (n_texts, k), best first. Condition labels
+    are only looked up when a row or labels() is requested.
+    """
+    
+    def __init__(self, indices: np.ndarray, scores: np.ndarray, classes: np.ndarray):
+        self.indices = indices
+        self.scores = scores
+        self.classes = classes
+    
+    def __len__(self) -> int:
+        return len(self.indices)
+    
+    def __getitem__(self, row: int) -> List[Tuple[str, float]]:
+        return [(self.classes[i], score) for i, score in zip(self.indices[row], self.scores[row])]
+    
+    def labels(self) -> np.ndarray:
+        """Condition labels with the same shape as indices"""
+        return self.classes[self.indices]
+
+def expand_symptom_texts(symptoms: List[str]) -> Tuple[List[str], List[str]]:
+    """Texts to score for a symptom list, and their labels.
+    
+    Each symptom individually, plus all symptoms combined when there are several.
+    """
+    texts = list(symptoms)
+    labels = list(symptoms)
+    if len(symptoms) > 1:
+        texts.append(" ".join(symptoms))
+        labels.append("Combined symptoms")
+    return texts, labels
+
+class LoadedModel:
+    """One loaded model generation, swapped into a predictor as a unit.
+    
+    model_dir is the directory it was read from. For versioned saves that
+    is an immutable models/v<N>/, so worker processes can load exactly this
+    generation and its memory-mapped files are never rewritten.
+    """
+    
+    def __init__(self, model, vectorizer, metadata: Dict, fingerprint: str, model_dir: Optional[str] = None):
+        self.model = model
+        self.vectorizer = vectorizer
+        self.metadata = metadata
+        self.fingerprint = fingerprint
+        self.model_dir = model_dir
+
+def score_texts(loaded: LoadedModel, texts: List[str], top_k: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Class indices and probabilities for normalized texts from one model pass.
+    
+    With top_k None this is the best class per text, shape (n,); otherwise
+    the top_k classes per text, shape (n, k), best first.
+    """
+    X = loaded.vectorizer.transform(texts)
+    
+    if not hasattr(loaded.model, 'predict_proba'):
+        # Fallback: just the single prediction per text
+        indices = np.searchsorted(loaded.model.classes_, loaded.model.predict(X))
+        if top_k is None:
+            return indices, np.zeros(len(indices))
+        return indices.reshape(-1, 1), np.ones((len(indices), 1))
+    
+    probabilities = loaded.model.predict_proba(X)
+    if top_k is None:
+        # Labels follow from the argmax
+        best = probabilities.argmax(axis=1)
+        return best, probabilities[np.arange(len(best)), best]
+    
+    k = min(top_k, probabilities.shape[1])
+    # Select the k best per row without sorting the rest, then order just those.
+    # Ties go to the lower class index, so the top k is always a prefix of the
+    # top k + 1 and a longer cached row can be sliced for a smaller top_k.
+    if k < probabilities.shape[1]:
+        candidates = np.argpartition(-probabilities, k - 1, axis=1)[:, :k]
+        candidate_scores = np.take_along_axis(probabilities, candidates, axis=1)
+        threshold = candidate_scores.min(axis=1, keepdims=True)
+        # Rows where argpartition had to choose among classes tied at the cut-off
+        ambiguous = np.flatnonzero(
+            (probabilities == threshold).sum(axis=1) != (candidate_scores == threshold).sum(axis=1)
+        )
+        if len(ambiguous):
+            rows, row_thresholds = probabilities[ambiguous], threshold[ambiguous]
+            above, tied = rows > row_thresholds, rows == row_thresholds
+            slots = k - above.sum(axis=1, keepdims=True)
+            selected = above | (tied & (np.cumsum(tied, axis=1) <= slots))
+            candidates[ambiguous] = np.nonzero(selected)[1].reshape(len(ambiguous), k)
+    else:
+        candidates = np.broadcast_to(np.arange(k), probabilities.shape)
+    candidate_scores = np.take_along_axis(probabilities, candidates, axis=1)
+    order = np.lexsort((candidates, -candidate_scores))
+    return np.take_along_axis(candidates, order, axis=1), np.take_along_axis(candidate_scores, order, axis=1)
+
+# Texts per worker task; smaller batches are not worth splitting
+MIN_CHUNK_SIZE = 16
+
+# Per-process predictor inside pool workers
+_worker_predictor = None
+
+def _init_worker(model_dir: str, use_numpy_scorer: bool) -> None:
+    """Pool worker start-up: load (memory-map) the model once"""
+    global _worker_predictor
+    _worker_predictor = SymptomMLPredictor(model_dir, cache_size=0, use_numpy_scorer=use_numpy_scorer)
+    _worker_predictor.load_models()
+
+def _worker_score(texts: List[str], top_k: Optional[int], fingerprint: str,
+                  model_dir: Optional[str] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Score a chunk in a pool worker, first loading the parent's generation if it differs"""
+    if _worker_predictor.fingerprint != fingerprint:
+        _worker_predictor.load_models(model_dir)
+        if _worker_predictor.fingerprint != fingerprint:
+            raise RuntimeError(f"worker has model {_worker_predictor.fingerprint}, expected {fingerprint}")
+    return score_texts(_worker_predictor._loaded, texts, top_k)
+
+class InferencePool:
+    """Worker processes that each load the model once and score chunks of a batch.
+    
+    Workers are spawned rather than forked, so they never inherit the parent's
+    threads. If a worker dies, the pool is rebuilt and the batch retried once.
+    """
+    
+    def __init__(self, model_dir: str, workers: int, use_numpy_scorer: bool = True,
+                 min_chunk_size: int = MIN_CHUNK_SIZE):
+        self.model_dir = model_dir
+        self.workers = workers
+        self.use_numpy_scorer = use_numpy_scorer
+        self.min_chunk_size = min_chunk_size
+        self._lock = threading.Lock()
+        self._executor = self._start()
+        self.tasks = 0
+        self.restarts = 0
+    
+    def _start(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(self.model_dir, self.use_numpy_scorer)
+        )
+    
+    def _restart(self, broken: ProcessPoolExecutor) -> None:
+        """Replace a broken executor, unless another thread already did"""
+        with self._lock:
+            if self._executor is broken:
+                broken.shutdown(wait=False, cancel_futures=True)
+                self._executor = self._start()
+                self.restarts += 1
+    
+    def score(self, texts: List[str], top_k: Optional[int], fingerprint: str,
+              model_dir: Optional[str] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """score_texts across the workers, one contiguous chunk per worker.
+        
+        Workers holding another generation load the one in model_dir first.
+        """
+        n_chunks = max(1, min(self.workers, len(texts) // self.min_chunk_size))
+        bounds = np.linspace(0, len(texts), n_chunks + 1).astype(int)
+        
+        for attempt in range(2):
+            executor = self._executor
+            try:
+                futures = [
+                    executor.submit(_worker_score, texts[start:end], top_k, fingerprint, model_dir)
+                    for start, end in zip(bounds[:-1], bounds[1:])
+                ]
+                parts = [future.result() for future in futures]
+                break
+            except BrokenProcessPool:
+                print("ML worker process died; restarting the pool")
+                self._restart(executor)
+                if attempt:
+                    raise
+        
+        self.tasks += len(parts)
+        return np.concatenate([part[0] for part in parts]), np.concatenate([part[1] for part in parts])
+    
+    def stats(self) -> Dict:
+        return {"workers": self.workers, "tasks": self.tasks, "restarts": self.restarts}
+    
+    def close(self) -> None:
+        with self._lock:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+
+class SymptomMLPredictor:
+    """ML-based symptom to condition predictor.
+    
+    The loaded model, vectorizer and metadata live in one LoadedModel that
+    load_models replaces with a single assignment. Predictions take that
+    reference once, so a reload never mixes generations and in-flight
+    predictions finish on the model they started with.
+    
+    With workers > 0, cache misses are scored by an InferencePool of that
+    many processes instead of the calling thread.
+    """
+    
+    def __init__(self, model_dir='models', cache_size=10000, cache_ttl=3600.0, use_numpy_scorer=True, workers=0):
+        self.model_dir = model_dir
+        self.use_numpy_scorer = use_numpy_scorer
+        self.workers = workers
+        self.pool: Optional[InferencePool] = None
+        self._loaded: Optional[LoadedModel] = None
+        self._load_lock = threading.Lock()
+        self.watcher: Optional["ModelWatcher"] = None
+        
+        # Predictions keyed on (kind, model fingerprint, normalized text, ...)
+        self.cache = PredictionCache(cache_size, cache_ttl)
+        
+        # Load metrics
+        self.load_count = 0
+        self.reload_count = 0
+        self.load_failures = 0
+        self.last_load_seconds = 0.0
+        self.total_load_seconds = 0.0
+        self.last_loaded_at = None
+    
+    @property
+    def model(self):
+        return self._loaded.model if self._loaded else None
+    
+    @property
+    def vectorizer(self):
+        return self._loaded.vectorizer if self._loaded else None
+    
+    @property
+    def metadata(self) -> Optional[Dict]:
+        return self._loaded.metadata if self._loaded else None
+    
+    @property
+    def fingerprint(self) -> Optional[str]:
+        return self._loaded.fingerprint if self._loaded else None
+    
+    @property
+    def is_loaded(self) -> bool:
+        return self._loaded is not None
+    
+    def _read_models(self, model_dir: Optional[str] = None) -> Optional[LoadedModel]:
+        """Read the model files into a new LoadedModel, or None if there are none.
+        
+        Reads the version models/CURRENT points at, or model_dir itself for
+        the flat layout; a version directory passed as model_dir is read as
+        is. Prefers the NumPy scorer, which serves without importing
+        scikit-learn, then the single-file bundle, whose arrays are
+        memory-mapped, and finally the separate model, vectorizer and
+        metadata pickles.
+        """
+        model_dir = current_model_dir(model_dir or self.model_dir)
+        scorer = load_numpy_scorer(model_dir) if self.use_numpy_scorer else None
+        bundle = read_model_bundle(model_dir) if scorer is None else None
+        if scorer is not None:
+            model = scorer['model']
+            vectorizer = scorer['vectorizer']
+            metadata = scorer['manifest']['metadata']
+            checksum = scorer['manifest']['sha256']['weights']
+        elif bundle is not None:
+            model = bundle['model']
+            vectorizer = bundle['vectorizer']
+            metadata = bundle['metadata']
+            checksum = bundle['manifest']['sha256']
+        else:
+            model_path = os.path.join(model_dir, 'symptom_model.pkl')
+            vectorizer_path = os.path.join(model_dir, 'symptom_vectorizer.pkl')
+            metadata_path = os.path.join(model_dir, 'model_metadata.pkl')
+            
+            # Check if files exist
+            if not all(os.path.exists(path) for path in [model_path, vectorizer_path, metadata_path]):
+                return None
+            
+            # Load models
+            model = joblib.load(model_path)
+            vectorizer = joblib.load(vectorizer_path)
+            metadata = joblib.load(metadata_path)
+            checksum = file_sha256(model_path)
+        
+        fingerprint = f"{metadata.get('created_at', 'Unknown')}:{checksum[:16]}"
+        return LoadedModel(model, vectorizer, metadata, fingerprint, model_dir)
+    
+    def load_models(self, model_dir: Optional[str] = None) -> bool:
+        """Load the trained ML models and swap them in.
+        
+        Loads the published version unless model_dir names a version
+        directory. On failure the previously loaded model, if any, keeps
+        serving.
+        """
+        with self._load_lock:
+            start = time.perf_counter()
+            try:
+                loaded = self._read_models(model_dir)
+            except Exception as e:
+                print(f"Error loading ML models: {str(e)}")
+                self.load_failures += 1
+                return False
+            
+            if loaded is None:
+                return False
+            
+            # Atomic swap; a new fingerprint already keeps old cache entries from matching
+            replaced = self._loaded is not None
+            self._loaded = loaded
+            self.cache.clear()
+            
+            duration = time.perf_counter() - start
+            self.load_count += 1
+            self.reload_count += replaced
+            self.last_load_seconds = duration
+            self.total_load_seconds += duration
+            self.last_loaded_at = time.time()
+            get_tracer().record("model_reload" if replaced else "model_load", duration * 1000)
+            
+            if self.workers > 0 and self.pool is None:
+                self.pool = InferencePool(self.model_dir, self.workers, self.use_numpy_scorer)
+            return True
+    
+    def start_watching(self, interval: float = 5.0) -> "ModelWatcher":
+        """Reload in the background whenever the model files change"""
+        if self.watcher is None:
+            self.watcher = ModelWatcher(self, interval)
+            self.watcher.start()
+        return self.watcher
+    
+    def stop_watching(self) -> None:
+        """Stop the background model watcher, if running"""
+        if self.watcher is not None:
+            self.watcher.stop()
+            self.watcher = None
+    
+    def close(self) -> None:
+        """Stop the model watcher and any worker processes"""
+        self.stop_watching()
+        if self.pool is not None:
+            self.pool.close()
+            self.pool = None
+    
+    def _score(self, loaded: LoadedModel, texts: List[str], top_k: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """score_texts on the worker pool if there is one, else on this thread"""
+        if self.pool is not None:
+            try:
+                return self.pool.score(texts, top_k, loaded.fingerprint, loaded.model_dir)
+            except Exception as e:
+                print(f"Error in ML worker pool, scoring in-process: {str(e)}")
+        return score_texts(loaded, texts, top_k)
+    
+    def reload_stats(self) -> Dict:
+        """Load/reload counters and durations"""
+        return {
+            "loads": self.load_count,
+            "reloads": self.reload_count,
+            "load_failures": self.load_failures,
+            "last_load_seconds": self.last_load_seconds,
+            "total_load_seconds": self.total_load_seconds,
+            "last_loaded_at": self.last_loaded_at,
+            "watching": self.watcher is not None
+        }
+    
+    def predict_texts(self, texts: List[str]) -> Tuple[List[str], List[float]]:
+        """Predict conditions and confidences for many texts in one model pass.
+        
+        Cached texts are answered without touching the model.
+        """
+        loaded = self._loaded
+        normalized = [normalize_symptom(text) for text in texts]
+        conditions = [None] * len(texts)
+        confidences = [None] * len(texts)
+        
+        missing = []
+        for i, text in enumerate(normalized):
+            cached = self.cache.get(('predict', loaded.fingerprint, text))
+            if cached is None:
+                missing.append(i)
+            else:
+                conditions[i], confidences[i] = cached
+        
+        if missing:
+            best, scores = self._score(loaded, [normalized[i] for i in missing])
+            predicted = loaded.model.classes_[best]
+            
+            for i, condition, confidence in zip(missing, predicted, scores):
+                conditions[i], confidences[i] = condition, confidence
+                self.cache.put(('predict', loaded.fingerprint, normalized[i]), (condition, confidence))
+        
+        return conditions, confidences
+    
+    def predict_single_symptom(self, symptom_text: str) -> Tuple[str, float]:
+        """Predict condition for a single symptom text"""
+        if not self.is_loaded:
+            return "Model not loaded", 0.0
+        
+        try:
+            conditions, confidences = self.predict_texts([symptom_text])
+            return conditions[0], confidences[0]
+            
+        except Exception as e:
+            print(f"Error in ML prediction: {str(e)}")
+            return "Prediction error", 0.0
+    
+    def predict_multiple_symptoms(self, symptoms: List[str]) -> List[Dict]:
+        """Predict conditions for multiple symptoms"""
+        if not self.is_loaded:
+            return [{"symptom": s, "condition": "Model not loaded", "confidence": 0.0} for s in symptoms]
+        
+        texts, labels = expand_symptom_texts(symptoms)
+        if not texts:
+            return []
+        
+        try:
+            conditions, confidences = self.predict_texts(texts)
+        except Exception as e:
+            print(f"Error in ML prediction: {str(e)}")
+            return [{"symptom": label, "condition": "Prediction error", "confidence": 0.0} for label in labels]
+        
+        return [
+            {"symptom": label, "condition": condition, "confidence": confidence}
+            for label, condition, confidence in zip(labels, conditions, confidences)
+        ]
+    
+    def get_top_predictions_batch(self, symptom_texts: List[str], top_k: int = 5) -> Optional[TopKPredictions]:
+        """Get top K predictions for many texts with one model pass.
+        
+        Returns None if the model is not loaded or prediction fails.
+        """
+        if not self.is_loaded:
+            return None
+        
+        try:
+            loaded = self._loaded
+            normalized = [normalize_symptom(text) for text in symptom_texts]
+            classes = loaded.model.classes_
+            
+            k = min(top_k, len(classes))
+            
+            # One ranked row per text, however many classes it was scored for;
+            # any row with at least k classes answers this call by slicing
+            rows = [self.cache.get(('top', loaded.fingerprint, text)) for text in normalized]
+            missing = [i for i, row in enumerate(rows) if row is None or len(row[0]) < k]
+            
+            if missing:
+                indices, scores = self._score(loaded, [normalized[i] for i in missing], top_k)
+                
+                for i, row_indices, row_scores in zip(missing, indices, scores):
+                    rows[i] = (row_indices, row_scores)
+                    self.cache.put(('top', loaded.fingerprint, normalized[i]), rows[i])
+            
+            if not rows:
+                return TopKPredictions(np.empty((0, 0), dtype=np.int64), np.empty((0, 0)), classes)
+            return TopKPredictions(
+                np.stack([row[0][:k] for row in rows]),
+                np.stack([row[1][:k] for row in rows]),
+                classes
+            )
+            
+        except Exception as e:
+            print(f"Error getting top predictions: {str(e)}")
+            return None
+    
+    def get_top_predictions(self, symptom_text: str, top_k: int = 5) -> List[Tuple[str, float]]:
+        """Get top K predictions with probabilities"""
+        if not self.is_loaded:
+            return [("Model not loaded", 0.0)]
+        
+        predictions = self.get_top_predictions_batch([symptom_text], top_k)
+        if predictions is None:
+            return [("Prediction error", 0.0)]
+        return predictions[0]
+    
+    def get_model_info(self) -> Dict:
+        """Get information about the loaded model"""
+        loaded = self._loaded
+        if loaded is None:
+            return {"status": "Model not loaded"}
+        
+        # Hashed vectorizers have a fixed column count rather than feature names
+        features_count = getattr(loaded.vectorizer, 'n_features', None)
+        if features_count is None and hasattr(loaded.vectorizer, 'get_feature_names_out'):
+            features_count = loaded.vectorizer.get_feature_names_out().shape[0]
+        
+        info = {
+            "status": "Loaded",
+            "model_type": loaded.metadata.get('model_type', 'Unknown'),
+            "created_at": loaded.metadata.get('created_at', 'Unknown'),
+            "version": loaded.metadata.get('version', 'Unknown'),
+            "description": loaded.metadata.get('description', 'No description'),
+            "features_count": features_count if features_count is not None else 'Unknown',
+            "classes_count": len(loaded.model.classes_) if hasattr(loaded.model, 'classes_') else 'Unknown',
+            "fingerprint": loaded.fingerprint,
+            "model_dir": loaded.model_dir
+        }
+        
+        cache_stats = self.cache.stats()
+        info.update({
+            "cache_hits": cache_stats["hits"],
+            "cache_misses": cache_stats["misses"],
+            "cache_hit_rate": cache_stats["hit_rate"],
+            "cache_size": cache_stats["size"]
+        })
+        
+        reload_stats = self.reload_stats()
+        info.update({
+            "reload_count": reload_stats["reloads"],
+            "last_reload_seconds": reload_stats["last_load_seconds"],
+            "reload_failures": reload_stats["load_failures"]
+        })
+        
+        if self.pool is not None:
+            pool_stats = self.pool.stats()
+            info.update({
+                "workers": pool_stats["workers"],
+                "worker_restarts": pool_stats["restarts"]
+            })
+        
+        return info
+    
+    def is_available(self) -> bool:
+        """Check if ML prediction is available"""
+        return self.is_loaded
+
+class ModelWatcher:
+    """Daemon thread that polls a predictor's model directory and reloads on change.
+    
+    With versioned saves only models/CURRENT is watched: it is switched
+    after the new version is complete, so the reload happens on the next
+    poll. In the flat layout a change is only acted on once the files have
+    stayed the same for one more poll, so a training run that is still
+    writing is not picked up half-way through.
+    """
+    
+    def __init__(self, predictor: SymptomMLPredictor, interval: float = 5.0):
+        self.predictor = predictor
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="model-watcher", daemon=True)
+        self._seen = None
+        self._pending = None
+    
+    def signature(self) -> Tuple:
+        """What identifies the published model.
+        
+        (CURRENT, version name) for versioned saves, otherwise (path, mtime,
+        size) of every file in the model directory and its subdirectories.
+        """
+        version = current_version_name(self.predictor.model_dir)
+        if version is not None:
+            return (CURRENT_FILENAME, version)
+        entries = []
+        for root, _, files in os.walk(self.predictor.model_dir):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((path, stat.st_mtime_ns, stat.st_size))
+        return tuple(sorted(entries))
+    
+    def start(self) -> None:
+        self._seen = self.signature()
+        self._thread.start()
+    
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+    
+    def poll(self) -> bool:
+        """Check the model files once; returns True if a reload happened"""
+        current = self.signature()
+        if current == self._seen:
+            self._pending = None
+            return False
+        if current != self._pending and current[:1] != (CURRENT_FILENAME,):
+            # Wait for the files to settle
+            self._pending = current
+            return False
+        
+        self._seen = current
+        self._pending = None
+        return self.predictor.load_models()
+    
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll()
+            except Exception as e:
+                print(f"Error watching ML models: {str(e)}")
+
+# Seconds between checks of models/ for a retrained model; 0 disables the watcher
+MODEL_WATCH_INTERVAL = 5.0
+
+def _parse_workers(value: Optional[str]) -> int:
+    """Worker count from SYMPTOM_ML_WORKERS; anything but a count falls back to 0"""
+    try:
+        workers = int(value or 0)
+    except ValueError:
+        print(f"Ignoring SYMPTOM_ML_WORKERS={value!r}: expected a number of processes")
+        return 0
+    return max(workers, 0)
+
+# Worker processes for the global predictor; 0 scores on the calling thread
+ML_WORKERS = _parse_workers(os.environ.get('SYMPTOM_ML_WORKERS'))
+
+# Global ML predictor instance (singleton pattern for Streamlit)
+_ml_predictor = None
+_ml_predictor_lock = threading.Lock()
+
+def get_ml_predictor() -> SymptomMLPredictor:
+    """Get or create the global ML predictor instance.
+    
+    Creation is locked so concurrent first requests load the model once.
+    """
+    global _ml_predictor
+    predictor = _ml_predictor
+    if predictor is None:
+        with _ml_predictor_lock:
+            if _ml_predictor is None:
+                predictor = SymptomMLPredictor(workers=ML_WORKERS)
+                predictor.load_models()
+                if MODEL_WATCH_INTERVAL > 0:
+                    predictor.start_watching(MODEL_WATCH_INTERVAL)
+                _ml_predictor = predictor
+            predictor = _ml_predictor
+    return predictor
+
+def predict_symptoms_ml(symptoms: List[str]) -> List[Dict]:
+    """Convenience function for ML prediction"""
+    predictor = get_ml_predictor()
+    return predictor.predict_multiple_symptoms(symptoms)
+
+def get_top_predictions_ml(symptom_text: str, top_k: int = 5) -> List[Tuple[str, float]]:
+    """Convenience function for top predictions"""
+    predictor = get_ml_predictor()
+    return predictor.get_top_predictions(symptom_text, top_k)
+
+def get_top_predictions_batch_ml(symptom_texts: List[str], top_k: int = 5) -> Optional[TopKPredictions]:
+    """Convenience function for batched top predictions"""
+    predictor = get_ml_predictor()
+    return predictor.get_top_predictions_batch(symptom_texts, top_k)
+
+def is_ml_available() -> bool:
+    """Check if ML prediction is available"""
+    predictor = get_ml_predictor()
+    return predictor.is_available()
+
+def get_ml_model_info() -> Dict:
+    """Get ML model information"""
+    predictor = get_ml_predictor()
+    return predictor.get_model_info() 
\ No newline at end of file
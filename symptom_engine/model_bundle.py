@@ -0,0 +1,89 @@
+"""
+Model Bundle Module for Symptom Checker Bot
+Single-file model artifact whose numeric arrays can be memory-mapped
+
+A bundle is two files in the model directory:
+    symptom_bundle.joblib  model, vectorizer and metadata, dumped uncompressed
+    symptom_bundle.json    manifest: format version, creation time, checksum
+                           and the numeric arrays found inside the bundle
+
+Because the joblib file is uncompressed, loading it with mmap_mode='r' maps
+coefficient, log-prior and idf arrays straight from the OS page cache, so
+worker processes share those pages and startup cost does not grow with
+model size. Both files are replaced by rename, never rewritten in place, so
+a process that still maps the previous bundle keeps reading intact pages.
+"""
+
+import json
+import os
+import joblib
+import numpy as np
+from typing import Dict, List, Optional
+
+from .model_store import file_sha256, publish_file
+
+BUNDLE_FORMAT_VERSION = 1
+BUNDLE_FILENAME = 'symptom_bundle.joblib'
+MANIFEST_FILENAME = 'symptom_bundle.json'
+
+def _numeric_arrays(prefix: str, obj) -> List[Dict]:
+    """Describe the numeric ndarray attributes of a fitted estimator"""
+    arrays = []
+    for name, value in sorted(vars(obj).items()):
+        if isinstance(value, np.ndarray) and value.dtype.kind in 'fiu':
+            arrays.append({"name": f"{prefix}.{name}", "shape": list(value.shape), "dtype": str(value.dtype)})
+    return arrays
+
+def write_model_bundle(model_dir: str, model, vectorizer, metadata: Dict) -> Dict:
+    """Write the bundle and its manifest; returns the manifest"""
+    os.makedirs(model_dir, exist_ok=True)
+    bundle_path = os.path.join(model_dir, BUNDLE_FILENAME)
+    staging_path = f"{bundle_path}.tmp-{os.getpid()}"
+    joblib.dump({'model': model, 'vectorizer': vectorizer, 'metadata': metadata}, staging_path, compress=0)
+    
+    arrays = _numeric_arrays('model', model)
+    if hasattr(vectorizer, '_tfidf'):
+        arrays.extend(_numeric_arrays('vectorizer.tfidf', vectorizer._tfidf))
+    
+    manifest = {
+        "format_version": BUNDLE_FORMAT_VERSION,
+        "bundle": BUNDLE_FILENAME,
+        "created_at": metadata.get('created_at'),
+        "model_type": metadata.get('model_type'),
+        "sha256": file_sha256(staging_path),
+        "size_bytes": os.path.getsize(staging_path),
+        "arrays": arrays
+    }
+    manifest_path = os.path.join(model_dir, MANIFEST_FILENAME)
+    manifest_staging_path = f"{manifest_path}.tmp-{os.getpid()}"
+    with open(manifest_staging_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    publish_file(staging_path, bundle_path)
+    publish_file(manifest_staging_path, manifest_path)
+    return manifest
+
+def read_model_manifest(model_dir: str) -> Optional[Dict]:
+    """Bundle manifest, or None if the directory has no supported bundle"""
+    manifest_path = os.path.join(model_dir, MANIFEST_FILENAME)
+    if not os.path.exists(manifest_path):
+        return None
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    if manifest.get('format_version') != BUNDLE_FORMAT_VERSION:
+        return None
+    if not os.path.exists(os.path.join(model_dir, manifest['bundle'])):
+        return None
+    return manifest
+
+def read_model_bundle(model_dir: str, mmap: bool = True) -> Optional[Dict]:
+    """Load the bundle with its arrays memory-mapped read-only.
+    
+    Returns a dict with model, vectorizer, metadata and manifest, or None
+    if the directory has no supported bundle.
+    """
+    manifest = read_model_manifest(model_dir)
+    if manifest is None:
+        return None
+    bundle = joblib.load(os.path.join(model_dir, manifest['bundle']), mmap_mode='r' if mmap else None)
+    bundle['manifest'] = manifest
+    return bundle
@@ -0,0 +1,129 @@
+"""
+Model Selection Module for Symptom Checker Bot
+Parallel candidate fitting scored on stratified held-out folds
+
+Every (candidate, fold) pair is fitted in its own joblib worker. Each fit
+records its fit time, its single-row predict_proba latency and its top-1 and
+top-5 accuracy on the held-out fold. Candidates are compared on the mean
+over folds, using a configurable metric and an optional latency budget.
+
+Conditions with fewer examples than there are folds cannot be held out and
+still be learned, so they stay in every training split and are never
+scored.
+"""
+
+import time
+import numpy as np
+from joblib import Parallel, delayed, effective_n_jobs
+from joblib.externals.loky import get_reusable_executor
+from sklearn.base import clone
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.model_selection import StratifiedKFold
+from sklearn.naive_bayes import MultinomialNB
+from typing import Dict, List, Optional, Tuple
+
+SELECTION_METRICS = ('accuracy', 'top5_accuracy')
+N_SPLITS = 3
+# Single-row predict_proba calls timed per fold
+LATENCY_SAMPLES = 50
+
+def default_candidates() -> List[Tuple[str, Dict, object]]:
+    """(model name, tuned params, unfitted estimator) over a small hyperparameter grid"""
+    grid = [
+        ('MultinomialNB', MultinomialNB(), 'alpha', (0.01, 0.1, 1.0)),
+        ('LogisticRegression', LogisticRegression(max_iter=1000, random_state=42), 'C', (0.1, 1.0, 10.0)),
+        ('SGDClassifier', SGDClassifier(loss='log_loss', random_state=42), 'alpha', (1e-5, 1e-4))
+    ]
+    return [(name, {param: value}, clone(base).set_params(**{param: value}))
+            for name, base, param, values in grid for value in values]
+
+def candidate_label(name: str, params: Dict) -> str:
+    return f"{name}({', '.join(f'{k}={v}' for k, v in sorted(params.items()))})"
+
+def stratified_folds(y, n_splits: int = N_SPLITS, seed: int = 42) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """(train, validation) index arrays; rare conditions are always in train"""
+    y = np.asarray(y, dtype=object)
+    classes, codes, counts = np.unique(y, return_inverse=True, return_counts=True)
+    splittable = np.flatnonzero(counts[codes] >= n_splits)
+    always_train = np.flatnonzero(counts[codes] < n_splits)
+    if len(splittable) == 0:
+        return []
+    
+    splitter = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=seed)
+    folds = []
+    for train, validation in splitter.split(splittable, y[splittable]):
+        folds.append((np.sort(np.concatenate([splittable[train], always_train])), splittable[validation]))
+    return folds
+
+def _evaluate_fold(estimator, X, y, train, validation) -> Dict:
+    """Fit on one split and score the held-out rows"""
+    start = time.perf_counter()
+    model = clone(estimator).fit(X[train], y[train])
+    fit_seconds = time.perf_counter() - start
+    
+    X_val = X[validation]
+    proba = model.predict_proba(X_val)
+    classes = np.asarray(model.classes_, dtype=object)
+    y_val = y[validation]
+    top5 = classes[np.argsort(-proba, axis=1, kind='stable')[:, :5]]
+    
+    timings = []
+    for row in range(min(LATENCY_SAMPLES, X_val.shape[0])):
+        start = time.perf_counter()
+        model.predict_proba(X_val[row])
+        timings.append(time.perf_counter() - start)
+    
+    return {
+        'fit_seconds': fit_seconds,
+        'latency_ms': float(np.median(timings)) * 1000,
+        'accuracy': float(np.mean(top5[:, 0] == y_val)),
+        'top5_accuracy': float(np.mean((top5 == y_val[:, None]).any(axis=1)))
+    }
+
+def evaluate_candidates(candidates: List[Tuple[str, Dict, object]], X, y, n_splits: int = N_SPLITS,
+                        n_jobs: int = -1, seed: int = 42) -> List[Dict]:
+    """Mean fold scores per candidate; fits run in parallel across n_jobs processes"""
+    y = np.asarray(y, dtype=object)
+    folds = stratified_folds(y, n_splits, seed)
+    if not folds:
+        print(f"   ⚠️ No condition has {n_splits} examples; cannot hold out validation folds")
+        return []
+    
+    jobs = [(index, train, validation) for index in range(len(candidates)) for train, validation in folds]
+    scores = Parallel(n_jobs=n_jobs)(
+        delayed(_evaluate_fold)(candidates[index][2], X, y, train, validation)
+        for index, train, validation in jobs
+    )
+    if effective_n_jobs(n_jobs) > 1:
+        # Stop the workers so their memory is freed and their CPU time is
+        # counted in the parent's RUSAGE_CHILDREN
+        get_reusable_executor().shutdown(wait=True)
+    
+    results = []
+    for index, (name, params, _) in enumerate(candidates):
+        fold_scores = [score for (job_index, _, _), score in zip(jobs, scores) if job_index == index]
+        result = {'name': name, 'label': candidate_label(name, params), 'params': params, 'index': index,
+                  'folds': len(fold_scores)}
+        for key in ('fit_seconds', 'latency_ms') + SELECTION_METRICS:
+            result[key] = float(np.mean([score[key] for score in fold_scores]))
+        results.append(result)
+    return results
+
+def select_candidate(results: List[Dict], metric: str = 'accuracy',
+                     latency_budget_ms: Optional[float] = None) -> Optional[Dict]:
+    """Best result on metric among those within the latency budget.
+    
+    Ties go to the lower latency. If no candidate meets the budget, the
+    fastest one is returned instead.
+    """
+    if not results:
+        return None
+    
+    eligible = results
+    if latency_budget_ms is not None:
+        eligible = [r for r in results if r['latency_ms'] <= latency_budget_ms]
+        if not eligible:
+            print(f"   ⚠️ No candidate within {latency_budget_ms:.2f} ms; using the fastest")
+            return min(results, key=lambda r: r['latency_ms'])
+    
+    return max(eligible, key=lambda r: (r[metric], -r['latency_ms']))
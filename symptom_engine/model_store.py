@@ -0,0 +1,135 @@
+"""
+Model Store Module for Symptom Checker Bot
+Immutable per-version model directories behind an atomically replaced pointer
+
+Every save writes a complete new directory, and CURRENT names the one in use:
+    models/CURRENT    name of the published version directory, e.g. "v7"
+    models/v7/        pickles, bundle and scorer/ of version 7
+    models/v6/        the previous version, kept while readers may still map it
+
+A version directory is never modified once CURRENT has pointed at it. A
+predictor that memory-mapped v6 keeps reading intact files while v7 is
+written and published, and it only reads v7 after it reloads. CURRENT is
+replaced with os.replace, so readers see either the old or the new name.
+
+Directories without CURRENT use the flat layout of models saved before
+versioning, where model_dir itself holds the files.
+
+Loaded models are memory-mapped, so no file a reader may have mapped is ever
+rewritten in place. publish_file and publish_directory rename complete new
+contents over the old path instead. Unlinking or renaming a mapped file
+leaves the mapping intact, while truncating and rewriting it does not.
+"""
+
+import hashlib
+import os
+import re
+import shutil
+from typing import List, Optional, Tuple
+
+CURRENT_FILENAME = 'CURRENT'
+MODEL_VERSIONS_KEEP = 3
+_VERSION_DIR = re.compile(r'^v(\d+)$')
+
+def file_sha256(path: str, size: Optional[int] = None) -> str:
+    """Hex SHA-256 of a file's contents, or of its first size bytes"""
+    digest = hashlib.sha256()
+    remaining = os.path.getsize(path) if size is None else size
+    with open(path, 'rb') as f:
+        while remaining > 0:
+            chunk = f.read(min(1 << 20, remaining))
+            if not chunk:
+                break
+            digest.update(chunk)
+            remaining -= len(chunk)
+    return digest.hexdigest()
+
+def publish_file(staging_path: str, path: str) -> None:
+    """Rename a completed staging file over path"""
+    os.replace(staging_path, path)
+
+def publish_directory(staging_dir: str, target_dir: str) -> None:
+    """Move a completed staging directory to target_dir, replacing any previous one.
+    
+    The previous directory is renamed aside and then deleted; files that are
+    still memory-mapped stay readable until their mappings are closed.
+    """
+    retired_dir = None
+    if os.path.exists(target_dir):
+        retired_dir = f"{target_dir}.old-{os.getpid()}"
+        shutil.rmtree(retired_dir, ignore_errors=True)
+        os.replace(target_dir, retired_dir)
+    os.replace(staging_dir, target_dir)
+    if retired_dir is not None:
+        shutil.rmtree(retired_dir, ignore_errors=True)
+
+def current_version_name(model_dir: str) -> Optional[str]:
+    """Version directory name CURRENT points at, or None for the flat layout"""
+    try:
+        with open(os.path.join(model_dir, CURRENT_FILENAME)) as f:
+            name = f.read().strip()
+    except OSError:
+        return None
+    if not _VERSION_DIR.match(name) or not os.path.isdir(os.path.join(model_dir, name)):
+        return None
+    return name
+
+def current_model_dir(model_dir: str) -> str:
+    """Directory holding the published model files"""
+    name = current_version_name(model_dir)
+    return os.path.join(model_dir, name) if name is not None else model_dir
+
+def version_dirs(model_dir: str) -> List[Tuple[int, str]]:
+    """(version, path) of every version directory, oldest first"""
+    if not os.path.isdir(model_dir):
+        return []
+    versions = []
+    for name in os.listdir(model_dir):
+        match = _VERSION_DIR.match(name)
+        if match and os.path.isdir(os.path.join(model_dir, name)):
+            versions.append((int(match.group(1)), os.path.join(model_dir, name)))
+    return sorted(versions)
+
+def create_version_dir(model_dir: str, previous_version: int = 0) -> Tuple[int, str]:
+    """Create the directory for the next version; returns (version, path).
+    
+    The number is above both previous_version and every existing directory,
+    so an unpublished directory left by a failed save is never reused.
+    """
+    os.makedirs(model_dir, exist_ok=True)
+    existing = [version for version, _ in version_dirs(model_dir)]
+    version = max([previous_version] + existing) + 1
+    while True:
+        path = os.path.join(model_dir, f"v{version}")
+        try:
+            os.makedirs(path)
+            return version, path
+        except FileExistsError:
+            # Another save claimed this number first
+            version += 1
+
+def publish_version(model_dir: str, version_dir: str, keep: int = MODEL_VERSIONS_KEEP) -> None:
+    """Point CURRENT at a completed version directory and prune old versions"""
+    pointer = os.path.join(model_dir, CURRENT_FILENAME)
+    staging = f"{pointer}.tmp-{os.getpid()}"
+    with open(staging, 'w') as f:
+        f.write(os.path.basename(os.path.normpath(version_dir)) + '\n')
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(staging, pointer)
+    prune_versions(model_dir, keep)
+
+def prune_versions(model_dir: str, keep: int = MODEL_VERSIONS_KEEP) -> int:
+    """Delete all but the keep newest version directories; returns how many were removed.
+    
+    The published version is always kept. Mapped files of a deleted
+    directory stay readable until the process holding them reloads.
+    """
+    current = current_version_name(model_dir)
+    removed = 0
+    for _, path in version_dirs(model_dir)[:-max(keep, 1)]:
+        if os.path.basename(path) == current:
+            continue
+        shutil.rmtree(path, ignore_errors=True)
+        removed += 1
+    return removed
@@ -0,0 +1,404 @@
+"""
+NumPy Scorer Module for Symptom Checker Bot
+scikit-learn-free TF-IDF featurization and linear scoring for serving
+
+A scorer is exported next to the trained model as models/scorer/:
+    manifest.json    vectorizer settings, classes, link function and checksums
+    vocabulary.json  feature terms in column order (vocabulary vectorizers only)
+    idf.npy          idf weight per feature
+    weights.npy      (features x classes) score matrix
+    bias.npy         per-class bias
+    weight_scale.npy, weight_offset.npy
+                     per-feature dequantization terms (int8 weights only)
+
+MultinomialNB exports feature_log_prob_.T and class_log_prior_; logistic
+regression and SGDClassifier(loss='log_loss') export coef_.T and intercept_.
+Arrays are saved uncompressed and opened memory-mapped. predict_proba
+reproduces scikit-learn's to within floating point rounding. An export is
+written to a staging directory and renamed into place, so files a running
+predictor has mapped are never modified.
+
+Weights can be stored as float64, float16 or int8 to cut resident memory per
+worker. int8 uses per-row affine quantization, w ~ q * scale + offset with one
+scale and offset per feature row. Only the rows a query touches are
+dequantized.
+
+Both TfidfVectorizer and HashingTfidfVectorizer models are supported; the
+latter is served with a pure-Python MurmurHash3 matching scikit-learn's.
+"""
+
+import json
+import os
+import re
+import shutil
+import numpy as np
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from .model_store import file_sha256, publish_directory
+
+SCORER_FORMAT_VERSION = 1
+SCORER_DIRNAME = 'scorer'
+HASH_CACHE_SIZE = 65536
+WEIGHT_DTYPES = ('float64', 'float16', 'int8')
+# Feature rows converted at a time while writing weights.npy
+EXPORT_BLOCK_BYTES = 1 << 26
+
+def murmurhash3_32(data: bytes, seed: int = 0) -> int:
+    """Signed 32-bit MurmurHash3 (x86 variant), as scikit-learn's murmurhash3_32"""
+    c1, c2, mask = 0xcc9e2d51, 0x1b873593, 0xffffffff
+    h = seed
+    n_blocks = len(data) // 4
+    
+    for i in range(0, n_blocks * 4, 4):
+        k = (int.from_bytes(data[i:i + 4], 'little') * c1) & mask
+        k = (((k << 15) | (k >> 17)) * c2) & mask
+        h ^= k
+        h = ((h << 13) | (h >> 19)) & mask
+        h = (h * 5 + 0xe6546b64) & mask
+    
+    tail = data[n_blocks * 4:]
+    if tail:
+        k = int.from_bytes(tail, 'little')
+        k = (k * c1) & mask
+        k = (((k << 15) | (k >> 17)) * c2) & mask
+        h ^= k
+    
+    h ^= len(data)
+    h ^= h >> 16
+    h = (h * 0x85ebca6b) & mask
+    h ^= h >> 13
+    h = (h * 0xc2b2ae35) & mask
+    h ^= h >> 16
+    return h - (1 << 32) if h & 0x80000000 else h
+
+@lru_cache(maxsize=HASH_CACHE_SIZE)
+def hashed_column(term: str, n_features: int) -> int:
+    """Column of term in a hashed feature space, as scikit-learn's FeatureHasher"""
+    h = murmurhash3_32(term.encode('utf-8'))
+    if h == -2 ** 31:
+        return (2 ** 31 - 1 - (n_features - 1)) % n_features
+    return abs(h) % n_features
+
+class SparseRows:
+    """Minimal CSR matrix: row i holds data[indptr[i]:indptr[i + 1]] at columns indices[...]"""
+    
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, data: np.ndarray, n_features: int):
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.shape = (len(indptr) - 1, n_features)
+    
+    def dot(self, weights: np.ndarray, scale: Optional[np.ndarray] = None,
+            offset: Optional[np.ndarray] = None) -> np.ndarray:
+        """Dense (rows x classes) product with a (features x classes) matrix.
+        
+        With scale and offset, weights are int8 and each gathered row is
+        dequantized as q * scale + offset before use.
+        """
+        result = np.zeros((self.shape[0], weights.shape[1]), dtype=np.float64)
+        if not len(self.data):
+            return result
+        gathered = weights[self.indices]
+        if scale is not None:
+            gathered = gathered * scale[self.indices, None] + offset[self.indices, None]
+        # Sum each row's weighted weight-rows; empty rows are skipped since reduceat cannot express them
+        nonempty = np.flatnonzero(np.diff(self.indptr))
+        contributions = gathered * self.data[:, None]
+        result[nonempty] = np.add.reduceat(contributions, self.indptr[nonempty], axis=0)
+        return result
+
+class NumpyTfidfVectorizer:
+    """Reimplementation of a fitted word-level TfidfVectorizer's transform"""
+    
+    def __init__(self, config: Dict, vocabulary: List[str], idf: Optional[np.ndarray]):
+        self.config = config
+        self.terms = vocabulary
+        self.vocabulary_ = {term: i for i, term in enumerate(vocabulary)}
+        self.n_features = len(vocabulary)
+        self.idf_ = idf
+        self.token_pattern = re.compile(config['token_pattern'])
+        self.stop_words = frozenset(config['stop_words'] or ())
+        self.ngram_range = tuple(config['ngram_range'])
+    
+    def analyze(self, text: str) -> List[str]:
+        """Lowercase, tokenize, drop stop words and build word n-grams"""
+        if self.config['lowercase']:
+            text = text.lower()
+        tokens = [token for token in self.token_pattern.findall(text) if token not in self.stop_words]
+        
+        min_n, max_n = self.ngram_range
+        if max_n == 1:
+            return tokens
+        
+        ngrams = list(tokens) if min_n == 1 else []
+        for n in range(max(min_n, 2), min(max_n, len(tokens)) + 1):
+            ngrams.extend(" ".join(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+        return ngrams
+    
+    def column(self, term: str) -> Optional[int]:
+        """Feature column of a term, or None if it is not a feature"""
+        return self.vocabulary_.get(term)
+    
+    def transform(self, texts: List[str]) -> SparseRows:
+        """TF-IDF rows for texts, normalized like the fitted vectorizer"""
+        indptr = [0]
+        indices = []
+        data = []
+        for text in texts:
+            counts: Dict[int, int] = {}
+            for term in self.analyze(text):
+                column = self.column(term)
+                if column is not None:
+                    counts[column] = counts.get(column, 0) + 1
+            columns = sorted(counts)
+            indices.extend(columns)
+            data.extend(counts[column] for column in columns)
+            indptr.append(len(indices))
+        
+        indptr = np.asarray(indptr, dtype=np.int64)
+        indices = np.asarray(indices, dtype=np.int64)
+        data = np.asarray(data, dtype=np.float64)
+        
+        if self.config['binary']:
+            data[:] = 1.0
+        if self.config['sublinear_tf']:
+            data = np.log(data) + 1
+        if self.idf_ is not None:
+            data = data * self.idf_[indices]
+        
+        norm = self.config['norm']
+        if norm in ('l1', 'l2') and len(data):
+            row_ids = np.repeat(np.arange(len(texts)), np.diff(indptr))
+            values = np.abs(data) if norm == 'l1' else data * data
+            sums = np.bincount(row_ids, weights=values, minlength=len(texts))
+            if norm == 'l2':
+                sums = np.sqrt(sums)
+            sums[sums == 0] = 1.0
+            data = data / sums[row_ids]
+        
+        return SparseRows(indptr, indices, data, self.n_features)
+    
+    def get_feature_names_out(self) -> np.ndarray:
+        return np.asarray(self.terms, dtype=object)
+
+class NumpyHashingVectorizer(NumpyTfidfVectorizer):
+    """Reimplementation of a fitted HashingTfidfVectorizer's transform"""
+    
+    def __init__(self, config: Dict, idf: Optional[np.ndarray]):
+        super().__init__(config, [], idf)
+        self.n_features = config['n_features']
+    
+    def column(self, term: str) -> Optional[int]:
+        return hashed_column(term, self.n_features)
+
+class NumpyLinearModel:
+    """Linear scorer with a softmax, binary logistic or one-vs-rest logistic link"""
+    
+    def __init__(self, weights: np.ndarray, bias: np.ndarray, classes: np.ndarray, link: str,
+                 scale: Optional[np.ndarray] = None, offset: Optional[np.ndarray] = None):
+        self.weights = weights
+        self.bias = bias
+        self.classes_ = classes
+        self.link = link
+        self.scale = scale
+        self.offset = offset
+    
+    def decision_function(self, X: SparseRows) -> np.ndarray:
+        return X.dot(self.weights, self.scale, self.offset) + self.bias
+    
+    def predict_proba(self, X: SparseRows) -> np.ndarray:
+        scores = self.decision_function(X)
+        if self.link == 'binary_logistic':
+            positive = 1.0 / (1.0 + np.exp(-scores[:, 0]))
+            return np.column_stack([1.0 - positive, positive])
+        if self.link == 'ovr_logistic':
+            # One-vs-rest sigmoids normalized per row; all-zero rows become uniform
+            probabilities = 1.0 / (1.0 + np.exp(-scores))
+            sums = probabilities.sum(axis=1)
+            probabilities[sums == 0] = 1.0
+            sums[sums == 0] = probabilities.shape[1]
+            return probabilities / sums[:, None]
+        # Softmax, shifted by the row maximum for stability
+        scores -= scores.max(axis=1, keepdims=True)
+        np.exp(scores, out=scores)
+        scores /= scores.sum(axis=1, keepdims=True)
+        return scores
+    
+    def predict(self, X: SparseRows) -> np.ndarray:
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+
+def _linear_parameters(model):
+    """(weights, bias, link) for supported estimators, or None"""
+    if hasattr(model, 'feature_log_prob_') and hasattr(model, 'class_log_prior_'):
+        return model.feature_log_prob_.T, model.class_log_prior_, 'softmax'
+    if hasattr(model, 'coef_') and hasattr(model, 'intercept_'):
+        # SGDClassifier only has probabilities with the log loss
+        if hasattr(model, 'loss') and model.loss != 'log_loss':
+            return None
+        if model.coef_.shape[0] == 1 and len(model.classes_) == 2:
+            return model.coef_.T, model.intercept_, 'binary_logistic'
+        # SGDClassifier and multi_class='ovr' normalize one-vs-rest sigmoids
+        multi_class = getattr(model, 'multi_class', None)
+        if multi_class == 'auto' and getattr(model, 'solver', None) == 'liblinear':
+            multi_class = 'ovr'
+        if hasattr(model, 'loss') or multi_class == 'ovr':
+            return model.coef_.T, model.intercept_, 'ovr_logistic'
+        return model.coef_.T, model.intercept_, 'softmax'
+    return None
+
+def quantize_rows(weights: np.ndarray):
+    """Per-row affine int8 quantization; returns (q, scale, offset) with w ~ q * scale + offset"""
+    low = weights.min(axis=1)
+    high = weights.max(axis=1)
+    scale = (high - low) / 255
+    scale[scale == 0] = 1.0
+    q = np.rint((weights - low[:, None]) / scale[:, None]) - 128
+    offset = low + 128 * scale
+    return q.astype(np.int8), scale, offset
+
+def _write_weights(scorer_dir: str, weights: np.ndarray, weights_dtype: str) -> List[str]:
+    """Write weights.npy (and the int8 scale and offset) a block of feature rows at a time.
+    
+    weights is usually a transposed view of the model's (classes x features)
+    array. Converting and writing block by block keeps the extra memory to
+    one block instead of a full transposed copy plus a full dtype copy.
+    Returns the names of the arrays written.
+    """
+    n_features, n_classes = weights.shape
+    block = max(1, EXPORT_BLOCK_BYTES // (8 * max(n_classes, 1)))
+    quantized = weights_dtype == 'int8'
+    scales, offsets = [], []
+    
+    with open(os.path.join(scorer_dir, 'weights.npy'), 'wb') as f:
+        np.lib.format.write_array_header_1_0(f, {
+            'descr': np.lib.format.dtype_to_descr(np.dtype(weights_dtype)),
+            'fortran_order': False,
+            'shape': (n_features, n_classes)
+        })
+        for start in range(0, n_features, block):
+            rows = np.asarray(weights[start:start + block], dtype=np.float64)
+            if quantized:
+                rows, scale, offset = quantize_rows(rows)
+                scales.append(scale)
+                offsets.append(offset)
+            np.ascontiguousarray(rows, dtype=weights_dtype).tofile(f)
+    
+    if not quantized:
+        return ['weights']
+    np.save(os.path.join(scorer_dir, 'weight_scale.npy'), np.concatenate(scales))
+    np.save(os.path.join(scorer_dir, 'weight_offset.npy'), np.concatenate(offsets))
+    return ['weights', 'weight_scale', 'weight_offset']
+
+def export_numpy_scorer(model_dir: str, model, vectorizer, metadata: Dict,
+                        weights_dtype: str = 'float64') -> Optional[Dict]:
+    """Export a fitted TfidfVectorizer or HashingTfidfVectorizer + linear model as a NumPy scorer.
+    
+    weights_dtype is one of WEIGHT_DTYPES. Returns the manifest, or None if
+    the model or vectorizer is not supported.
+    """
+    if weights_dtype not in WEIGHT_DTYPES:
+        raise ValueError(f"weights_dtype must be one of {WEIGHT_DTYPES}, got {weights_dtype!r}")
+    parameters = _linear_parameters(model)
+    # HashingTfidfVectorizer tokenizes with its wrapped HashingVectorizer
+    hashing = hasattr(vectorizer, 'hasher')
+    analyzer = vectorizer.hasher if hashing else vectorizer
+    if parameters is None or getattr(analyzer, 'analyzer', None) != 'word':
+        return None
+    if not hashing and not hasattr(vectorizer, 'vocabulary_'):
+        return None
+    if analyzer.tokenizer is not None or analyzer.preprocessor is not None or analyzer.strip_accents is not None:
+        return None
+    if hashing and analyzer.alternate_sign:
+        return None
+    weights, bias, link = parameters
+    
+    # Build the new scorer in a staging directory and swap it in when complete
+    scorer_dir = os.path.join(model_dir, SCORER_DIRNAME)
+    staging_dir = f"{scorer_dir}.tmp-{os.getpid()}"
+    shutil.rmtree(staging_dir, ignore_errors=True)
+    os.makedirs(staging_dir)
+    
+    if not hashing:
+        terms = [None] * len(vectorizer.vocabulary_)
+        for term, column in vectorizer.vocabulary_.items():
+            terms[column] = term
+        with open(os.path.join(staging_dir, 'vocabulary.json'), 'w') as f:
+            json.dump(terms, f)
+    
+    use_idf = bool(getattr(vectorizer, 'use_idf', False))
+    arrays = {'bias': np.ascontiguousarray(bias, dtype=np.float64)}
+    if use_idf:
+        arrays['idf'] = np.ascontiguousarray(vectorizer.idf_, dtype=np.float64)
+    for name, array in arrays.items():
+        np.save(os.path.join(staging_dir, f"{name}.npy"), array)
+    names = list(arrays) + _write_weights(staging_dir, weights, weights_dtype)
+    checksums = {name: file_sha256(os.path.join(staging_dir, f"{name}.npy")) for name in names}
+    
+    stop_words = analyzer.get_stop_words()
+    manifest = {
+        "format_version": SCORER_FORMAT_VERSION,
+        "metadata": metadata,
+        "link": link,
+        "weights_dtype": weights_dtype,
+        "classes": [str(label) for label in model.classes_],
+        "vectorizer": {
+            "kind": "hashing" if hashing else "vocabulary",
+            "n_features": int(weights.shape[0]),
+            "lowercase": bool(analyzer.lowercase),
+            "token_pattern": analyzer.token_pattern,
+            "stop_words": sorted(stop_words) if stop_words else None,
+            "ngram_range": list(analyzer.ngram_range),
+            "binary": bool(analyzer.binary),
+            "sublinear_tf": bool(getattr(vectorizer, 'sublinear_tf', False)),
+            "norm": getattr(vectorizer, 'norm', None),
+            "use_idf": use_idf
+        },
+        "sha256": checksums
+    }
+    with open(os.path.join(staging_dir, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f, indent=2, default=str)
+    publish_directory(staging_dir, scorer_dir)
+    return manifest
+
+def load_numpy_scorer(model_dir: str, mmap: bool = True) -> Optional[Dict]:
+    """Load an exported scorer with its arrays memory-mapped.
+    
+    Returns a dict with vectorizer, model and manifest, or None if the
+    directory has no supported scorer.
+    """
+    scorer_dir = os.path.join(model_dir, SCORER_DIRNAME)
+    manifest_path = os.path.join(scorer_dir, 'manifest.json')
+    if not os.path.exists(manifest_path):
+        return None
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    if manifest.get('format_version') != SCORER_FORMAT_VERSION:
+        return None
+    
+    mmap_mode = 'r' if mmap else None
+    config = manifest['vectorizer']
+    idf = None
+    if config['use_idf']:
+        idf = np.load(os.path.join(scorer_dir, 'idf.npy'), mmap_mode=mmap_mode)
+    
+    if config.get('kind', 'vocabulary') == 'hashing':
+        vectorizer = NumpyHashingVectorizer(config, idf)
+    else:
+        with open(os.path.join(scorer_dir, 'vocabulary.json')) as f:
+            vocabulary = json.load(f)
+        vectorizer = NumpyTfidfVectorizer(config, vocabulary, idf)
+    scale = offset = None
+    if manifest.get('weights_dtype', 'float64') == 'int8':
+        scale = np.load(os.path.join(scorer_dir, 'weight_scale.npy'), mmap_mode=mmap_mode)
+        offset = np.load(os.path.join(scorer_dir, 'weight_offset.npy'), mmap_mode=mmap_mode)
+    
+    model = NumpyLinearModel(
+        np.load(os.path.join(scorer_dir, 'weights.npy'), mmap_mode=mmap_mode),
+        np.load(os.path.join(scorer_dir, 'bias.npy'), mmap_mode=mmap_mode),
+        np.asarray(manifest['classes'], dtype=object),
+        manifest['link'],
+        scale,
+        offset
+    )
+    return {'vectorizer': vectorizer, 'model': model, 'manifest': manifest}
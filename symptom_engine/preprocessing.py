@@ -0,0 +1,38 @@
+"""
+Text Preprocessing Module for Symptom Checker Bot
+Shared symptom normalization for rule-based matching and ML prediction
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict
+
+# Maximum number of distinct raw inputs remembered by normalize_symptom
+NORMALIZE_CACHE_SIZE = 4096
+
+_PUNCTUATION_PATTERN = re.compile(r'[^\w\s-]')
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def normalize_symptom(symptom: str) -> str:
+    """Normalize symptom text for better matching."""
+    symptom = symptom.lower().strip()
+    symptom = _PUNCTUATION_PATTERN.sub('', symptom)
+    symptom = _WHITESPACE_PATTERN.sub(' ', symptom)
+    return symptom
+
+def get_normalization_stats() -> Dict:
+    """Get hit/miss counters of the normalization cache"""
+    info = normalize_symptom.cache_info()
+    lookups = info.hits + info.misses
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "hit_rate": info.hits / lookups if lookups else 0.0,
+        "size": info.currsize,
+        "max_size": info.maxsize
+    }
+
+def clear_normalization_cache() -> None:
+    """Drop all cached normalizations and reset the counters"""
+    normalize_symptom.cache_clear()
@@ -0,0 +1,355 @@
+"""
+Inference Service Module for Symptom Checker Bot
+Local asyncio HTTP service sharing one warm model across front-ends
+
+Requests that arrive within max_wait_ms of each other are collected into one
+batch (up to max_batch_size texts) and scored with a single
+get_top_predictions_batch call, i.e. one predict_proba pass; every caller
+gets its own slice back.
+
+Endpoints (JSON in, JSON out):
+    POST /predict   {"symptoms": ["fever", "cough"]}
+    POST /top       {"text": "fever cough", "top_k": 5} or {"texts": [...], "top_k": 5}
+    GET  /metrics   request/batch counters, queue depth and batch-size histograms
+    GET  /health    model status
+
+Usage:
+    python -m symptom_engine.server --port 8600 --max-batch-size 64 --max-wait-ms 2
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from .ml_predictor import SymptomMLPredictor, expand_symptom_texts
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8600
+DEFAULT_MAX_BATCH_SIZE = 64
+DEFAULT_MAX_WAIT_MS = 2.0
+MAX_BODY_BYTES = 1 << 20
+
+def parse_content_length(value: Optional[str]) -> Optional[int]:
+    """Body length from a Content-Length header, or None if it is not a non-negative integer"""
+    if value is None or value == '':
+        return 0
+    # int() would also accept signs, underscores and surrounding whitespace
+    if not value.isascii() or not value.isdigit():
+        return None
+    return int(value)
+
+class Histogram:
+    """Counts per power-of-two bucket: 1, 2, 4, ... and a final overflow bucket"""
+    
+    def __init__(self, max_value: int):
+        self.bounds = [1]
+        while self.bounds[-1] < max_value:
+            self.bounds.append(self.bounds[-1] * 2)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.total = 0
+        self.samples = 0
+    
+    def add(self, value: int) -> None:
+        for i, bound in enumerate(self.bounds):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.total += value
+        self.samples += 1
+    
+    def to_dict(self) -> Dict:
+        labels = [f"<={bound}" for bound in self.bounds] + [f">{self.bounds[-1]}"]
+        return {
+            "buckets": dict(zip(labels, self.counts)),
+            "mean": self.total / self.samples if self.samples else 0.0,
+            "samples": self.samples
+        }
+
+class PendingRequest:
+    """One caller's texts waiting for a batch, and the future its slice is delivered to"""
+    
+    def __init__(self, texts: List[str], top_k: int, future: asyncio.Future):
+        self.texts = texts
+        self.top_k = top_k
+        self.future = future
+        self.enqueued_at = time.perf_counter()
+
+class MicroBatcher:
+    """Collects concurrent requests into batched top-k predictions"""
+    
+    def __init__(self, predictor: SymptomMLPredictor, max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+                 max_wait_ms: float = DEFAULT_MAX_WAIT_MS):
+        self.predictor = predictor
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.queue: Optional[asyncio.Queue] = None
+        # Model calls run off the event loop, one batch at a time
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="inference")
+        self._task: Optional[asyncio.Task] = None
+        
+        self.requests = 0
+        self.batched_requests = 0
+        self.batches = 0
+        self.errors = 0
+        self.batch_sizes = Histogram(max_batch_size)
+        self.queue_depths = Histogram(max_batch_size)
+        self.wait_ms_total = 0.0
+    
+    def start(self) -> None:
+        self.queue = asyncio.Queue()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+    
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self.executor.shutdown(wait=True)
+    
+    async def predict(self, texts: List[str], top_k: int) -> List[List[Tuple[str, float]]]:
+        """Top-k (condition, probability) pairs per text, scored in a shared batch"""
+        if not texts:
+            return []
+        future = asyncio.get_running_loop().create_future()
+        self.requests += 1
+        await self.queue.put(PendingRequest(texts, top_k, future))
+        return await future
+    
+    async def _collect(self) -> List[PendingRequest]:
+        """Wait for one request, then gather more until the batch is full or max_wait passes"""
+        loop = asyncio.get_running_loop()
+        batch = [await self.queue.get()]
+        size = len(batch[0].texts)
+        deadline = loop.time() + self.max_wait
+        
+        while size < self.max_batch_size:
+            # Take whatever is already queued before sleeping on the queue
+            if self.queue.empty():
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+            else:
+                item = self.queue.get_nowait()
+            batch.append(item)
+            size += len(item.texts)
+        return batch
+    
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            self.queue_depths.add(self.queue.qsize())
+            
+            texts = [text for item in batch for text in item.texts]
+            top_k = max(item.top_k for item in batch)
+            started = time.perf_counter()
+            self.batches += 1
+            self.batched_requests += len(batch)
+            self.batch_sizes.add(len(texts))
+            self.wait_ms_total += sum(started - item.enqueued_at for item in batch) * 1000
+            
+            try:
+                predictions = await loop.run_in_executor(
+                    self.executor, self.predictor.get_top_predictions_batch, texts, top_k
+                )
+                if predictions is None:
+                    raise RuntimeError("prediction failed")
+            except Exception as e:
+                self.errors += 1
+                for item in batch:
+                    if not item.future.done():
+                        item.future.set_exception(e)
+                continue
+            
+            # Hand each caller its own rows, trimmed to the top_k it asked for
+            row = 0
+            for item in batch:
+                rows = [
+                    [(str(label), float(score)) for label, score in predictions[i][:item.top_k]]
+                    for i in range(row, row + len(item.texts))
+                ]
+                row += len(item.texts)
+                if not item.future.done():
+                    item.future.set_result(rows)
+    
+    def metrics(self) -> Dict:
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "errors": self.errors,
+            "queue_depth": self.queue.qsize() if self.queue is not None else 0,
+            "mean_wait_ms": self.wait_ms_total / self.batched_requests if self.batched_requests else 0.0,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "batch_size_histogram": self.batch_sizes.to_dict(),
+            "queue_depth_histogram": self.queue_depths.to_dict()
+        }
+
+class InferenceServer:
+    """Minimal HTTP/1.1 JSON server in front of a MicroBatcher"""
+    
+    def __init__(self, predictor: SymptomMLPredictor, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                 max_batch_size: int = DEFAULT_MAX_BATCH_SIZE, max_wait_ms: float = DEFAULT_MAX_WAIT_MS):
+        self.predictor = predictor
+        self.host = host
+        self.port = port
+        self.batcher = MicroBatcher(predictor, max_batch_size, max_wait_ms)
+        self._server: Optional[asyncio.AbstractServer] = None
+    
+    async def start(self) -> None:
+        self.batcher.start()
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        # Report the bound port when started with port 0
+        self.port = self._server.sockets[0].getsockname()[1]
+    
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        await self.batcher.stop()
+    
+    async def serve_forever(self) -> None:
+        await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+    
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve requests on one keep-alive connection until the client closes it"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, path, _ = request_line.decode('latin-1').split(' ', 2)
+                except ValueError:
+                    await self._respond(writer, 400, {"error": "Malformed request line"}, False)
+                    break
+                
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                
+                length = parse_content_length(headers.get('content-length'))
+                if length is None:
+                    await self._respond(writer, 400, {"error": "Invalid Content-Length"}, False)
+                    break
+                if length > MAX_BODY_BYTES:
+                    await self._respond(writer, 413, {"error": "Request body too large"}, False)
+                    break
+                body = await reader.readexactly(length) if length else b''
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                
+                status, payload = await self._route(method, path.split('?', 1)[0], body)
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+    
+    async def _respond(self, writer: asyncio.StreamWriter, status: int, payload: Dict, keep_alive: bool) -> None:
+        reasons = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+                   413: 'Payload Too Large', 500: 'Internal Server Error', 503: 'Service Unavailable'}
+        body = json.dumps(payload).encode('utf-8')
+        head = (
+            f"HTTP/1.1 {status} {reasons.get(status, 'OK')}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode('latin-1') + body)
+        await writer.drain()
+    
+    async def _route(self, method: str, path: str, body: bytes) -> Tuple[int, Dict]:
+        if path == '/health':
+            return 200, {"status": "ok" if self.predictor.is_available() else "model not loaded",
+                         "model": self.predictor.get_model_info()}
+        if path == '/metrics':
+            return 200, {"batching": self.batcher.metrics(), "model": self.predictor.get_model_info()}
+        if path not in ('/predict', '/top'):
+            return 404, {"error": f"Unknown path {path}"}
+        if method != 'POST':
+            return 405, {"error": "Use POST"}
+        if not self.predictor.is_available():
+            return 503, {"error": "Model not loaded"}
+        
+        try:
+            request = json.loads(body or b'{}')
+        except ValueError:
+            return 400, {"error": "Body must be JSON"}
+        if not isinstance(request, dict):
+            return 400, {"error": "Body must be a JSON object"}
+        
+        try:
+            if path == '/predict':
+                symptoms = request.get('symptoms')
+                if not isinstance(symptoms, list) or not all(isinstance(s, str) for s in symptoms):
+                    return 400, {"error": "'symptoms' must be a list of strings"}
+                texts, labels = expand_symptom_texts(symptoms)
+                rows = await self.batcher.predict(texts, 1)
+                return 200, {"predictions": [
+                    {"symptom": label, "condition": row[0][0], "confidence": row[0][1]}
+                    for label, row in zip(labels, rows)
+                ]}
+            
+            texts = request.get('texts', [request.get('text')] if 'text' in request else None)
+            top_k = request.get('top_k', 5)
+            if not isinstance(texts, list) or not all(isinstance(t, str) for t in texts):
+                return 400, {"error": "Provide 'text' as a string or 'texts' as a list of strings"}
+            if not isinstance(top_k, int) or top_k < 1:
+                return 400, {"error": "'top_k' must be a positive integer"}
+            rows = await self.batcher.predict(texts, top_k)
+            predictions = [[list(pair) for pair in row] for row in rows]
+            if 'texts' in request:
+                return 200, {"predictions": predictions}
+            return 200, {"predictions": predictions[0]}
+        except Exception as e:
+            print(f"Error serving {path}: {str(e)}")
+            return 500, {"error": "Prediction error"}
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Symptom Checker inference service")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--model-dir', default='models')
+    parser.add_argument('--max-batch-size', type=int, default=DEFAULT_MAX_BATCH_SIZE,
+                        help="Texts per batched model call")
+    parser.add_argument('--max-wait-ms', type=float, default=DEFAULT_MAX_WAIT_MS,
+                        help="How long the first request in a batch waits for company")
+    parser.add_argument('--watch-interval', type=float, default=5.0,
+                        help="Seconds between checks for a retrained model; 0 disables")
+    args = parser.parse_args(argv)
+    
+    predictor = SymptomMLPredictor(args.model_dir)
+    if not predictor.load_models():
+        print(f"⚠️ No model found in {args.model_dir}; waiting for one to be trained")
+    if args.watch_interval > 0:
+        predictor.start_watching(args.watch_interval)
+    
+    server = InferenceServer(predictor, args.host, args.port, args.max_batch_size, args.max_wait_ms)
+    print(f"🩺 Symptom inference service on http://{args.host}:{args.port} "
+          f"(batch ≤{args.max_batch_size}, wait ≤{args.max_wait_ms} ms)")
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
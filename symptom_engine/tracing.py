@@ -0,0 +1,251 @@
+"""
+Tracing Module for Symptom Checker Bot
+Nestable timing spans with rolling per-stage latency percentiles, and
+wall/CPU/memory profiles of one-off pipeline stages such as training
+"""
+
+import json
+import platform
+import sys
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+from typing import Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Number of recent samples kept per stage for percentile estimates
+WINDOW_SIZE = 1000
+
+class Span:
+    """One timed stage, possibly containing nested spans"""
+
+    def __init__(self, name: str, path: str):
+        self.name = name
+        self.path = path
+        self.children: List["Span"] = []
+        self.duration_ms = 0.0
+
+    def to_dict(self) -> Dict:
+        """Span tree as plain data"""
+        return {
+            "name": self.name,
+            "duration_ms": self.duration_ms,
+            "children": [child.to_dict() for child in self.children]
+        }
+
+    def flatten(self, depth: int = 0) -> List[Dict]:
+        """Span tree as rows of (depth, name, duration) in start order"""
+        rows = [{"depth": depth, "name": self.name, "duration_ms": self.duration_ms}]
+        for child in self.children:
+            rows.extend(child.flatten(depth + 1))
+        return rows
+
+class Tracer:
+    """Collects span timings per stage in a bounded rolling window.
+
+    Stages are keyed by their nesting path (e.g. "analysis/find_symptom_matches")
+    so the same function timed under different parents is reported separately.
+    Span stacks are per thread, so concurrent sessions do not nest into each other.
+    """
+
+    def __init__(self, window_size: int = WINDOW_SIZE):
+        self.window_size = window_size
+        self._samples: Dict[str, deque] = {}
+        self._counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _stack(self) -> List[Span]:
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    @contextmanager
+    def span(self, name: str):
+        """Time the enclosed block as a stage nested under the current span"""
+        stack = self._stack()
+        parent = stack[-1] if stack else None
+        span = Span(name, f"{parent.path}/{name}" if parent else name)
+        if parent is not None:
+            parent.children.append(span)
+
+        stack.append(span)
+        start = time.perf_counter()
+        try:
+            yield span
+        finally:
+            span.duration_ms = (time.perf_counter() - start) * 1000
+            stack.pop()
+            self.record(span.path, span.duration_ms)
+
+    def record(self, stage: str, duration_ms: float) -> None:
+        """Add one timing sample for a stage"""
+        with self._lock:
+            if stage not in self._samples:
+                self._samples[stage] = deque(maxlen=self.window_size)
+                self._counts[stage] = 0
+            self._samples[stage].append(duration_ms)
+            self._counts[stage] += 1
+
+    def stats(self) -> Dict[str, Dict]:
+        """Rolling p50/p95/p99 per stage, in milliseconds"""
+        with self._lock:
+            snapshot = {stage: (sorted(samples), self._counts[stage]) for stage, samples in self._samples.items()}
+
+        def percentile(values: List[float], q: float) -> float:
+            # Nearest-rank percentile over the sorted window
+            return values[min(len(values) - 1, max(0, int(round(q / 100 * len(values))) - 1))]
+
+        return {
+            stage: {
+                "count": count,
+                "window": len(values),
+                "p50_ms": percentile(values, 50),
+                "p95_ms": percentile(values, 95),
+                "p99_ms": percentile(values, 99),
+                "max_ms": values[-1]
+            }
+            for stage, (values, count) in sorted(snapshot.items())
+        }
+
+    def reset(self) -> None:
+        """Forget all recorded samples"""
+        with self._lock:
+            self._samples.clear()
+            self._counts.clear()
+
+def _resource_usage() -> Dict:
+    """Process and reaped-children CPU seconds and peak RSS in MB"""
+    if resource is None:
+        return {"children_cpu": 0.0, "peak_rss_mb": None, "children_peak_rss_mb": None}
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    scale = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return {
+        "children_cpu": children.ru_utime + children.ru_stime,
+        "peak_rss_mb": own.ru_maxrss / scale,
+        "children_peak_rss_mb": children.ru_maxrss / scale
+    }
+
+class StageProfiler:
+    """Wall time, CPU time and peak memory of sequential pipeline stages.
+
+    peak_rss_mb is the process high-water mark when a stage ends and
+    peak_rss_increase_mb how much that stage raised it. Worker processes
+    count towards child_cpu_seconds once they have exited. With
+    trace_memory, tracemalloc also reports each stage's own allocation
+    peak, which slows allocation-heavy code noticeably. Stages should not
+    be nested.
+    """
+
+    def __init__(self, trace_memory: bool = False):
+        self.reset(trace_memory)
+
+    def reset(self, trace_memory: bool = False) -> None:
+        """Forget recorded stages"""
+        self.trace_memory = trace_memory
+        self.stages: List[Dict] = []
+
+    @contextmanager
+    def stage(self, name: str):
+        """Profile the enclosed block; extra keys set on the yielded dict are kept"""
+        record = {"name": name}
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+        before = _resource_usage()
+        start_wall, start_cpu = time.perf_counter(), time.process_time()
+        try:
+            yield record
+        finally:
+            after = _resource_usage()
+            record.update({
+                "wall_seconds": time.perf_counter() - start_wall,
+                "cpu_seconds": time.process_time() - start_cpu,
+                "child_cpu_seconds": after["children_cpu"] - before["children_cpu"],
+                "peak_rss_mb": after["peak_rss_mb"],
+                "peak_rss_increase_mb": (after["peak_rss_mb"] - before["peak_rss_mb"]
+                                         if after["peak_rss_mb"] is not None else None),
+                "child_peak_rss_mb": after["children_peak_rss_mb"]
+            })
+            if self.trace_memory:
+                record["tracemalloc_peak_mb"] = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+            self.stages.append(record)
+
+    def summary(self) -> Dict:
+        """Totals plus wall seconds per stage"""
+        return {
+            "total_wall_seconds": sum(stage["wall_seconds"] for stage in self.stages),
+            "total_cpu_seconds": sum(stage["cpu_seconds"] + stage["child_cpu_seconds"] for stage in self.stages),
+            "peak_rss_mb": _resource_usage()["peak_rss_mb"],
+            "stage_seconds": {stage["name"]: stage["wall_seconds"] for stage in self.stages}
+        }
+
+    def report(self) -> Dict:
+        """Summary, environment and the full record of every stage"""
+        report = {
+            "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "trace_memory": self.trace_memory
+        }
+        report.update(self.summary())
+        report["stages"] = self.stages
+        return report
+
+# Process-wide tracer shared by every session
+_tracer = Tracer()
+_profiler = StageProfiler()
+
+def get_tracer() -> Tracer:
+    """Get the process-wide tracer"""
+    return _tracer
+
+def trace_span(name: str):
+    """Context manager timing a stage on the process-wide tracer"""
+    return _tracer.span(name)
+
+def traced(name: Optional[str] = None):
+    """Decorator timing every call of a function as a stage"""
+    def decorator(func):
+        stage = name or func.__name__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with _tracer.span(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def get_profiler() -> StageProfiler:
+    """Get the process-wide stage profiler"""
+    return _profiler
+
+def profile_stage(name: str):
+    """Context manager profiling a pipeline stage on the process-wide profiler"""
+    return _profiler.stage(name)
+
+def get_stage_stats() -> Dict[str, Dict]:
+    """Rolling latency percentiles per stage"""
+    return _tracer.stats()
+
+def dump_stage_stats(path: Optional[str] = None) -> str:
+    """Serialize stage statistics as JSON, optionally writing them to a file"""
+    payload = json.dumps({
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "window_size": _tracer.window_size,
+        "stages": _tracer.stats()
+    }, indent=2)
+    if path:
+        with open(path, 'w') as f:
+            f.write(payload)
+    return payload
@@ -0,0 +1,101 @@
+"""
+Reference implementations for parity tests
+The original row-scanning matcher and ranker from main.py, and the nested
+pair loops from train_simple_model.py, kept verbatim
+"""
+
+import re
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+import pandas as pd
+
+def normalize_symptom(symptom: str) -> str:
+    """Normalize symptom text for better matching."""
+    symptom = symptom.lower().strip()
+    symptom = re.sub(r'[^\w\s-]', '', symptom)
+    symptom = re.sub(r'\s+', ' ', symptom)
+    return symptom
+
+def find_symptom_matches(user_symptoms: List[str], df: pd.DataFrame) -> Dict[str, List[Tuple[str, str]]]:
+    """Find matching conditions for given symptoms with severity."""
+    matches = {}
+    
+    for user_symptom in user_symptoms:
+        user_symptom_normalized = normalize_symptom(user_symptom)
+        matched_conditions = []
+        
+        # Exact match
+        exact_matches = df[df['symptom'] == user_symptom_normalized][['condition', 'severity']].values.tolist()
+        matched_conditions.extend([(condition, severity) for condition, severity in exact_matches])
+        
+        # Partial match
+        for _, row in df.iterrows():
+            db_symptom = row['symptom']
+            condition = row['condition']
+            severity = row['severity']
+            
+            if any(condition == existing_condition for existing_condition, _ in matched_conditions):
+                continue
+                
+            if (user_symptom_normalized in db_symptom or 
+                db_symptom in user_symptom_normalized or
+                any(word in db_symptom.split() for word in user_symptom_normalized.split() if len(word) > 2)):
+                matched_conditions.append((condition, severity))
+        
+        matches[user_symptom] = matched_conditions
+    
+    return matches
+
+def get_combined_conditions(matches: Dict[str, List[Tuple[str, str]]]) -> List[Tuple[str, int, str]]:
+    """Get conditions ranked by frequency and severity."""
+    condition_data = {}
+    
+    for conditions in matches.values():
+        for condition, severity in conditions:
+            if condition not in condition_data:
+                condition_data[condition] = {'count': 0, 'severity': severity}
+            condition_data[condition]['count'] += 1
+    
+    # Sort by severity weight and frequency
+    severity_weights = {'Critical': 4, 'High': 3, 'Medium': 2, 'Low': 1}
+    
+    sorted_conditions = sorted(
+        condition_data.items(),
+        key=lambda x: (severity_weights.get(x[1]['severity'], 2), x[1]['count']),
+        reverse=True
+    )
+    
+    return [(condition, data['count'], data['severity']) for condition, data in sorted_conditions]
+
+def expand_training_data(df: pd.DataFrame) -> pd.DataFrame:
+    """Training examples: every row, then every pair of symptoms sharing a condition."""
+    # Create expanded training data by using each symptom-condition pair
+    # and also creating combinations
+    expanded_data = []
+    
+    # Add original data
+    for _, row in df.iterrows():
+        expanded_data.append({
+            'text': row['symptom'],
+            'condition': row['condition']
+        })
+    
+    # Create some multi-symptom examples from related conditions
+    condition_symptoms = defaultdict(list)
+    for _, row in df.iterrows():
+        condition_symptoms[row['condition']].append(row['symptom'])
+    
+    # For conditions with multiple symptoms, create combined examples
+    for condition, symptoms in condition_symptoms.items():
+        if len(symptoms) > 1:
+            # Create combinations of 2 symptoms
+            for i in range(len(symptoms)):
+                for j in range(i+1, len(symptoms)):
+                    combined = f"{symptoms[i]} {symptoms[j]}"
+                    expanded_data.append({
+                        'text': combined,
+                        'condition': condition
+                    })
+    
+    return pd.DataFrame(expanded_data)
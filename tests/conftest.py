@@ -0,0 +1,18 @@
+import numpy as np
+import pytest
+
+from benchmarks.synthetic import make_dataset, make_queries
+
+SEVERITIES = ['Critical', 'High', 'Medium', 'Low', 'Unknown']
+
+@pytest.fixture(scope='session')
+def severity_df():
+    """Synthetic dataset whose severity varies between rows of one condition"""
+    df = make_dataset(600, 40, seed=3)
+    rng = np.random.default_rng(3)
+    df['severity'] = rng.choice(SEVERITIES, size=len(df))
+    return df
+
+@pytest.fixture(scope='session')
+def queries(severity_df):
+    return make_queries(severity_df, 60, symptoms_per_query=3, seed=5)
@@ -0,0 +1,80 @@
+import os
+
+import numpy as np
+import pytest
+
+import train_simple_model
+from symptom_engine.feature_cache import feature_cache_key, load_features, prune_features, save_features
+from train_simple_model import build_features, build_vectorizer, dataset_watermark
+
+@pytest.fixture
+def featurize(monkeypatch, tmp_path, severity_df):
+    """build_features over a temporary CSV; records every run that missed the cache"""
+    data_path = str(tmp_path / 'symptoms.csv')
+    severity_df[['symptom', 'condition']].to_csv(data_path, index=False)
+    cache_dir = str(tmp_path / 'cache')
+    misses = []
+    create_training_data = train_simple_model.create_training_data
+    def counting(*args, **kwargs):
+        misses.append(args)
+        return create_training_data(*args, **kwargs)
+    monkeypatch.setattr(train_simple_model, 'create_training_data', counting)
+
+    def run(**options):
+        sha256 = dataset_watermark(data_path)['sha256']
+        return build_features(data_path, dataset_sha256=sha256, cache_dir=cache_dir, **options)
+    run.data_path, run.cache_dir, run.misses = data_path, cache_dir, misses
+    return run
+
+def test_same_data_and_config_hits(featurize):
+    vectorizer, X, y = featurize()
+    cached_vectorizer, cached_X, cached_y = featurize()
+    assert len(featurize.misses) == 1
+    assert (X != cached_X).nnz == 0 and list(y) == list(cached_y)
+    texts = ["fever cough", "unknown words"]
+    assert (vectorizer.transform(texts) != cached_vectorizer.transform(texts)).nnz == 0
+
+def test_changed_dataset_bytes_miss(featurize):
+    featurize()
+    with open(featurize.data_path, 'a') as f:
+        f.write("new symptom,Condition 99999\n")
+    _, X, y = featurize()
+    assert len(featurize.misses) == 2
+    assert 'Condition 99999' in set(y)
+
+@pytest.mark.parametrize("options", [
+    {'featurizer': 'hashing'},
+    {'featurizer': 'hashing', 'n_features': 1024},
+    {'max_pairs_per_condition': 3},
+    {'pair_sample_rate': 0.5}
+])
+def test_changed_featurization_misses(featurize, options):
+    featurize()
+    featurize(**options)
+    assert len(featurize.misses) == 2
+    featurize(**options)
+    assert len(featurize.misses) == 2
+
+def test_key_depends_on_vectorizer_settings():
+    base = feature_cache_key('abc', build_vectorizer('tfidf'))
+    assert feature_cache_key('abc', build_vectorizer('tfidf')) == base
+    assert feature_cache_key('abd', build_vectorizer('tfidf')) != base
+    assert feature_cache_key('abc', build_vectorizer('tfidf').set_params(max_features=100)) != base
+    assert feature_cache_key('abc', build_vectorizer('tfidf'), {'seed': 1}) != base
+
+def test_unreadable_entries_miss_and_old_entries_are_pruned(tmp_path):
+    cache_dir = str(tmp_path)
+    vectorizer = build_vectorizer('tfidf')
+    X = vectorizer.fit_transform(["fever cough", "rash"])
+    for index in range(7):
+        entry = save_features(f"key{index}", vectorizer, X, np.array(['a', 'b'], dtype=object), cache_dir)
+        os.utime(entry, (index, index))
+    # Each save keeps the five most recently used entries
+    assert sorted(os.listdir(cache_dir)) == [f"key{index}" for index in range(2, 7)]
+    assert prune_features(cache_dir, keep=3) == 2
+    assert sorted(os.listdir(cache_dir)) == ['key4', 'key5', 'key6']
+
+    os.remove(os.path.join(cache_dir, 'key6', 'features.npz'))
+    assert load_features('key6', cache_dir) is None
+    assert load_features('missing', cache_dir) is None
+    assert load_features('key5', cache_dir)[1].shape == X.shape
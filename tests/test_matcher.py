@@ -0,0 +1,48 @@
+import pytest
+
+from symptom_engine import find_symptom_matches, find_symptom_matches_batch, get_combined_conditions, get_symptom_index
+from symptom_engine.data import load_symptoms_data
+from tests import baseline
+
+@pytest.fixture(scope='module')
+def real_df():
+    return load_symptoms_data('symptoms.csv')
+
+def messy(query):
+    """Same symptoms with the case, spacing and punctuation users type"""
+    return [f"  {symptom.upper()}!! " if i % 2 else symptom.replace(' ', '   ') for i, symptom in enumerate(query)]
+
+def test_matches_equal_baseline(severity_df, queries):
+    index = get_symptom_index(severity_df)
+    for query in queries[:30] + [messy(query) for query in queries[30:]]:
+        expected = baseline.find_symptom_matches(query, severity_df)
+        assert find_symptom_matches(query, severity_df, index) == expected
+        assert find_symptom_matches(query, severity_df) == expected
+
+def test_real_dataset_matches_and_ranking_equal_baseline(real_df):
+    queries = [
+        ['fever', 'headache', 'cough'],
+        ['Chest Pain', 'shortness of breath'],
+        ['stomach', 'nausea', 'vomit'],
+        ['pain'],
+        ['rash', 'itchy skin', 'joint pain', 'fatigue'],
+        ['xyz unknown'],
+        []
+    ]
+    index = get_symptom_index(real_df)
+    for query in queries:
+        expected = baseline.find_symptom_matches(query, real_df)
+        matches = find_symptom_matches(query, real_df, index)
+        assert matches == expected
+        assert get_combined_conditions(matches, index) == baseline.get_combined_conditions(expected)
+
+def test_batch_with_duplicate_symptoms_equals_baseline(severity_df, queries):
+    index = get_symptom_index(severity_df)
+    # Repeated symptoms within a patient and identical patients in one batch
+    batch = [query + query[:1] for query in queries[:20]] + [queries[0], queries[0], [], ['fever', 'FEVER', 'fever']]
+    results = find_symptom_matches_batch(batch, severity_df, index)
+    assert len(results) == len(batch)
+    for query, (matches, ranking) in zip(batch, results):
+        expected = baseline.find_symptom_matches(query, severity_df)
+        assert matches == expected
+        assert ranking == baseline.get_combined_conditions(expected)
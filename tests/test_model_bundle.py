@@ -0,0 +1,27 @@
+import os
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.naive_bayes import MultinomialNB
+
+from symptom_engine.model_bundle import BUNDLE_FILENAME, read_model_bundle, write_model_bundle
+
+def _fit(texts, labels):
+    vectorizer = TfidfVectorizer().fit(texts)
+    return MultinomialNB().fit(vectorizer.transform(texts), labels), vectorizer
+
+def test_rewrite_leaves_mapped_bundle_intact(tmp_path):
+    model, vectorizer = _fit(["fever cough", "rash itch", "fever chills"], ["Flu", "Dermatitis", "Flu"])
+    write_model_bundle(str(tmp_path), model, vectorizer, {'created_at': 'first'})
+    mapped = read_model_bundle(str(tmp_path))
+    expected = np.array(mapped['model'].feature_log_prob_)
+    inode = os.stat(tmp_path / BUNDLE_FILENAME).st_ino
+    
+    other, other_vectorizer = _fit(["headache", "nausea", "headache nausea"], ["Migraine", "Migraine", "Gastritis"])
+    write_model_bundle(str(tmp_path), other, other_vectorizer, {'created_at': 'second'})
+    
+    # The new bundle is a new file; the old mapping still reads the old weights
+    assert os.stat(tmp_path / BUNDLE_FILENAME).st_ino != inode
+    np.testing.assert_array_equal(mapped['model'].feature_log_prob_, expected)
+    assert read_model_bundle(str(tmp_path))['metadata']['created_at'] == 'second'
+    assert sorted(os.listdir(tmp_path)) == ['symptom_bundle.joblib', 'symptom_bundle.json']
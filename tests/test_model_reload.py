@@ -0,0 +1,101 @@
+import os
+import threading
+
+import numpy as np
+import pytest
+from sklearn.naive_bayes import MultinomialNB
+
+from symptom_engine.ml_predictor import ModelWatcher, SymptomMLPredictor, score_texts
+from symptom_engine.model_store import current_model_dir
+from train_simple_model import TRAINING_REPORT_FILENAME, build_vectorizer, finish_version, save_model
+
+TEXTS = ["fever cough", "rash", "", "unknown words here"]
+
+@pytest.fixture(scope='module')
+def models(severity_df):
+    """Two differently fitted (model, vectorizer) pairs on the synthetic data"""
+    symptoms, conditions = list(severity_df['symptom']), list(severity_df['condition'])
+    fitted = []
+    for alpha, rows in ((1.0, slice(None)), (0.01, slice(0, 300))):
+        vectorizer = build_vectorizer('tfidf').fit(symptoms[rows])
+        model = MultinomialNB(alpha=alpha).fit(vectorizer.transform(symptoms[rows]), conditions[rows])
+        fitted.append((model, vectorizer))
+    return fitted
+
+def test_saving_new_versions_while_old_generation_scores(tmp_path, models, queries):
+    model_dir = str(tmp_path)
+    texts = [' '.join(query) for query in queries] + TEXTS
+    save_model(*models[0], 'MultinomialNB', model_dir)
+    predictor = SymptomMLPredictor(model_dir, cache_size=0)
+    assert predictor.load_models()
+    old = predictor._loaded
+    expected = score_texts(old, texts, 5)
+    
+    # Score the old generation continuously while new versions are saved
+    # until its directory is pruned
+    stop = threading.Event()
+    mismatches = []
+    def score_old():
+        while not stop.is_set():
+            indices, scores = score_texts(old, texts, 5)
+            if not (np.array_equal(indices, expected[0]) and np.array_equal(scores, expected[1])):
+                mismatches.append(indices)
+    scorer = threading.Thread(target=score_old)
+    scorer.start()
+    try:
+        for i in range(4):
+            save_model(*models[(i + 1) % 2], 'MultinomialNB', model_dir, weights_dtype='int8')
+    finally:
+        stop.set()
+        scorer.join()
+    
+    assert not mismatches
+    assert not os.path.exists(old.model_dir)
+    np.testing.assert_array_equal(score_texts(old, texts, 5)[0], expected[0])
+    
+    # The next load serves the newest version from its own directory
+    assert predictor.load_models()
+    assert predictor.metadata['version'] == 5
+    assert predictor._loaded.model_dir == current_model_dir(model_dir) == os.path.join(model_dir, 'v5')
+
+def test_watcher_reloads_on_publish(tmp_path, models):
+    model_dir = str(tmp_path)
+    save_model(*models[0], 'MultinomialNB', model_dir)
+    predictor = SymptomMLPredictor(model_dir)
+    predictor.load_models()
+    watcher = ModelWatcher(predictor)
+    watcher._seen = watcher.signature()
+    
+    # Files of a version that is not published yet are not watched
+    os.makedirs(os.path.join(model_dir, 'v2'))
+    assert not watcher.poll()
+    save_model(*models[1], 'MultinomialNB', model_dir)
+    assert watcher.poll()
+    assert predictor.metadata['version'] == 3
+
+def test_workers_score_the_generation_the_parent_loaded(tmp_path, models):
+    model_dir = str(tmp_path)
+    save_model(*models[0], 'MultinomialNB', model_dir)
+    predictor = SymptomMLPredictor(model_dir, cache_size=0, workers=1)
+    try:
+        assert predictor.load_models()
+        expected = score_texts(predictor._loaded, TEXTS, 3)
+        # Workers start lazily, after a newer version has been published
+        save_model(*models[1], 'MultinomialNB', model_dir)
+        predictions = predictor.get_top_predictions_batch(TEXTS, 3)
+        np.testing.assert_array_equal(predictions.indices, expected[0])
+        np.testing.assert_allclose(predictions.scores, expected[1])
+        assert predictor.pool.tasks == 1
+    finally:
+        predictor.close()
+
+def test_report_is_written_before_publishing(tmp_path, models):
+    model_dir = str(tmp_path)
+    save_model(*models[0], 'MultinomialNB', model_dir)
+    version_dir = save_model(*models[1], 'MultinomialNB', model_dir, publish=False)
+    assert current_model_dir(model_dir) != version_dir
+    
+    files = set(os.listdir(version_dir))
+    assert finish_version(version_dir, model_dir)
+    assert current_model_dir(model_dir) == version_dir
+    assert set(os.listdir(version_dir)) - files == {TRAINING_REPORT_FILENAME}
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.naive_bayes import MultinomialNB
+
+import train_simple_model
+from symptom_engine.model_selection import (SELECTION_METRICS, candidate_label, default_candidates,
+                                            evaluate_candidates, select_candidate, stratified_folds)
+
+def _result(label, accuracy, top5_accuracy, latency_ms):
+    return {'label': label, 'accuracy': accuracy, 'top5_accuracy': top5_accuracy, 'latency_ms': latency_ms}
+
+RESULTS = [
+    _result('precise', 0.80, 0.85, 0.9),
+    _result('broad', 0.75, 0.97, 0.3),
+    _result('fast', 0.60, 0.70, 0.05),
+    _result('precise_twin', 0.80, 0.85, 0.4)
+]
+
+def test_selection_metric_changes_the_choice():
+    # Equal accuracy goes to the lower latency
+    assert select_candidate(RESULTS, 'accuracy')['label'] == 'precise_twin'
+    assert select_candidate(RESULTS, 'top5_accuracy')['label'] == 'broad'
+
+def test_latency_budget_excludes_slower_candidates():
+    assert select_candidate(RESULTS, 'accuracy', latency_budget_ms=0.35)['label'] == 'broad'
+    assert select_candidate(RESULTS, 'accuracy', latency_budget_ms=0.1)['label'] == 'fast'
+    assert select_candidate(RESULTS, 'top5_accuracy', latency_budget_ms=0.1)['label'] == 'fast'
+    # Nothing within budget: the fastest candidate
+    assert select_candidate(RESULTS, 'accuracy', latency_budget_ms=0.01)['label'] == 'fast'
+    assert select_candidate([], 'accuracy') is None
+
+def test_rare_conditions_stay_in_training():
+    y = ['a'] * 6 + ['b'] * 6 + ['rare'] * 2
+    folds = stratified_folds(y, n_splits=3)
+    assert len(folds) == 3
+    for train, validation in folds:
+        assert {12, 13} <= set(train.tolist())
+        assert not set(train.tolist()) & set(validation.tolist())
+    assert sorted(np.concatenate([validation for _, validation in folds]).tolist()) == list(range(12))
+
+def test_evaluate_candidates_scores_every_candidate():
+    texts = [f"sign{i % 4} mark{i % 3} cond{i % 4}" for i in range(60)]
+    y = [f"Condition {i % 4}" for i in range(60)]
+    X = TfidfVectorizer().fit_transform(texts)
+    candidates = [('MultinomialNB', {'alpha': alpha}, MultinomialNB(alpha=alpha)) for alpha in (0.1, 1.0)]
+    results = evaluate_candidates(candidates, X, y, n_splits=3, n_jobs=1)
+    assert [result['label'] for result in results] == ['MultinomialNB(alpha=0.1)', 'MultinomialNB(alpha=1.0)']
+    for result in results:
+        assert result['folds'] == 3 and result['latency_ms'] > 0
+        for metric in SELECTION_METRICS:
+            assert result[metric] == 1.0
+
+@pytest.mark.parametrize("metric, budget, expected", [
+    ('accuracy', None, 'LogisticRegression'),
+    ('top5_accuracy', None, 'SGDClassifier'),
+    ('accuracy', 0.5, 'MultinomialNB')
+])
+def test_training_refits_the_selected_candidate(monkeypatch, metric, budget, expected):
+    # Fixed fold scores: logistic regression is most accurate, SGD has the
+    # best top-5 and naive Bayes is the only one within 0.5 ms
+    scores = {'MultinomialNB': (0.70, 0.90, 0.2), 'LogisticRegression': (0.85, 0.92, 2.0),
+              'SGDClassifier': (0.80, 0.99, 1.0)}
+    def evaluate(candidates, X, y, n_splits, n_jobs):
+        return [dict(_result(candidate_label(name, params), *scores[name]), name=name, params=params, index=index,
+                     fit_seconds=0.01)
+                for index, (name, params, _) in enumerate(candidates)]
+    monkeypatch.setattr(train_simple_model, 'evaluate_candidates', evaluate)
+    
+    texts = [f"sign{i % 4} mark{i % 3}" for i in range(40)]
+    y = [f"Condition {i % 4}" for i in range(40)]
+    X = TfidfVectorizer().fit_transform(texts)
+    model, name, selection = train_simple_model.train_models(X, y, metric, budget, n_jobs=1)
+    assert name == expected and type(model).__name__ == expected
+    assert selection['metric'] == metric and selection['selected'].startswith(expected)
+    assert len(selection['candidates']) == len(default_candidates())
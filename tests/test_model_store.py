@@ -0,0 +1,42 @@
+import hashlib
+import os
+
+from symptom_engine.model_store import (CURRENT_FILENAME, create_version_dir, current_model_dir, file_sha256,
+                                        publish_version, version_dirs)
+
+def test_flat_layout_without_pointer(tmp_path):
+    assert current_model_dir(str(tmp_path)) == str(tmp_path)
+    (tmp_path / CURRENT_FILENAME).write_text("../elsewhere\n")
+    assert current_model_dir(str(tmp_path)) == str(tmp_path)
+
+def test_publish_switches_pointer_and_prunes(tmp_path):
+    model_dir = str(tmp_path)
+    published = []
+    for _ in range(5):
+        version, path = create_version_dir(model_dir, previous_version=len(published))
+        # Unpublished directories are not visible to readers
+        assert current_model_dir(model_dir) == (published[-1] if published else model_dir)
+        publish_version(model_dir, path, keep=2)
+        published.append(path)
+        assert current_model_dir(model_dir) == path
+        assert version == len(published)
+    
+    assert [path for _, path in version_dirs(model_dir)] == published[-2:]
+    assert sorted(os.listdir(model_dir)) == [CURRENT_FILENAME, 'v4', 'v5']
+
+def test_failed_save_number_is_not_reused(tmp_path):
+    model_dir = str(tmp_path)
+    _, first = create_version_dir(model_dir)
+    publish_version(model_dir, first)
+    # A save that crashed before publishing left v2 behind
+    os.makedirs(os.path.join(model_dir, 'v2'))
+    version, path = create_version_dir(model_dir, previous_version=1)
+    assert version == 3 and os.path.basename(path) == 'v3'
+    assert current_model_dir(model_dir) == first
+
+def test_file_sha256_of_whole_file_and_prefix(tmp_path):
+    data = os.urandom(3 << 20)
+    path = tmp_path / "data.bin"
+    path.write_bytes(data)
+    assert file_sha256(str(path)) == hashlib.sha256(data).hexdigest()
+    assert file_sha256(str(path), 12345) == hashlib.sha256(data[:12345]).hexdigest()
@@ -0,0 +1,115 @@
+import os
+
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.naive_bayes import MultinomialNB
+
+from symptom_engine import numpy_scorer
+from symptom_engine.hashing import HashingTfidfVectorizer
+from symptom_engine.numpy_scorer import (SCORER_DIRNAME, WEIGHT_DTYPES, export_numpy_scorer, load_numpy_scorer,
+                                         quantize_rows)
+
+def _fit(texts, labels):
+    vectorizer = TfidfVectorizer().fit(texts)
+    return MultinomialNB().fit(vectorizer.transform(texts), labels), vectorizer
+
+def test_reexport_leaves_mapped_scorer_intact(tmp_path):
+    model, vectorizer = _fit(["fever cough", "rash itch", "fever chills"], ["Flu", "Dermatitis", "Flu"])
+    export_numpy_scorer(str(tmp_path), model, vectorizer, {'created_at': 'first'})
+    mapped = load_numpy_scorer(str(tmp_path))
+    expected = mapped['model'].predict_proba(mapped['vectorizer'].transform(["fever", "itch"]))
+    
+    other, other_vectorizer = _fit(["headache", "nausea", "headache nausea"], ["Migraine", "Migraine", "Gastritis"])
+    export_numpy_scorer(str(tmp_path), other, other_vectorizer, {'created_at': 'second'}, weights_dtype='int8')
+    
+    # The mapped arrays still hold the first model after the second export
+    np.testing.assert_array_equal(
+        mapped['model'].predict_proba(mapped['vectorizer'].transform(["fever", "itch"])), expected
+    )
+    assert load_numpy_scorer(str(tmp_path))['manifest']['metadata']['created_at'] == 'second'
+    assert os.listdir(tmp_path) == [SCORER_DIRNAME]
+
+MODELS = {
+    'nb': lambda: MultinomialNB(alpha=0.1),
+    'logistic': lambda: LogisticRegression(max_iter=500),
+    'sgd': lambda: SGDClassifier(loss='log_loss', random_state=0),
+}
+VECTORIZERS = {
+    'tfidf': lambda: TfidfVectorizer(ngram_range=(1, 2), stop_words='english', max_features=300),
+    'hashing': lambda: HashingTfidfVectorizer(n_features=2 ** 12),
+}
+
+@pytest.fixture(scope='module')
+def training_texts(severity_df):
+    return list(severity_df['symptom']), list(severity_df['condition'])
+
+@pytest.fixture(scope='module')
+def query_texts(queries):
+    # Batch with duplicates, an empty text, stop words only and unseen words
+    texts = [' '.join(query) for query in queries] + [' '.join(queries[0]), '', 'the and of', 'zzzz qqqq']
+    return texts + texts[:5]
+
+def _export(tmp_path, texts, labels, vectorizer_name, model_name, weights_dtype='float64'):
+    vectorizer = VECTORIZERS[vectorizer_name]().fit(texts)
+    model = MODELS[model_name]().fit(vectorizer.transform(texts), labels)
+    manifest = export_numpy_scorer(str(tmp_path), model, vectorizer, {}, weights_dtype=weights_dtype)
+    assert manifest is not None
+    return model, vectorizer, load_numpy_scorer(str(tmp_path))
+
+@pytest.mark.parametrize('vectorizer_name', sorted(VECTORIZERS))
+@pytest.mark.parametrize('model_name', sorted(MODELS))
+def test_scorer_matches_predict_proba(tmp_path, training_texts, query_texts, vectorizer_name, model_name):
+    model, vectorizer, scorer = _export(tmp_path, *training_texts, vectorizer_name, model_name)
+    expected = model.predict_proba(vectorizer.transform(query_texts))
+    
+    batch = scorer['model'].predict_proba(scorer['vectorizer'].transform(query_texts))
+    np.testing.assert_allclose(batch, expected, rtol=1e-9, atol=1e-12)
+    np.testing.assert_array_equal(scorer['model'].classes_, model.classes_)
+    # Scoring one text at a time gives the same rows as the batch
+    for text, row in zip(query_texts[:10], batch):
+        single = scorer['model'].predict_proba(scorer['vectorizer'].transform([text]))
+        np.testing.assert_allclose(single[0], row, rtol=1e-9, atol=1e-12)
+
+def test_scorer_matches_binary_predict_proba(tmp_path, training_texts, query_texts):
+    texts, labels = training_texts
+    binary = ['Condition 00000' if label == 'Condition 00000' else 'Other' for label in labels]
+    model, vectorizer, scorer = _export(tmp_path, texts, binary, 'tfidf', 'logistic')
+    assert scorer['manifest']['link'] == 'binary_logistic'
+    np.testing.assert_allclose(
+        scorer['model'].predict_proba(scorer['vectorizer'].transform(query_texts)),
+        model.predict_proba(vectorizer.transform(query_texts)),
+        rtol=1e-9, atol=1e-12
+    )
+
+@pytest.mark.parametrize('weights_dtype, max_error, min_agreement', [('float16', 5e-3, 0.98), ('int8', 2e-2, 0.9)])
+@pytest.mark.parametrize('vectorizer_name', sorted(VECTORIZERS))
+def test_quantized_scorer_stays_close(tmp_path, training_texts, query_texts, vectorizer_name,
+                                      weights_dtype, max_error, min_agreement):
+    model, vectorizer, scorer = _export(tmp_path, *training_texts, vectorizer_name, 'nb', weights_dtype)
+    assert scorer['model'].weights.dtype == np.dtype(weights_dtype)
+    expected = model.predict_proba(vectorizer.transform(query_texts))
+    
+    proba = scorer['model'].predict_proba(scorer['vectorizer'].transform(query_texts))
+    np.testing.assert_allclose(proba.sum(axis=1), 1.0)
+    assert np.abs(proba - expected).max() <= max_error
+    assert np.mean(proba.argmax(axis=1) == expected.argmax(axis=1)) >= min_agreement
+
+@pytest.mark.parametrize('weights_dtype', WEIGHT_DTYPES)
+def test_blockwise_export_matches_whole_array(tmp_path, monkeypatch, training_texts, weights_dtype):
+    vectorizer = VECTORIZERS['hashing']().fit(training_texts[0])
+    model = MODELS['nb']().fit(vectorizer.transform(training_texts[0]), training_texts[1])
+    # A few feature rows per block
+    monkeypatch.setattr(numpy_scorer, 'EXPORT_BLOCK_BYTES', 8 * len(model.classes_) * 7)
+    export_numpy_scorer(str(tmp_path), model, vectorizer, {}, weights_dtype=weights_dtype)
+    scorer = load_numpy_scorer(str(tmp_path))
+    
+    weights = model.feature_log_prob_.T
+    if weights_dtype == 'int8':
+        q, scale, offset = quantize_rows(weights)
+        np.testing.assert_array_equal(scorer['model'].weights, q)
+        np.testing.assert_array_equal(scorer['model'].scale, scale)
+        np.testing.assert_array_equal(scorer['model'].offset, offset)
+    else:
+        np.testing.assert_array_equal(scorer['model'].weights, weights.astype(weights_dtype))
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.naive_bayes import MultinomialNB
+
+from symptom_engine.ml_predictor import LoadedModel, SymptomMLPredictor, _parse_workers, score_texts
+
+@pytest.fixture(scope="module")
+def loaded():
+    # Every condition has the same prior, so unknown words tie across all classes
+    texts = [f"symptom{i} sign{i % 7}" for i in range(40)]
+    labels = [f"Condition {i % 20:02d}" for i in range(40)]
+    vectorizer = TfidfVectorizer().fit(texts)
+    model = MultinomialNB(alpha=0.1).fit(vectorizer.transform(texts), labels)
+    return LoadedModel(model, vectorizer, {}, "test")
+
+def _predictor(loaded):
+    predictor = SymptomMLPredictor(model_dir="unused")
+    predictor._loaded = loaded
+    return predictor
+
+def test_top_k_is_a_prefix_of_larger_top_k(loaded):
+    texts = ["symptom3 sign3", "unknown words", "sign2", ""]
+    wide_indices, wide_scores = score_texts(loaded, texts, 20)
+    for k in (1, 3, 5, 19):
+        indices, scores = score_texts(loaded, texts, k)
+        np.testing.assert_array_equal(indices, wide_indices[:, :k])
+        np.testing.assert_array_equal(scores, wide_scores[:, :k])
+    # Tied classes are ordered by class index
+    np.testing.assert_array_equal(wide_indices[1], np.arange(20))
+
+def test_top_predictions_do_not_depend_on_cache_or_batch(loaded):
+    texts = ["symptom3 sign3", "unknown words", "sign2", "symptom11"]
+    expected = {k: _predictor(loaded).get_top_predictions_batch(texts, k) for k in (2, 5)}
+    
+    # Warm the cache with a larger top_k, then with a smaller one
+    predictor = _predictor(loaded)
+    predictor.get_top_predictions_batch(texts[:2], 10)
+    predictor.get_top_predictions_batch(texts[2:], 1)
+    for k in (2, 5):
+        predictions = predictor.get_top_predictions_batch(texts, k)
+        np.testing.assert_array_equal(predictions.indices, expected[k].indices)
+        np.testing.assert_array_equal(predictions.scores, expected[k].scores)
+        assert predictions.indices.shape == (len(texts), k)
+    # Rows scored with top_k 10 answer smaller top_k from the cache
+    assert predictor.cache.hits > 0
+
+@pytest.mark.parametrize("value, expected", [(None, 0), ('', 0), ('0', 0), ('4', 4), (' 2 ', 2), ('-3', 0), ('auto', 0), ('1.5', 0)])
+def test_worker_count_from_environment(value, expected):
+    assert _parse_workers(value) == expected
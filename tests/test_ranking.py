@@ -0,0 +1,44 @@
+import pandas as pd
+import pytest
+
+from symptom_engine import find_symptom_matches, find_symptom_matches_batch, get_combined_conditions, get_symptom_index
+from symptom_engine import index as index_module
+from tests import baseline
+
+def test_indexed_ranking_uses_first_matched_severity(severity_df, queries):
+    index = get_symptom_index(severity_df)
+    for query in queries:
+        matches = baseline.find_symptom_matches(query, severity_df)
+        expected = baseline.get_combined_conditions(matches)
+        assert get_combined_conditions(matches, index) == expected
+        assert get_combined_conditions(matches) == expected
+
+def test_batch_ranking_uses_first_matched_severity(severity_df, queries):
+    index = get_symptom_index(severity_df)
+    results = find_symptom_matches_batch(queries, severity_df, index)
+    for query, (_, ranking) in zip(queries, results):
+        expected = baseline.get_combined_conditions(baseline.find_symptom_matches(query, severity_df))
+        assert ranking == expected
+
+def test_ranking_prefers_severity_of_earlier_match():
+    df = pd.DataFrame({
+        'symptom': ['rash', 'itch', 'rash itch'],
+        'condition': ['Dermatitis', 'Dermatitis', 'Hives'],
+        'severity': ['Low', 'Critical', 'Medium']
+    })
+    index = get_symptom_index(df)
+    matches = find_symptom_matches(['itch'], df, index)
+    assert get_combined_conditions(matches, index) == baseline.get_combined_conditions(
+        baseline.find_symptom_matches(['itch'], df)
+    )
+    assert get_combined_conditions(matches, index)[0] == ('Dermatitis', 1, 'Critical')
+
+@pytest.mark.parametrize("small_ranking", [0, 10**9])
+def test_row_and_dict_ranking_agree(monkeypatch, severity_df, queries, small_ranking):
+    # Either side of the small-input cutoff gives the original ranking
+    monkeypatch.setattr(index_module, 'SMALL_RANKING', small_ranking)
+    index = get_symptom_index(severity_df)
+    for query in queries:
+        matches = find_symptom_matches(query, severity_df, index)
+        expected = baseline.get_combined_conditions(baseline.find_symptom_matches(query, severity_df))
+        assert get_combined_conditions(matches, index) == expected
@@ -0,0 +1,51 @@
+import asyncio
+import json
+
+import pytest
+
+from symptom_engine.ml_predictor import SymptomMLPredictor
+from symptom_engine.server import MAX_BODY_BYTES, InferenceServer, parse_content_length
+
+@pytest.mark.parametrize("value, expected", [
+    (None, 0), ('', 0), ('0', 0), ('17', 17),
+    ('-1', None), ('+5', None), ('abc', None), ('1_000', None), (' 5', None), ('١٢', None)
+])
+def test_parse_content_length(value, expected):
+    assert parse_content_length(value) == expected
+
+def _exchange(tmp_path, request: bytes):
+    """Status code and JSON body the server sends back for one raw request"""
+    async def run():
+        server = InferenceServer(SymptomMLPredictor(model_dir=str(tmp_path)), port=0)
+        await server.start()
+        try:
+            reader, writer = await asyncio.open_connection(server.host, server.port)
+            writer.write(request)
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+        finally:
+            await server.stop()
+        head, _, body = response.partition(b'\r\n\r\n')
+        return int(head.split(b' ')[1]), json.loads(body)
+    return asyncio.run(run())
+
+@pytest.mark.parametrize("length", ['abc', '-5', '12, 12'])
+def test_invalid_content_length_is_rejected(tmp_path, length):
+    status, payload = _exchange(tmp_path, f"POST /top HTTP/1.1\r\nContent-Length: {length}\r\n\r\n".encode())
+    assert status == 400
+    assert payload == {"error": "Invalid Content-Length"}
+
+def test_oversized_body_is_rejected(tmp_path):
+    status, payload = _exchange(tmp_path, f"POST /top HTTP/1.1\r\nContent-Length: {MAX_BODY_BYTES + 1}\r\n\r\n".encode())
+    assert status == 413
+
+@pytest.mark.parametrize("path", ['/predict', '/top'])
+@pytest.mark.parametrize("body", [b'[1, 2]', b'"abc"', b'3', b'null'])
+def test_non_object_body_is_rejected(tmp_path, path, body):
+    predictor = SymptomMLPredictor(model_dir=str(tmp_path))
+    predictor.is_available = lambda: True
+    server = InferenceServer(predictor, port=0)
+    status, payload = asyncio.run(server._route('POST', path, body))
+    assert status == 400
+    assert payload == {"error": "Body must be a JSON object"}
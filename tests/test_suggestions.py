@@ -0,0 +1,112 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import make_queries, make_symptoms
+from symptom_engine import index as index_module
+from symptom_engine.index import SymptomIndex, TrigramIndex, edit_distance, trigrams
+from symptom_engine.preprocessing import normalize_symptom
+
+def reference_edit_distance(a, b):
+    """Optimal string alignment distance by the full dynamic program"""
+    rows = [[i + j if i * j == 0 else 0 for j in range(len(b) + 1)] for i in range(len(a) + 1)]
+    for i in range(1, len(a) + 1):
+        for j in range(1, len(b) + 1):
+            rows[i][j] = min(rows[i - 1][j] + 1, rows[i][j - 1] + 1, rows[i - 1][j - 1] + (a[i - 1] != b[j - 1]))
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                rows[i][j] = min(rows[i][j], rows[i - 2][j - 2] + 1)
+    return rows[-1][-1]
+
+def reference_search(strings, text, top_k, min_similarity):
+    """Score every string: the top_k * 2 by trigram Dice, earlier strings
+    first on ties, ranked by edit distance"""
+    grams = trigrams(text)
+    overlaps = []
+    for string_id, candidate in enumerate(strings):
+        candidate_grams = trigrams(candidate)
+        dice = 2 * len(grams & candidate_grams) / (len(grams) + len(candidate_grams))
+        if grams & candidate_grams and dice >= min_similarity:
+            overlaps.append((-dice, string_id))
+    scored = []
+    for negative_dice, string_id in sorted(overlaps)[:top_k * 2]:
+        longest = max(len(text), len(strings[string_id]), 1)
+        score = 1 - reference_edit_distance(text, strings[string_id]) / longest
+        scored.append((-score, negative_dice, string_id))
+    return [(string_id, -negative_score) for negative_score, _, string_id in sorted(scored)[:top_k]]
+
+@pytest.fixture(scope='module')
+def vocabulary():
+    return make_symptoms(3000, seed=2)
+
+@pytest.fixture(scope='module')
+def typo_queries(vocabulary):
+    queries = make_queries(pd.DataFrame({'symptom': vocabulary}), 60, symptoms_per_query=1, seed=4)
+    return [normalize_symptom(query[0]) for query in queries] + ['headahce', 'x', 'zzzzzz', 'a b c', '']
+
+def test_edit_distance_equals_dynamic_program():
+    rng = np.random.default_rng(0)
+    for _ in range(3000):
+        a, b = (''.join(rng.choice(list('abc '), size=rng.integers(0, 12))) for _ in range(2))
+        expected = reference_edit_distance(a, b)
+        assert edit_distance(a, b) == expected
+        for max_distance in range(4):
+            assert edit_distance(a, b, max_distance) == min(expected, max_distance + 1)
+
+@pytest.mark.parametrize('top_k, min_similarity', [(5, 0.3), (1, 0.3), (3, 0.6)])
+def test_search_equals_brute_force(vocabulary, typo_queries, top_k, min_similarity):
+    index = TrigramIndex(vocabulary)
+    # Both id lists and dense rows are in use
+    assert index.postings and index.dense_rows and index.gram_sets is None
+    for query in typo_queries:
+        expected = reference_search(vocabulary, query, top_k, min_similarity)
+        results = index.search(query, top_k, min_similarity)
+        assert [string_id for string_id, _ in results] == [string_id for string_id, _ in expected]
+        assert np.allclose([score for _, score in results], [score for _, score in expected])
+
+def test_small_index_search_equals_brute_force(monkeypatch, vocabulary, typo_queries):
+    strings = vocabulary[:150]
+    monkeypatch.setattr(index_module, 'SMALL_SEARCH', 0)
+    numpy_index = TrigramIndex(strings)
+    monkeypatch.undo()
+    index = TrigramIndex(strings)
+    assert index.gram_sets is not None and numpy_index.gram_sets is None
+    for query in typo_queries:
+        results = index.search(query, 5)
+        expected = reference_search(strings, query, 5, 0.3)
+        assert [string_id for string_id, _ in results] == [string_id for string_id, _ in expected]
+        # Either side of the small-input cutoff finds the same suggestions
+        texts = [query] + [word for word in query.split() if len(word) > 2]
+        assert numpy_index.search_many(texts, 5) == index.search_many(texts, 5)
+
+def test_search_breaks_overlap_ties_by_string_order():
+    strings = ['cough d', 'cough c', 'cough b', 'cough a']
+    assert TrigramIndex(strings).search('cough x', top_k=1) == reference_search(strings, 'cough x', 1, 0.3)
+    assert TrigramIndex(strings).search('cough x', top_k=1)[0][0] == 0
+
+def test_search_many_is_as_good_as_searching_each_text(vocabulary, typo_queries):
+    index = TrigramIndex(vocabulary)
+    phrases = [query for query in typo_queries if len(query.split()) > 1]
+    assert phrases
+    for phrase in phrases:
+        texts = [phrase] + [word for word in phrase.split() if len(word) > 2]
+        merged = {}
+        for text in texts:
+            for string_id, score in reference_search(vocabulary, text, 5, 0.3):
+                merged[string_id] = max(score, merged.get(string_id, -1.0))
+        results = index.search_many(texts, 5, 0.3)
+        # Every score is a real score against one of the texts, and the
+        # shared candidate pass misses none of the separate searches' best
+        for string_id, score in results:
+            assert any(np.isclose(score, 1 - reference_edit_distance(text, vocabulary[string_id]) /
+                                  max(len(text), len(vocabulary[string_id]), 1)) for text in texts)
+        expected = sorted(merged.values(), reverse=True)[:5]
+        assert len(results) == len(expected)
+        assert all(score >= other - 1e-9 for (_, score), other in zip(results, expected))
+
+def test_suggest_finds_a_misspelled_word_inside_a_phrase():
+    symptoms = ['headache', 'chest pain', 'persistent dry cough with fever', 'skin rash']
+    index = SymptomIndex(symptoms, ['Migraine', 'Angina', 'Flu', 'Eczema'], ['Moderate'] * 4)
+    suggestions = dict(index.suggest('severe headahce at night', top_k=3))
+    # One transposition in eight characters
+    assert suggestions['headache'] == 1 - 1 / 8
+    assert index.fuzzy.search_many(['headahce'], 3) == index.fuzzy.search('headahce', 3)
@@ -0,0 +1,135 @@
+import os
+import shutil
+import sys
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.naive_bayes import MultinomialNB
+
+import train_simple_model
+from symptom_engine.ml_predictor import SymptomMLPredictor
+from symptom_engine.model_store import current_version_name
+from symptom_engine.preprocessing import normalize_symptom
+from tests import baseline
+from train_simple_model import (build_vectorizer, condition_pair_indices, create_training_data, dataset_watermark,
+                                save_model, update_model)
+
+SYMPTOMS_CSV = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'symptoms.csv')
+
+def _pairs_by_condition(conditions, first, second):
+    """Kept (first, second) row pairs of each condition, in output order"""
+    pairs = {}
+    for i, j in zip(first.tolist(), second.tolist()):
+        assert conditions[i] == conditions[j] and i < j
+        pairs.setdefault(conditions[i], []).append((i, j))
+    return pairs
+
+def _all_pairs(conditions):
+    rows = {}
+    for row, condition in enumerate(conditions):
+        rows.setdefault(condition, []).append(row)
+    return {condition: [(a, b) for k, a in enumerate(ids) for b in ids[k + 1:]]
+            for condition, ids in rows.items() if len(ids) > 1}
+
+def test_training_data_equals_nested_loops(severity_df, tmp_path):
+    path = tmp_path / "symptoms.csv"
+    severity_df.to_csv(path, index=False)
+    # Rows normalized as training normalizes them, then expanded by the original loops
+    df = pd.read_csv(path)
+    df['symptom'] = df['symptom'].map(normalize_symptom)
+    df['condition'] = df['condition'].str.strip()
+    expected = baseline.expand_training_data(df)
+    expanded = create_training_data(str(path))
+    assert expanded['text'].tolist() == expected['text'].tolist()
+    assert expanded['condition'].tolist() == expected['condition'].tolist()
+
+@pytest.mark.parametrize("size", [2, 3, 1000, 2001])
+def test_pair_ranks_invert_exactly_in_large_groups(size):
+    # Pair ranks run up to ~2M here, where float sqrt rounding would show
+    conditions = ['big'] * size + ['single', 'pair', 'pair']
+    first, second = condition_pair_indices(pd.Series(conditions))
+    i, j = np.triu_indices(size, 1)
+    assert np.array_equal(first[:len(i)], i) and np.array_equal(second[:len(j)], j)
+    assert first[len(i):].tolist() == [size + 1] and second[len(j):].tolist() == [size + 2]
+
+def test_pair_cap_keeps_distinct_pairs_of_each_condition(severity_df):
+    conditions = severity_df['condition'].tolist()
+    everything = _all_pairs(conditions)
+    first, second = condition_pair_indices(severity_df['condition'], max_pairs_per_condition=5)
+    kept = _pairs_by_condition(conditions, first, second)
+    assert set(kept) == set(everything)
+    for condition, pairs in kept.items():
+        assert len(pairs) == min(5, len(everything[condition]))
+        assert pairs == sorted(set(pairs)) and set(pairs) <= set(everything[condition])
+
+@pytest.mark.parametrize("rate", [0.0, 0.25, 0.5, 1.0])
+def test_pair_sample_rate_keeps_that_fraction(severity_df, rate):
+    conditions = severity_df['condition'].tolist()
+    everything = _all_pairs(conditions)
+    first, second = condition_pair_indices(severity_df['condition'], pair_sample_rate=rate, seed=7)
+    kept = _pairs_by_condition(conditions, first, second)
+    for condition, pairs in everything.items():
+        sampled = kept.get(condition, [])
+        assert len(sampled) == round(len(pairs) * rate)
+        assert sampled == sorted(set(sampled)) and set(sampled) <= set(pairs)
+    again = condition_pair_indices(severity_df['condition'], pair_sample_rate=rate, seed=7)
+    assert np.array_equal(first, again[0]) and np.array_equal(second, again[1])
+
+def _train(monkeypatch, tmp_path, *options):
+    """Run the training CLI in tmp_path; returns the published model directory"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, 'argv', ['train_simple_model.py', '--feature-cache-dir', '', *options])
+    train_simple_model.main()
+    return str(tmp_path / 'models')
+
+@pytest.mark.parametrize("streaming_model", ['MultinomialNB', 'SGDClassifier'])
+def test_streaming_training_publishes_a_servable_model(monkeypatch, tmp_path, streaming_model):
+    shutil.copy(SYMPTOMS_CSV, tmp_path / 'symptoms.csv')
+    model_dir = _train(monkeypatch, tmp_path, '--streaming', '--streaming-model', streaming_model,
+                       '--chunk-size', '40', '--epochs', '2', '--n-features', '4096')
+    assert current_version_name(model_dir) == 'v1'
+    
+    predictor = SymptomMLPredictor(model_dir=model_dir)
+    assert predictor.load_models()
+    assert predictor._loaded.metadata['streaming']
+    assert predictor.get_model_info()['model_type'] == streaming_model
+    conditions = set(pd.read_csv(SYMPTOMS_CSV)['condition'].str.strip())
+    top = predictor.get_top_predictions("fever cough", 3)
+    assert len(top) == 3 and all(condition in conditions for condition, _ in top)
+    predictions = predictor.predict_multiple_symptoms(['fever', 'headache'])
+    assert predictions and all(prediction['condition'] in conditions for prediction in predictions)
+
+def _retrained(data_path, vectorizer, **pair_options):
+    df = create_training_data(data_path, **pair_options)
+    return MultinomialNB().fit(vectorizer.transform(df['text']), df['condition'])
+
+@pytest.mark.parametrize("pair_options", [{}, {'max_pairs_per_condition': 40}, {'pair_sample_rate': 0.5}])
+def test_naive_bayes_update_matches_a_full_retrain(severity_df, tmp_path, pair_options):
+    data_path = str(tmp_path / 'symptoms.csv')
+    model_dir = str(tmp_path / 'models')
+    old, new = severity_df.iloc[:450], severity_df.iloc[450:].copy()
+    new.loc[new.index[::3], 'condition'] = 'Condition new'
+    combined = pd.concat([old, new])
+    # One vocabulary for both, so the update knows every term of the new rows
+    combined[['symptom', 'condition']].to_csv(data_path, index=False)
+    vectorizer = build_vectorizer('tfidf').fit(create_training_data(data_path)['text'])
+    
+    old[['symptom', 'condition']].to_csv(data_path, index=False)
+    metadata = {'data': dataset_watermark(data_path), 'pairs': dict(pair_options, seed=42)}
+    save_model(_retrained(data_path, vectorizer, **pair_options), vectorizer, 'MultinomialNB', model_dir,
+               extra_metadata=metadata)
+    combined[['symptom', 'condition']].to_csv(data_path, index=False)
+    updated = joblib.load(os.path.join(update_model(data_path, model_dir), 'symptom_model.pkl'))
+    
+    retrained = _retrained(data_path, vectorizer, **pair_options)
+    assert 'Condition new' in updated.classes_
+    assert list(updated.classes_) == list(retrained.classes_)
+    assert np.array_equal(updated.class_count_, retrained.class_count_)
+    X = vectorizer.transform(["fever cough", "headache", "rash itching", "chest pain fatigue"])
+    if not pair_options:
+        # Sampled options draw other pairs than a retrain, only as many of them
+        assert np.allclose(updated.feature_count_, retrained.feature_count_)
+        assert np.allclose(updated.predict_proba(X), retrained.predict_proba(X))
+    assert np.all(np.isfinite(updated.predict_log_proba(X)))
@@ -8,140 +8,544 @@ import pandas as pd
 import numpy as np
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.naive_bayes import MultinomialNB
-from sklearn.linear_model import LogisticRegression
-from sklearn.metrics import accuracy_score
+from sklearn.linear_model import SGDClassifier
+from sklearn.base import clone
+import argparse
+import io
 import joblib
+import json
 import os
-from collections import defaultdict
+import time
 
-def create_training_data():
-    """Load and prepare training data"""
+from symptom_engine.feature_cache import FEATURE_CACHE_DIR, feature_cache_key, load_features, save_features
+from symptom_engine.hashing import HASHING_N_FEATURES, HashingTfidfVectorizer
+from symptom_engine.model_bundle import write_model_bundle
+from symptom_engine.model_store import CURRENT_FILENAME, create_version_dir, current_model_dir, file_sha256, publish_version
+from symptom_engine.model_selection import (N_SPLITS, SELECTION_METRICS, default_candidates,
+                                            evaluate_candidates, select_candidate)
+from symptom_engine.numpy_scorer import WEIGHT_DTYPES, export_numpy_scorer
+from symptom_engine.preprocessing import normalize_symptom
+from symptom_engine.tracing import get_profiler, profile_stage
+
+TRAINING_REPORT_FILENAME = 'training_report.json'
+
+def kept_pair_counts(sizes, max_pairs_per_condition=None, pair_sample_rate=1.0):
+    """Symptom pairs kept for conditions with sizes rows each, out of all i < j pairs"""
+    available = sizes * (sizes - 1) // 2
+    kept = available
+    if pair_sample_rate < 1.0:
+        kept = np.round(available * pair_sample_rate).astype(np.int64)
+    if max_pairs_per_condition is not None:
+        kept = np.minimum(kept, max_pairs_per_condition)
+    return kept
+
+def condition_pair_indices(conditions, max_pairs_per_condition=None, pair_sample_rate=1.0, seed=42):
+    """Row indices (first, second) of symptom pairs that share a condition.
+    
+    Pairs are the i < j combinations of each condition's rows, conditions in
+    order of first appearance and pairs in row order. pair_sample_rate keeps
+    that fraction of each condition's pairs and max_pairs_per_condition caps
+    them; either way the kept pairs are drawn at random and the full set is
+    never materialized.
+    """
+    codes, _ = pd.factorize(conditions)
+    # Rows grouped by condition, original order kept within each group
+    order = np.argsort(codes, kind='stable')
+    sizes = np.bincount(codes).astype(np.int64)
+    group_starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    
+    available = sizes * (sizes - 1) // 2
+    kept = kept_pair_counts(sizes, max_pairs_per_condition, pair_sample_rate)
+    
+    # Rank of each kept pair within its condition's row-major i < j ordering
+    offsets = np.cumsum(kept) - kept
+    group_of_pair = np.repeat(np.arange(len(sizes)), kept)
+    ranks = np.arange(kept.sum()) - np.repeat(offsets, kept)
+    rng = np.random.default_rng(seed)
+    for group in np.flatnonzero(kept < available):
+        sampled = rng.choice(available[group], size=kept[group], replace=False)
+        ranks[offsets[group]:offsets[group] + kept[group]] = np.sort(sampled)
+    
+    # Invert rank -> (i, j): row i's pairs start at i * (2n - i - 1) / 2
+    n = sizes[group_of_pair]
+    b = 2 * n - 1
+    i = ((b - np.sqrt(b * b - 8 * ranks)) // 2).astype(np.int64)
+    # Correct any floating point off-by-one
+    i -= (i * (b - i) // 2) > ranks
+    i += ((i + 1) * (b - i - 1) // 2) <= ranks
+    j = ranks - i * (b - i) // 2 + i + 1
+    
+    starts = group_starts[group_of_pair]
+    return order[starts + i], order[starts + j]
+
+def create_training_data(data_path='symptoms.csv', max_pairs_per_condition=None, pair_sample_rate=1.0, seed=42):
+    """Load and prepare training data.
+    
+    Each row becomes one example, plus one combined example per pair of
+    symptoms sharing a condition (see condition_pair_indices for the cap
+    and sampling options).
+    """
     print("📊 Loading and preparing data...")
     
     # Load dataset
-    df = pd.read_csv('symptoms.csv')
-    df['symptom'] = df['symptom'].str.lower().str.strip()
-    df['condition'] = df['condition'].str.strip()
+    with profile_stage('load') as stage:
+        df = pd.read_csv(data_path)
+        # Same normalization the app applies to user input at prediction time
+        df['symptom'] = df['symptom'].map(normalize_symptom)
+        df['condition'] = df['condition'].str.strip()
+        stage['rows'] = len(df)
     
     print(f"   Total records: {len(df)}")
     print(f"   Unique symptoms: {df['symptom'].nunique()}")
     print(f"   Unique conditions: {df['condition'].nunique()}")
     
-    # Create expanded training data by using each symptom-condition pair
-    # and also creating combinations
-    expanded_data = []
-    
-    # Add original data
-    for _, row in df.iterrows():
-        expanded_data.append({
-            'text': row['symptom'],
-            'condition': row['condition']
+    # Multi-symptom examples from symptoms of the same condition
+    with profile_stage('expand') as stage:
+        first, second = condition_pair_indices(df['condition'], max_pairs_per_condition, pair_sample_rate, seed)
+        symptoms = df['symptom'].to_numpy(dtype=object)
+        conditions = df['condition'].to_numpy(dtype=object)
+        
+        expanded_df = pd.DataFrame({
+            'text': np.concatenate([symptoms, symptoms[first] + " " + symptoms[second]]),
+            'condition': np.concatenate([conditions, conditions[first]])
         })
-    
-    # Create some multi-symptom examples from related conditions
-    condition_symptoms = defaultdict(list)
-    for _, row in df.iterrows():
-        condition_symptoms[row['condition']].append(row['symptom'])
-    
-    # For conditions with multiple symptoms, create combined examples
-    for condition, symptoms in condition_symptoms.items():
-        if len(symptoms) > 1:
-            # Create combinations of 2 symptoms
-            for i in range(len(symptoms)):
-                for j in range(i+1, len(symptoms)):
-                    combined = f"{symptoms[i]} {symptoms[j]}"
-                    expanded_data.append({
-                        'text': combined,
-                        'condition': condition
-                    })
-    
-    expanded_df = pd.DataFrame(expanded_data)
-    print(f"   Expanded to {len(expanded_df)} training examples")
+        stage['examples'] = len(expanded_df)
+    print(f"   Expanded to {len(expanded_df)} training examples ({len(first)} symptom pairs)")
     
     return expanded_df
 
-def train_models(df):
-    """Train lightweight models"""
-    print("\n🤖 Training models...")
+def build_vectorizer(featurizer='tfidf', n_features=HASHING_N_FEATURES):
+    """Create the text vectorizer used for training.
+    
+    'tfidf' keeps a vocabulary capped at 500 features; 'hashing' hashes every
+    n-gram into n_features columns, so memory is fixed by the hash space.
+    """
+    if featurizer == 'hashing':
+        return HashingTfidfVectorizer(
+            n_features=n_features,
+            ngram_range=(1, 2),
+            stop_words='english'
+        )
     
-    # Prepare features
-    vectorizer = TfidfVectorizer(
+    return TfidfVectorizer(
         lowercase=True,
         ngram_range=(1, 2),
         max_features=500,  # Reduced for speed
         min_df=1,
         stop_words='english'
     )
+
+def build_features(data_path='symptoms.csv', featurizer='tfidf', n_features=HASHING_N_FEATURES,
+                   max_pairs_per_condition=None, pair_sample_rate=1.0, seed=42,
+                   dataset_sha256=None, cache_dir=FEATURE_CACHE_DIR):
+    """Fitted vectorizer, feature matrix and labels for the expanded dataset.
     
-    X = vectorizer.fit_transform(df['text'])
-    y = df['condition']
+    With a dataset_sha256 and cache_dir, features are looked up in the
+    feature cache first and stored there after a miss; a hit skips loading,
+    expansion and vectorization entirely.
+    """
+    vectorizer = build_vectorizer(featurizer, n_features)
+    key = None
+    if dataset_sha256 and cache_dir:
+        options = {'max_pairs_per_condition': max_pairs_per_condition,
+                   'pair_sample_rate': pair_sample_rate, 'seed': seed}
+        key = feature_cache_key(dataset_sha256, vectorizer, options)
+        with profile_stage('feature_cache') as stage:
+            cached = load_features(key, cache_dir)
+            stage['hit'] = cached is not None
+        if cached is not None:
+            vectorizer, X, y = cached
+            print(f"⚡ Feature cache hit ({key[:12]}): {X.shape[0]} examples x {X.shape[1]} features")
+            return vectorizer, X, y
+        print(f"🗂️ Feature cache miss ({key[:12]})")
     
+    df = create_training_data(data_path, max_pairs_per_condition, pair_sample_rate, seed)
+    with profile_stage('vectorize') as stage:
+        X = vectorizer.fit_transform(df['text'])
+        y = df['condition'].to_numpy(dtype=object)
+        stage['features'] = X.shape[1]
     print(f"   Features created: {X.shape[1]}")
     
-    # Train models
-    models = {
-        'MultinomialNB': MultinomialNB(alpha=0.1),
-        'LogisticRegression': LogisticRegression(max_iter=1000, C=0.1, random_state=42)
+    if key is not None:
+        with profile_stage('cache_features'):
+            save_features(key, vectorizer, X, y, cache_dir)
+        print(f"   Saved features to {cache_dir}")
+    return vectorizer, X, y
+
+def train_models(X, y, metric='accuracy', latency_budget_ms=None, n_jobs=-1, n_splits=N_SPLITS):
+    """Select a model on held-out folds, then refit it on all data.
+    
+    Candidates from default_candidates() are fitted in parallel and scored
+    on stratified folds; the winner maximizes metric among candidates whose
+    single-row latency is within latency_budget_ms.
+    """
+    print("\n🤖 Training models...")
+    
+    candidates = default_candidates()
+    print(f"   Evaluating {len(candidates)} candidates on {n_splits} held-out folds...")
+    with profile_stage('select') as stage:
+        results = evaluate_candidates(candidates, X, y, n_splits, n_jobs)
+        stage['candidate_fit_seconds'] = {result['label']: result['fit_seconds'] for result in results}
+    
+    for result in sorted(results, key=lambda r: -r[metric]):
+        print(f"   {result['label']}: accuracy {result['accuracy']:.3f}, top-5 {result['top5_accuracy']:.3f}, "
+              f"fit {result['fit_seconds']:.2f}s, latency {result['latency_ms']:.2f} ms")
+    
+    best = select_candidate(results, metric, latency_budget_ms)
+    if best is None:
+        best_model_name, estimator = 'MultinomialNB', MultinomialNB(alpha=0.1)
+        print(f"   Falling back to {best_model_name} without validation")
+    else:
+        best_model_name, _, estimator = candidates[best['index']]
+    
+    selection = {
+        'metric': metric,
+        'latency_budget_ms': latency_budget_ms,
+        'n_splits': n_splits,
+        'selected': best['label'] if best else None,
+        'candidates': results
     }
     
-    best_model = None
-    best_model_name = ""
-    best_score = 0
+    try:
+        with profile_stage('fit') as stage:
+            stage['model'] = best['label'] if best else best_model_name
+            best_model = clone(estimator).fit(X, y)
+    except Exception as e:
+        print(f"   Error training {best_model_name}: {str(e)}")
+        return None, best_model_name, selection
     
-    for name, model in models.items():
-        print(f"   Training {name}...")
-        
-        try:
-            # Train on all data since dataset is small
-            model.fit(X, y)
-            
-            # Evaluate on training data (best we can do with sparse data)
-            y_pred = model.predict(X)
-            accuracy = accuracy_score(y, y_pred)
-            
-            print(f"   {name} training accuracy: {accuracy:.3f}")
+    if best is not None:
+        print(f"\n🏆 Best model: {best['label']} ({metric}: {best[metric]:.3f}, latency {best['latency_ms']:.2f} ms)")
+    
+    return best_model, best_model_name, selection
+
+STREAM_CHUNK_SIZE = 50_000
+STREAM_BATCH_SIZE = 20_000
+STREAM_MAX_PARTNERS = 100
+
+def iter_training_batches(data_path='symptoms.csv', chunk_size=STREAM_CHUNK_SIZE,
+                          batch_size=STREAM_BATCH_SIZE, max_partners=STREAM_MAX_PARTNERS):
+    """Stream (texts, conditions) training batches from a CSV without loading it whole.
+    
+    Rows are read chunk_size at a time. Every row is one example, and it is
+    also paired with earlier symptoms of the same condition, up to
+    max_partners of them. With max_partners=None this yields exactly
+    create_training_data's examples, in a different order. Memory is bounded
+    by the chunk, the batch and max_partners symptoms per condition.
+    """
+    partners = {}
+    texts, conditions = [], []
+    
+    for chunk in pd.read_csv(data_path, chunksize=chunk_size):
+        symptoms = chunk['symptom'].map(normalize_symptom)
+        for symptom, condition in zip(symptoms, chunk['condition'].str.strip()):
+            seen = partners.setdefault(condition, [])
+            texts.append(symptom)
+            texts.extend(f"{partner} {symptom}" for partner in seen)
+            conditions.extend([condition] * (len(seen) + 1))
+            if max_partners is None or len(seen) < max_partners:
+                seen.append(symptom)
             
-            if accuracy > best_score:
-                best_score = accuracy
-                best_model = model
-                best_model_name = name
+            if len(texts) >= batch_size:
+                yield texts, conditions
+                texts, conditions = [], []
+    
+    if texts:
+        yield texts, conditions
+
+def train_streaming(data_path='symptoms.csv', model_name='MultinomialNB', epochs=1,
+                    chunk_size=STREAM_CHUNK_SIZE, batch_size=STREAM_BATCH_SIZE,
+                    max_partners=STREAM_MAX_PARTNERS, n_features=HASHING_N_FEATURES, seed=42):
+    """Out-of-core training with partial_fit over streamed batches.
+    
+    A first pass accumulates idf and the set of conditions; each epoch then
+    featurizes batch by batch and updates the model with partial_fit. Uses
+    the hashing featurizer, so no vocabulary has to be held in memory.
+    
+    Streaming bounds the memory used for the data, not for the model:
+    MultinomialNB keeps feature counts and log probabilities, and
+    SGDClassifier keeps coefficients, each n_features x n_classes float64
+    (2^16 features x 1000 conditions is 512 MB per array). Lower
+    --n-features for datasets with many conditions.
+    """
+    print(f"\n🌊 Streaming training ({model_name}, {epochs} epoch(s))...")
+    start = time.perf_counter()
+    batches = lambda: iter_training_batches(data_path, chunk_size, batch_size, max_partners)
+    
+    vectorizer = build_vectorizer('hashing', n_features)
+    classes = set()
+    with profile_stage('idf_pass') as stage:
+        for texts, conditions in batches():
+            vectorizer.partial_fit(texts)
+            classes.update(conditions)
+        classes = np.array(sorted(classes), dtype=object)
+        stage['examples'] = vectorizer.n_documents_
+    print(f"   idf pass: {vectorizer.n_documents_} examples, {len(classes)} conditions "
+          f"({time.perf_counter() - start:.1f}s)")
+    
+    if model_name == 'SGDClassifier':
+        model = SGDClassifier(loss='log_loss', alpha=1e-5, random_state=seed)
+    else:
+        model_name = 'MultinomialNB'
+        model = MultinomialNB(alpha=0.1)
+    
+    rng = np.random.default_rng(seed)
+    for epoch in range(epochs):
+        correct = seen = 0
+        with profile_stage(f'fit_epoch_{epoch + 1}') as stage:
+            stage['model'] = model_name
+            for texts, conditions in batches():
+                order = rng.permutation(len(texts))
+                X = vectorizer.transform([texts[i] for i in order])
+                y = np.asarray(conditions, dtype=object)[order]
                 
-        except Exception as e:
-            print(f"   Error training {name}: {str(e)}")
+                # Progressive validation: score each batch before learning from it
+                if hasattr(model, 'classes_'):
+                    correct += int((model.predict(X) == y).sum())
+                    seen += len(y)
+                model.partial_fit(X, y, classes=classes)
+        
+        accuracy = f"{correct / seen:.3f}" if seen else "n/a"
+        print(f"   Epoch {epoch + 1}: progressive accuracy {accuracy} ({time.perf_counter() - start:.1f}s)")
+    
+    return model, vectorizer, model_name
+
+def dataset_watermark(data_path='symptoms.csv', size=None):
+    """Size and SHA-256 of the first size bytes of the dataset (the whole file by default)"""
+    size = os.path.getsize(data_path) if size is None else size
+    return {'path': data_path, 'bytes': size, 'sha256': file_sha256(data_path, size)}
+
+def appended_training_data(data_path, watermark, max_partners=None, max_pairs_per_condition=None,
+                           pair_sample_rate=1.0, seed=42):
+    """Training examples from rows appended to the dataset after watermark.
     
-    print(f"\n🏆 Best model: {best_model_name} (accuracy: {best_score:.3f})")
+    Returns (texts, conditions, new_rows), or None when the rows the
+    watermark covers were edited rather than appended to. Each new row is
+    paired with earlier symptoms of its condition, old rows included, so
+    with the default options the examples are exactly those a full retrain
+    would add. max_partners caps partners as streaming training does.
+    max_pairs_per_condition and pair_sample_rate keep as many of the new
+    pairs, drawn at random, as bring each condition to the pair count a full
+    retrain with those options would have.
+    """
+    if os.path.getsize(data_path) < watermark['bytes']:
+        return None
+    if dataset_watermark(data_path, watermark['bytes'])['sha256'] != watermark['sha256']:
+        return None
     
-    return best_model, vectorizer, best_model_name
+    with open(data_path, 'rb') as f:
+        old_rows = len(pd.read_csv(io.BytesIO(f.read(watermark['bytes']))))
+    df = pd.read_csv(data_path)
+    symptoms = df['symptom'].map(normalize_symptom)
+    conditions = df['condition'].str.strip()
+    
+    # Earlier symptoms, per condition that gained rows
+    new_conditions = set(conditions.iloc[old_rows:])
+    old = conditions.iloc[:old_rows].isin(new_conditions)
+    partners = symptoms.iloc[:old_rows][old].groupby(conditions.iloc[:old_rows][old], sort=False).agg(list).to_dict()
+    if max_partners is not None:
+        partners = {condition: seen[:max_partners] for condition, seen in partners.items()}
+    
+    texts = symptoms.iloc[old_rows:].tolist()
+    labels = conditions.iloc[old_rows:].tolist()
+    pairs = {}
+    for symptom, condition in zip(texts, labels):
+        seen = partners.setdefault(condition, [])
+        pairs.setdefault(condition, []).extend(f"{partner} {symptom}" for partner in seen)
+        if max_partners is None or len(seen) < max_partners:
+            seen.append(symptom)
+    
+    old_sizes = conditions.iloc[:old_rows].value_counts()
+    new_sizes = conditions.iloc[old_rows:].value_counts()
+    rng = np.random.default_rng(seed)
+    for condition, new_pairs in pairs.items():
+        if max_pairs_per_condition is not None or pair_sample_rate < 1.0:
+            sizes = np.array([old_sizes.get(condition, 0), old_sizes.get(condition, 0) + new_sizes[condition]])
+            before, after = kept_pair_counts(sizes, max_pairs_per_condition, pair_sample_rate)
+            keep = max(0, int(after - before))
+            if keep < len(new_pairs):
+                new_pairs = [new_pairs[i] for i in np.sort(rng.choice(len(new_pairs), size=keep, replace=False))]
+        texts.extend(new_pairs)
+        labels.extend([condition] * len(new_pairs))
+    
+    return texts, labels, len(df) - old_rows
 
-def save_model(model, vectorizer, model_name):
-    """Save the trained model"""
-    print("\n💾 Saving model...")
+def add_classes(model, classes):
+    """Give a fitted MultinomialNB zero-count rows for new classes.
     
-    os.makedirs('models', exist_ok=True)
+    Naive Bayes is fully described by its per-class counts, so a class it
+    has never seen starts from zero and partial_fit fills it in exactly.
+    Only the public fitted counts are changed: the log probabilities are
+    stale until the partial_fit that must follow recomputes them.
+    """
+    merged = np.union1d(np.asarray(model.classes_, dtype=object), np.asarray(classes, dtype=object))
+    rows = np.searchsorted(merged, model.classes_)
     
-    # Save model and vectorizer
-    joblib.dump(model, 'models/symptom_model.pkl')
-    joblib.dump(vectorizer, 'models/symptom_vectorizer.pkl')
+    feature_count = np.zeros((len(merged), model.feature_count_.shape[1]))
+    feature_count[rows] = model.feature_count_
+    class_count = np.zeros(len(merged))
+    class_count[rows] = model.class_count_
     
-    # Save metadata
-    metadata = {
-        'model_type': model_name,
-        'created_at': pd.Timestamp.now().isoformat(),
-        'description': 'Lightweight symptom-to-condition predictor'
-    }
-    joblib.dump(metadata, 'models/model_metadata.pkl')
+    model.classes_ = merged
+    model.feature_count_ = feature_count
+    model.class_count_ = class_count
+
+def update_model(data_path='symptoms.csv', model_dir='models', weights_dtype='float64', publish=True):
+    """Fold rows appended since the last training into the saved model.
     
-    print("   ✅ Model saved successfully!")
-    return True
+    The vectorizer is kept as it is, so terms it has never seen are ignored
+    until the next full retrain. Needs a model with partial_fit; only
+    MultinomialNB can also take on conditions it was not trained with.
+    Returns the new version directory, or None if no version was saved.
+    """
+    print("\n🔄 Updating model with appended rows...")
+    start = time.perf_counter()
+    
+    try:
+        source_dir = current_model_dir(model_dir)
+        metadata = joblib.load(os.path.join(source_dir, 'model_metadata.pkl'))
+        model = joblib.load(os.path.join(source_dir, 'symptom_model.pkl'))
+        vectorizer = joblib.load(os.path.join(source_dir, 'symptom_vectorizer.pkl'))
+    except Exception as e:
+        print(f"   ❌ No saved model to update: {str(e)}")
+        return None
+    
+    model_name = metadata.get('model_type', type(model).__name__)
+    if 'data' not in metadata:
+        print("   ❌ Saved model has no dataset watermark; run a full retrain first")
+        return None
+    if not hasattr(model, 'partial_fit'):
+        print(f"   ❌ {model_name} cannot be updated incrementally; run a full retrain")
+        return None
+    
+    with profile_stage('load_appended'):
+        pairs = metadata.get('pairs', {})
+        appended = appended_training_data(
+            data_path, metadata['data'], metadata.get('max_partners'), pairs.get('max_pairs_per_condition'),
+            pairs.get('pair_sample_rate', 1.0), pairs.get('seed', 42)
+        )
+    if appended is None:
+        print(f"   ❌ {data_path} was edited, not appended to; run a full retrain")
+        return None
+    
+    texts, conditions, new_rows = appended
+    if not texts:
+        print(f"   ✅ No new rows since version {metadata.get('version', 'Unknown')}")
+        return None
+    
+    new_classes = sorted(set(conditions) - set(model.classes_))
+    if new_classes:
+        if not isinstance(model, MultinomialNB):
+            print(f"   ❌ {model_name} cannot learn new conditions incrementally; run a full retrain")
+            return None
+        add_classes(model, new_classes)
+    
+    with profile_stage('update_fit') as stage:
+        stage['examples'] = len(texts)
+        X = vectorizer.transform(texts)
+        model.partial_fit(X, np.asarray(conditions, dtype=object))
+    
+    print(f"   {new_rows} new rows → {len(texts)} training examples, {len(new_classes)} new conditions")
+    unknown = int((X.getnnz(axis=1) == 0).sum())
+    if unknown:
+        print(f"   ⚠️ {unknown} examples have no known terms; a full retrain would extend the vocabulary")
+    print(f"   Updated in {time.perf_counter() - start:.2f}s")
+    
+    carried = {k: v for k, v in metadata.items() if k not in ('created_at', 'version', 'data')}
+    carried.update({
+        'data': dataset_watermark(data_path),
+        'updated_from_version': metadata.get('version'),
+        'rows_added': new_rows,
+        'training_profile': get_profiler().summary()
+    })
+    return save_model(model, vectorizer, model_name, model_dir, weights_dtype, carried, publish)
 
-def test_model():
+def save_model(model, vectorizer, model_name, model_dir='models', weights_dtype='float64', extra_metadata=None,
+               publish=True):
+    """Save the trained model as the next version.
+    
+    weights_dtype sets how the NumPy scorer stores its weight matrix:
+    float64, float16 or per-row int8. extra_metadata is merged into
+    model_metadata.pkl. Every save gets the next version number and its own
+    directory, models/v<N>/, which models/CURRENT is switched to once all
+    files are written. With publish=False the caller switches it with
+    publish_version, e.g. after adding files of its own. Returns that directory.
+    """
+    print("\n💾 Saving model...")
+    
+    with profile_stage('save'):
+        try:
+            previous_version = joblib.load(
+                os.path.join(current_model_dir(model_dir), 'model_metadata.pkl')
+            ).get('version', 0)
+        except Exception:
+            previous_version = 0
+        version, version_dir = create_version_dir(model_dir, previous_version)
+        
+        # Save model and vectorizer
+        joblib.dump(model, os.path.join(version_dir, 'symptom_model.pkl'))
+        joblib.dump(vectorizer, os.path.join(version_dir, 'symptom_vectorizer.pkl'))
+        
+        # Save metadata
+        metadata = {
+            'model_type': model_name,
+            'featurizer': 'hashing' if isinstance(vectorizer, HashingTfidfVectorizer) else 'tfidf',
+            'created_at': pd.Timestamp.now().isoformat(),
+            'description': 'Lightweight symptom-to-condition predictor',
+            'version': version
+        }
+        metadata.update(extra_metadata or {})
+        joblib.dump(metadata, os.path.join(version_dir, 'model_metadata.pkl'))
+        
+        # Single-file bundle with memory-mappable arrays for fast worker startup.
+        # Streaming models are served by the NumPy scorer; a bundle would
+        # only be another copy of their n_features x n_classes arrays
+        if not metadata.get('streaming'):
+            write_model_bundle(version_dir, model, vectorizer, metadata)
+        
+        # scikit-learn-free scorer for serving
+        if export_numpy_scorer(version_dir, model, vectorizer, metadata, weights_dtype) is None:
+            print(f"   ⚠️ NumPy scorer not exported: {model_name} is not supported")
+        
+    print(f"   ✅ Model version {version} saved successfully to {version_dir}!")
+    if publish:
+        # Running predictors switch over on their next reload
+        publish_version(model_dir, version_dir)
+    return version_dir
+
+def write_training_report(model_dir='models', mode='full'):
+    """Write the stage profile next to the saved model and print a summary"""
+    report = get_profiler().report()
+    report['mode'] = mode
+    model_dir = current_model_dir(model_dir)
+    try:
+        metadata = joblib.load(os.path.join(model_dir, 'model_metadata.pkl'))
+        report.update({k: metadata.get(k) for k in ('model_type', 'version', 'data')})
+    except Exception:
+        pass
+    
+    path = os.path.join(model_dir, TRAINING_REPORT_FILENAME)
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2, default=str)
+    
+    print("\n⏱️ Training profile:")
+    for stage in report['stages']:
+        rss = f"{stage['peak_rss_mb']:.0f} MB" if stage['peak_rss_mb'] is not None else "n/a"
+        cpu = stage['cpu_seconds'] + stage['child_cpu_seconds']
+        print(f"   {stage['name']:<16} {stage['wall_seconds']:8.2f}s wall {cpu:8.2f}s CPU   peak RSS {rss}")
+    print(f"   Total: {report['total_wall_seconds']:.2f}s wall, {report['total_cpu_seconds']:.2f}s CPU")
+    print(f"   Report written to {path}")
+    return path
+
+def test_model(model_dir='models'):
     """Quick test of saved model"""
     print("\n🧪 Testing saved model...")
     
     try:
         # Load model
-        model = joblib.load('models/symptom_model.pkl')
-        vectorizer = joblib.load('models/symptom_vectorizer.pkl')
+        model_dir = current_model_dir(model_dir)
+        model = joblib.load(os.path.join(model_dir, 'symptom_model.pkl'))
+        vectorizer = joblib.load(os.path.join(model_dir, 'symptom_vectorizer.pkl'))
         
         # Test cases
         test_symptoms = [
@@ -167,35 +571,112 @@ def test_model():
         
         print("   ✅ Model test completed!")
         return True
-        
+    
     except Exception as e:
         print(f"   ❌ Model test failed: {str(e)}")
         return False
 
+def finish_version(version_dir, model_dir='models', mode='full'):
+    """Self-test a saved version, write its training report and publish it.
+    
+    The report goes into the version directory before models/CURRENT is
+    switched, so a published version is never modified afterwards. A
+    version that fails its self-test is left unpublished.
+    """
+    with profile_stage('self_test'):
+        passed = test_model(version_dir)
+    write_training_report(version_dir, mode)
+    if not passed:
+        print(f"\n❌ Not publishing {version_dir}: the self-test failed")
+        return False
+    
+    publish_version(model_dir, version_dir)
+    print(f"\n📦 Published {os.path.basename(version_dir)} as {os.path.join(model_dir, CURRENT_FILENAME)}")
+    return True
+
 def main():
     """Main training pipeline"""
+    parser = argparse.ArgumentParser(description="Train the symptom-to-condition model")
+    parser.add_argument("--data-path", default="symptoms.csv")
+    parser.add_argument("--update", action="store_true",
+                        help="Fold rows appended to --data-path since the last training into the saved model")
+    parser.add_argument("--streaming", action="store_true",
+                        help="Out-of-core training with partial_fit (implies hashed features)")
+    parser.add_argument("--streaming-model", choices=["MultinomialNB", "SGDClassifier"], default="MultinomialNB")
+    parser.add_argument("--epochs", type=int, default=1, help="Passes over the data for --streaming")
+    parser.add_argument("--chunk-size", type=int, default=STREAM_CHUNK_SIZE, help="CSV rows read at a time")
+    parser.add_argument("--max-partners", type=int, default=STREAM_MAX_PARTNERS,
+                        help="Earlier same-condition symptoms each row is paired with in --streaming")
+    parser.add_argument("--featurizer", choices=["tfidf", "hashing"], default="tfidf",
+                        help="tfidf: 500-term vocabulary; hashing: fixed-size hashed n-grams")
+    parser.add_argument("--n-features", type=int, default=HASHING_N_FEATURES,
+                        help="Hash space size for --featurizer hashing")
+    parser.add_argument("--max-pairs-per-condition", type=int, default=None,
+                        help="Cap on combined symptom-pair examples per condition")
+    parser.add_argument("--pair-sample-rate", type=float, default=1.0,
+                        help="Fraction of each condition's symptom pairs to keep")
+    parser.add_argument("--selection-metric", choices=list(SELECTION_METRICS), default="accuracy",
+                        help="Held-out metric the saved model is chosen on")
+    parser.add_argument("--latency-budget-ms", type=float, default=None,
+                        help="Only select models whose single-row latency is within this budget")
+    parser.add_argument("--folds", type=int, default=N_SPLITS, help="Stratified held-out folds for selection")
+    parser.add_argument("--jobs", type=int, default=-1, help="Parallel fits during selection (-1: all cores)")
+    parser.add_argument("--feature-cache-dir", default=FEATURE_CACHE_DIR,
+                        help="Reuse featurized training data across runs; pass '' to disable")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Also record each stage's tracemalloc peak (slower)")
+    parser.add_argument("--weights-dtype", choices=list(WEIGHT_DTYPES), default="float64",
+                        help="Serving weight precision; see python -m benchmarks.quantization")
+    args = parser.parse_args()
+    
     print("🩺 Simple ML Training for Symptom Checker")
     print("=" * 50)
+    get_profiler().reset(trace_memory=args.trace_memory)
     
     try:
-        # Load and prepare data
-        df = create_training_data()
+        if args.update:
+            version_dir = update_model(args.data_path, weights_dtype=args.weights_dtype, publish=False)
+            if version_dir and finish_version(version_dir, mode='update'):
+                print("\n🎉 Update completed successfully!")
+            return
         
-        # Train models
-        model, vectorizer, model_name = train_models(df)
+        # Load and prepare data; the watermark lets --update find rows appended later
+        with profile_stage('hash_dataset'):
+            extra_metadata = {'data': dataset_watermark(args.data_path)}
+        if args.streaming:
+            model, vectorizer, model_name = train_streaming(
+                args.data_path, args.streaming_model, args.epochs, args.chunk_size,
+                max_partners=args.max_partners, n_features=args.n_features
+            )
+            extra_metadata.update({'streaming': True, 'max_partners': args.max_partners})
+        else:
+            vectorizer, X, y = build_features(
+                args.data_path, args.featurizer, args.n_features, args.max_pairs_per_condition,
+                args.pair_sample_rate, dataset_sha256=extra_metadata['data']['sha256'],
+                cache_dir=args.feature_cache_dir
+            )
+            
+            # Train models
+            model, model_name, selection = train_models(
+                X, y, args.selection_metric, args.latency_budget_ms, args.jobs, args.folds
+            )
+            extra_metadata['selection'] = selection
+            # --update pairs appended rows with the same options
+            extra_metadata['pairs'] = {'max_pairs_per_condition': args.max_pairs_per_condition,
+                                       'pair_sample_rate': args.pair_sample_rate, 'seed': 42}
         
         if model is not None:
-            # Save model
-            save_model(model, vectorizer, model_name)
-            
-            # Test model
-            test_model()
+            # Save model; metadata gets the profile of every stage up to here
+            extra_metadata['training_profile'] = get_profiler().summary()
+            version_dir = save_model(model, vectorizer, model_name, weights_dtype=args.weights_dtype,
+                                     extra_metadata=extra_metadata, publish=False)
             
-            print("\n🎉 Training completed successfully!")
-            print("   Your ML model is ready to use in the Streamlit app!")
+            if finish_version(version_dir, mode='streaming' if args.streaming else 'full'):
+                print("\n🎉 Training completed successfully!")
+                print("   Your ML model is ready to use in the Streamlit app!")
         else:
             print("\n❌ Training failed - no model could be trained")
-            
+    
     except Exception as e:
         print(f"\n❌ Training pipeline failed: {str(e)}")
 